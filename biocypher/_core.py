@@ -3,10 +3,12 @@
 Interfaces with the user and distributes tasks to submodules.
 """
 
-import itertools
+import asyncio
 import json
 import os
+import time
 
+from collections.abc import AsyncIterable
 from datetime import datetime
 
 import yaml
@@ -21,15 +23,19 @@ from ._get import Downloader
 from ._logger import logger
 from ._mapping import OntologyMapping
 from ._ontology import NullOntology, Ontology
+from ._pipeline import Pipeline
+from ._staging import StagingBuffer
 from ._translate import Translator
 from .output.connect._get_connector import get_connector
 from .output.in_memory._get_in_memory_kg import IN_MEMORY_DBMS, get_in_memory_kg
 from .output.write._get_writer import DBMS_TO_CLASS, get_writer
+from .output.write._parallel import write_parallel
 
 logger.debug(f"Loading module {__name__}.")
 __all__ = ["BioCypher"]
 
-SUPPORTED_DBMS = DBMS_TO_CLASS.keys()
+# in-memory KGs without an output writer are only available online
+SUPPORTED_DBMS = list(DBMS_TO_CLASS) + [dbms for dbms in IN_MEMORY_DBMS if dbms not in DBMS_TO_CLASS]
 
 REQUIRED_CONFIG = [
     "dbms",
@@ -167,8 +173,13 @@ class BioCypher:
         self._in_memory_kg = None
 
         self._in_memory_kg = None
-        self._nodes = None
-        self._edges = None
+        staging_memory_limit = self.base_config.get("staging_memory_limit")
+        self._nodes = StagingBuffer(memory_limit=staging_memory_limit)
+        self._edges = StagingBuffer(memory_limit=staging_memory_limit)
+        # number of staged chunks already added to the in-memory KG
+        self._nodes_watermark = 0
+        self._edges_watermark = 0
+        self._pipeline = None
 
     def _initialize_in_memory_kg(self) -> None:
         """Create in-memory KG instance.
@@ -179,39 +190,37 @@ class BioCypher:
             self._in_memory_kg = get_in_memory_kg(
                 dbms=self._dbms,
                 deduplicator=self._get_deduplicator(),
+                extended_schema=self._get_ontology().mapping.extended_schema,
             )
 
     def add_nodes(self, nodes) -> None:
         """Add new nodes to the internal representation.
 
         Initially, receive nodes data from adaptor and create internal
-        representation for nodes.
+        representation for nodes. Each call stages one chunk in constant
+        time; lists are accounted and may be spilled to disk if the
+        `staging_memory_limit` setting is exceeded, other iterables are
+        consumed when the knowledge graph is created.
 
         Args:
         ----
             nodes(iterable): An iterable of nodes
 
         """
-        if isinstance(nodes, list):
-            self._nodes = list(itertools.chain(self._nodes, nodes))
-        else:
-            self._nodes = itertools.chain(self._nodes, nodes)
+        self._nodes.append(nodes)
 
     def add_edges(self, edges) -> None:
         """Add new edges to the internal representation.
 
         Initially, receive edges data from adaptor and create internal
-        representation for edges.
+        representation for edges. Staged like the nodes in `add_nodes`.
 
         Args:
         ----
              edges(iterable): An iterable of edges.
 
         """
-        if isinstance(edges, list):
-            self._edges = list(itertools.chain(self._edges, edges))
-        else:
-            self._edges = itertools.chain(self._edges, edges)
+        self._edges.append(edges)
 
     def to_df(self):
         """Create DataFrame using internal representation.
@@ -238,25 +247,33 @@ class BioCypher:
              Any: knowledge graph.
 
         """
-        # If we're using an in-memory KG and it already exists, return it directly
-        if self._in_memory_kg and self._is_online_and_in_memory():
-            return self._in_memory_kg.get_kg()
-
-        # Otherwise, initialize and populate the in-memory KG
         if not self._in_memory_kg:
             self._initialize_in_memory_kg()
         if not self._translator:
             self._get_translator()
 
-        # These attributes might not exist when using in-memory KG directly
-        if hasattr(self, "_nodes") and hasattr(self, "_edges"):
-            tnodes = self._translator.translate_entities(self._nodes)
-            tedges = self._translator.translate_entities(self._edges)
-            self._in_memory_kg.add_nodes(tnodes)
-            self._in_memory_kg.add_edges(tedges)
+        # only translate the chunks staged since the last call
+        self._in_memory_kg.add_nodes(self._translate_staged(self._nodes, self._nodes_watermark))
+        self._nodes_watermark = len(self._nodes)
+        self._in_memory_kg.add_edges(self._translate_staged(self._edges, self._edges_watermark))
+        self._edges_watermark = len(self._edges)
 
         return self._in_memory_kg.get_kg()
 
+    def _translate_staged(self, staged: StagingBuffer, start: int = 0):
+        """Translate staged entities chunk by chunk, without concatenating.
+
+        Args:
+        ----
+            staged (StagingBuffer): The staged nodes or edges.
+            start (int): Index of the first chunk to translate.
+
+        """
+        for chunk in staged.iter_chunks(start):
+            if isinstance(chunk, list) and not chunk:
+                continue
+            yield from self._translator.translate_entities(chunk)
+
     def _get_deduplicator(self) -> Deduplicator:
         """Create deduplicator if not exists and return."""
         if not self._deduplicator:
@@ -348,14 +365,15 @@ class BioCypher:
 
         Set as instance variable `self._driver`.
         """
-        if not self._offline:
+        if self._offline:
+            msg = "Cannot get driver in offline mode."
+            raise NotImplementedError(msg)
+
+        if not self._driver:
             self._driver = get_connector(
                 dbms=self._dbms,
                 translator=self._get_translator(),
             )
-        else:
-            msg = "Cannot get driver in offline mode."
-            raise NotImplementedError(msg)
 
         return self._driver
 
@@ -368,6 +386,7 @@ class BioCypher:
             self._in_memory_kg = get_in_memory_kg(
                 dbms=self._dbms,
                 deduplicator=self._get_deduplicator(),
+                extended_schema=self._get_ontology().mapping.extended_schema,
             )
 
         return self._in_memory_kg
@@ -377,6 +396,7 @@ class BioCypher:
         nodes,
         batch_size: int = int(1e6),
         force: bool = False,
+        pipeline: bool = False,
     ):
         """Add nodes to the BioCypher KG.
 
@@ -392,11 +412,27 @@ class BioCypher:
         - `_driver`: if `_offline` is set to `False` and the `_dbms` is not an
             `IN_MEMORY_DBMS`
 
+        If `pipeline` is set, iterating the input, translating, and writing
+        run in separate stages (see :py:class:`Pipeline`).
+
         """
         if not self._translator:
             self._get_translator()
-        translated_nodes = self._translator.translate_entities(nodes)
+        if pipeline:
+            translated_nodes = self._start_pipeline(nodes)
+        else:
+            translated_nodes = self._translator.translate_entities(nodes)
+
+        try:
+            passed = self._dispatch_nodes(translated_nodes, batch_size, force)
+        finally:
+            if pipeline:
+                self._stop_pipeline()
 
+        return passed
+
+    def _dispatch_nodes(self, translated_nodes, batch_size: int, force: bool):
+        """Pass translated nodes to the writer, in-memory KG, or driver."""
         if self._offline:
             if not self._writer:
                 self._initialize_writer()
@@ -412,7 +448,7 @@ class BioCypher:
 
         return passed
 
-    def _add_edges(self, edges, batch_size: int = int(1e6)):
+    def _add_edges(self, edges, batch_size: int = int(1e6), pipeline: bool = False):
         """Add edges to the BioCypher KG.
 
         First uses the `_translator` to translate the edges to `BioCypherEdge`
@@ -427,11 +463,27 @@ class BioCypher:
         - `_driver`: if `_offline` is set to `False` and the `_dbms` is not an
             `IN_MEMORY_DBMS`
 
+        If `pipeline` is set, iterating the input, translating, and writing
+        run in separate stages (see :py:class:`Pipeline`).
+
         """
         if not self._translator:
             self._get_translator()
-        translated_edges = self._translator.translate_entities(edges)
+        if pipeline:
+            translated_edges = self._start_pipeline(edges)
+        else:
+            translated_edges = self._translator.translate_entities(edges)
+
+        try:
+            passed = self._dispatch_edges(translated_edges, batch_size)
+        finally:
+            if pipeline:
+                self._stop_pipeline()
+
+        return passed
 
+    def _dispatch_edges(self, translated_edges, batch_size: int):
+        """Pass translated edges to the writer, in-memory KG, or driver."""
         if self._offline:
             if not self._writer:
                 self._initialize_writer()
@@ -448,6 +500,30 @@ class BioCypher:
 
         return passed
 
+    def _start_pipeline(self, entities) -> Pipeline:
+        """Start a staged pipeline translating the given entities."""
+        self._pipeline = Pipeline(self._translator.translate_entities)
+        return self._pipeline.start(entities)
+
+    def _stop_pipeline(self) -> None:
+        """Wait for the pipeline to finish and log its utilisation."""
+        self._pipeline.join()
+        self._pipeline.log_stats()
+
+    def get_pipeline_stats(self) -> dict | None:
+        """Return the per-stage statistics of the last pipelined write.
+
+        Returns
+        -------
+            dict | None: Per stage (`produce`, `translate`, `write`), the
+                busy and wait time in seconds, the number of batches and
+                entities, and the utilisation; None if no pipeline was run.
+
+        """
+        if not self._pipeline:
+            return None
+        return self._pipeline.get_stats()
+
     def _is_online_and_in_memory(self) -> bool:
         """Return True if in online mode and in-memory dbms is used."""
         return (not self._offline) & (self._dbms in IN_MEMORY_DBMS)
@@ -457,6 +533,7 @@ class BioCypher:
         nodes,
         batch_size: int = int(1e6),
         force: bool = False,
+        pipeline: bool = False,
     ) -> bool:
         """Write nodes to database.
 
@@ -469,15 +546,19 @@ class BioCypher:
             batch_size (int): The batch size to use when writing to disk.
             force (bool): Whether to force writing to the output directory even
                 if the node type is not present in the schema config file.
+            pipeline (bool): Whether to iterate the input, translate, and
+                write in separate stages connected by bounded queues. The
+                stage utilisation is logged and available from
+                `get_pipeline_stats()`.
 
         Returns:
         -------
             bool: True if successful.
 
         """
-        return self._add_nodes(nodes, batch_size=batch_size, force=force)
+        return self._add_nodes(nodes, batch_size=batch_size, force=force, pipeline=pipeline)
 
-    def write_edges(self, edges, batch_size: int = int(1e6)) -> bool:
+    def write_edges(self, edges, batch_size: int = int(1e6), pipeline: bool = False) -> bool:
         """Write edges to database.
 
         Either takes an iterable of tuples (if given, translates to
@@ -486,13 +567,62 @@ class BioCypher:
         Args:
         ----
             edges (iterable): An iterable of edges to write to the database.
+            batch_size (int): The batch size to use when writing to disk.
+            pipeline (bool): Whether to iterate the input, translate, and
+                write in separate stages connected by bounded queues. The
+                stage utilisation is logged and available from
+                `get_pipeline_stats()`.
 
         Returns:
         -------
             bool: True if successful.
 
         """
-        return self._add_edges(edges, batch_size=batch_size)
+        return self._add_edges(edges, batch_size=batch_size, pipeline=pipeline)
+
+    def write_parallel(
+        self,
+        adapters,
+        processes: int | None = None,
+        batch_size: int = int(1e6),
+    ) -> bool:
+        """Write the output of several adapters in parallel.
+
+        Each adapter is run in a worker process that translates its entities
+        and writes its own part files. Afterwards, entities provided by more
+        than one adapter are removed (the first adapter in the list wins),
+        and the headers and the import call are written once. Only available
+        in offline mode for writers producing part files (e.g. Neo4j,
+        PostgreSQL, ArangoDB).
+
+        Args:
+        ----
+            adapters (iterable): Callables without arguments, each returning
+                an iterable of nodes or of edges, e.g. `adapter.get_nodes`.
+                They are sent to the worker processes and must be picklable.
+            processes (int): Maximum number of worker processes. Defaults to
+                the number of CPUs.
+            batch_size (int): The batch size to use when writing to disk.
+
+        Returns:
+        -------
+            bool: True if successful.
+
+        """
+        if not self._offline:
+            msg = "Parallel writing is only available in offline mode."
+            logger.error(msg)
+            raise NotImplementedError(msg)
+
+        if not self._writer:
+            self._initialize_writer()
+
+        return write_parallel(
+            self._writer,
+            adapters,
+            processes=processes,
+            batch_size=batch_size,
+        )
 
     def add(self, entities) -> None:
         """Add entities to the in-memory database.
@@ -514,6 +644,124 @@ class BioCypher:
         """
         return self._add_nodes(entities)
 
+    # ASYNC METHODS ###
+
+    async def _feed_pipeline(self, pipeline: Pipeline, entities) -> None:
+        """Feed a pipeline from an async (or sync) iterable in batches.
+
+        Blocking puts into the pipeline run in a thread, so the event loop
+        is not blocked while the translation stage catches up.
+        """
+        if not isinstance(entities, AsyncIterable):
+            entities = _as_async_iterable(entities)
+
+        batch = []
+        busy = 0.0
+        t0 = time.perf_counter()
+        async for entity in entities:
+            batch.append(entity)
+            if len(batch) >= pipeline.chunk_size:
+                busy += time.perf_counter() - t0
+                if not await asyncio.to_thread(pipeline.put, batch, busy):
+                    return
+                batch = []
+                busy = 0.0
+                t0 = time.perf_counter()
+        if batch:
+            await asyncio.to_thread(pipeline.put, batch, busy + time.perf_counter() - t0)
+
+    async def _aadd(self, entities, dispatch, *args) -> bool:
+        """Translate entities from an async iterable and dispatch them.
+
+        The input is consumed on the event loop, while translation and
+        dispatch to the writer, in-memory KG, or driver run in threads.
+        """
+        if not self._translator:
+            self._get_translator()
+
+        pipeline = self._pipeline = Pipeline(self._translator.translate_entities)
+        pipeline.start()
+        task = asyncio.create_task(asyncio.to_thread(dispatch, pipeline, *args))
+        # stop feeding once the dispatch ends, e.g. if it fails before
+        # reading the pipeline; its error is then raised by `await task`
+        task.add_done_callback(lambda _: pipeline.stop())
+
+        try:
+            try:
+                await self._feed_pipeline(pipeline, entities)
+            except Exception as e:
+                await asyncio.to_thread(pipeline.close, e)
+                await asyncio.gather(task, return_exceptions=True)
+                raise
+            await asyncio.to_thread(pipeline.close)
+            return await task
+        finally:
+            await asyncio.to_thread(self._stop_pipeline)
+
+    async def awrite_nodes(
+        self,
+        nodes,
+        batch_size: int = int(1e6),
+        force: bool = False,
+    ) -> bool:
+        """Write nodes from an async iterable to database.
+
+        Async counterpart of :py:meth:`write_nodes`. Nodes are translated
+        incrementally as they arrive; writing runs in a thread and does not
+        block the event loop.
+
+        Args:
+        ----
+            nodes (AsyncIterable): An async iterable of nodes to write to the
+                database.
+            batch_size (int): The batch size to use when writing to disk.
+            force (bool): Whether to force writing to the output directory even
+                if the node type is not present in the schema config file.
+
+        Returns:
+        -------
+            bool: True if successful.
+
+        """
+        return await self._aadd(nodes, self._dispatch_nodes, batch_size, force)
+
+    async def awrite_edges(self, edges, batch_size: int = int(1e6)) -> bool:
+        """Write edges from an async iterable to database.
+
+        Async counterpart of :py:meth:`write_edges`. Edges are translated
+        incrementally as they arrive; writing runs in a thread and does not
+        block the event loop.
+
+        Args:
+        ----
+            edges (AsyncIterable): An async iterable of edges to write to the
+                database.
+            batch_size (int): The batch size to use when writing to disk.
+
+        Returns:
+        -------
+            bool: True if successful.
+
+        """
+        return await self._aadd(edges, self._dispatch_edges, batch_size)
+
+    async def aadd(self, entities) -> None:
+        """Add entities from an async iterable to the in-memory database.
+
+        Async counterpart of :py:meth:`add`.
+
+        Args:
+        ----
+            entities (AsyncIterable): An async iterable of entities to add to
+                the database.
+
+        Returns:
+        -------
+            None
+
+        """
+        return await self._aadd(entities, self._dispatch_nodes, int(1e6), False)
+
     def merge_nodes(self, nodes) -> bool:
         """Merge nodes into database.
 
@@ -552,7 +800,7 @@ class BioCypher:
         """Get the in-memory KG instance.
 
         Depending on the specified `dbms` this could either be a list of Pandas
-        dataframes or a NetworkX DiGraph.
+        dataframes, a NetworkX DiGraph, or a sparse adjacency `CsrKG`.
         """
         if not self._is_online_and_in_memory():
             msg = (f"Getting the in-memory KG is only available in online mode for {IN_MEMORY_DBMS}.",)
@@ -870,3 +1118,9 @@ class BioCypher:
         self.start_ontology()
 
         return self._translator.reverse_translate(query)
+
+
+async def _as_async_iterable(iterable):
+    """Wrap a sync iterable for use with the async methods."""
+    for item in iterable:
+        yield item
@@ -38,17 +38,31 @@ class Deduplicator:
         Returns:
             True if the node has been seen before, False otherwise.
         """
-        if entity.get_label() not in self.entity_types:
-            self.entity_types.add(entity.get_label())
-
-        if entity.get_id() in self.seen_entity_ids:
-            self.duplicate_entity_ids.add(entity.get_id())
-            if entity.get_label() not in self.duplicate_entity_types:
-                logger.warning(f"Duplicate node type {entity.get_label()} found. ")
-                self.duplicate_entity_types.add(entity.get_label())
+        return self.node_id_seen(entity.get_id(), entity.get_label())
+
+    def node_id_seen(self, node_id: str, label: str) -> bool:
+        """
+        Adds a node identifier to the instance and checks if it has been seen
+        before.
+
+        Args:
+            node_id: Identifier of the node.
+            label: Label of the node.
+
+        Returns:
+            True if the node has been seen before, False otherwise.
+        """
+        if label not in self.entity_types:
+            self.entity_types.add(label)
+
+        if node_id in self.seen_entity_ids:
+            self.duplicate_entity_ids.add(node_id)
+            if label not in self.duplicate_entity_types:
+                logger.warning(f"Duplicate node type {label} found. ")
+                self.duplicate_entity_types.add(label)
             return True
 
-        self.seen_entity_ids.add(entity.get_id())
+        self.seen_entity_ids.add(node_id)
         return False
 
     def edge_seen(self, relationship: BioCypherEdge) -> bool:
@@ -61,25 +75,49 @@ class Deduplicator:
         Returns:
             True if the edge has been seen before, False otherwise.
         """
-        if relationship.get_type() not in self.seen_relationships:
-            self.seen_relationships[relationship.get_type()] = set()
+        return self.edge_key_seen(self.edge_key(relationship), relationship.get_type())
 
-        # concatenate source and target if no id is present
-        if not relationship.get_id():
-            _id = f"{relationship.get_source_id()}_{relationship.get_target_id()}"
-        else:
-            _id = relationship.get_id()
+    def edge_key_seen(self, key: str, edge_type: str) -> bool:
+        """
+        Adds an edge key (see `edge_key`) to the instance and checks if it
+        has been seen before for the given edge type.
 
-        if _id in self.seen_relationships[relationship.get_type()]:
-            self.duplicate_relationship_ids.add(_id)
-            if relationship.get_type() not in self.duplicate_relationship_types:
-                logger.warning(f"Duplicate edge type {relationship.get_type()} found. ")
-                self.duplicate_relationship_types.add(relationship.get_type())
+        Args:
+            key: Deduplication key of the edge.
+            edge_type: Type of the edge.
+
+        Returns:
+            True if the edge has been seen before, False otherwise.
+        """
+        if edge_type not in self.seen_relationships:
+            self.seen_relationships[edge_type] = set()
+
+        if key in self.seen_relationships[edge_type]:
+            self.duplicate_relationship_ids.add(key)
+            if edge_type not in self.duplicate_relationship_types:
+                logger.warning(f"Duplicate edge type {edge_type} found. ")
+                self.duplicate_relationship_types.add(edge_type)
             return True
 
-        self.seen_relationships[relationship.get_type()].add(_id)
+        self.seen_relationships[edge_type].add(key)
         return False
 
+    @staticmethod
+    def edge_key(relationship: BioCypherEdge) -> str:
+        """
+        Returns the key used to deduplicate an edge: its identifier, or the
+        concatenated source and target identifiers if no id is present.
+
+        Args:
+            relationship: BioCypherEdge to get the key for.
+
+        Returns:
+            The deduplication key of the edge.
+        """
+        if not relationship.get_id():
+            return f"{relationship.get_source_id()}_{relationship.get_target_id()}"
+        return relationship.get_id()
+
     def rel_as_node_seen(self, rel_as_node: BioCypherRelAsNode) -> bool:
         """
         Adds a rel_as_node to the instance (one entity and two relationships)
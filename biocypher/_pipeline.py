@@ -0,0 +1,277 @@
+"""BioCypher pipeline module.
+
+Runs adapter iteration, translation, and writing in separate stages
+connected by bounded queues of entity batches, so that a slow adapter does
+not stall writing and vice versa.
+"""
+
+import queue
+import threading
+import time
+
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+
+from ._logger import logger
+
+logger.debug(f"Loading module {__name__}.")
+
+__all__ = ["Pipeline"]
+
+# marks the end of a queue
+_DONE = object()
+
+
+@dataclass
+class _StageStats:
+    """Time spent working and waiting in one pipeline stage."""
+
+    name: str
+    busy: float = 0.0
+    wait: float = 0.0
+    batches: int = 0
+    entities: int = 0
+
+
+class _PipelineError:
+    """Carries an exception raised in a stage thread to the consumer."""
+
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+class Pipeline:
+    """Staged producer, translation, and writer pipeline.
+
+    The producer stage iterates the input in batches of `chunk_size`
+    entities, the translation stage translates each batch, and the consuming
+    stage (e.g. the batch writer) iterates the pipeline to receive the
+    translated entities. Producer and translation stage run in their own
+    threads, the consuming stage in the calling thread. Queues between the
+    stages hold at most `queue_size` batches, so a fast stage blocks instead
+    of buffering the whole input.
+
+    The producer stage can also be fed from outside using :meth:`put` and
+    :meth:`close`, e.g. from an event loop.
+
+    Args:
+    ----
+        translate (Callable): Function translating one batch of input
+            entities, e.g. :py:meth:`Translator.translate_entities`.
+
+        chunk_size (int): Number of entities per batch.
+
+        queue_size (int): Maximum number of batches held between two stages.
+
+    """
+
+    def __init__(
+        self,
+        translate: Callable[[list], Iterable],
+        chunk_size: int = 1000,
+        queue_size: int = 8,
+    ):
+        self._translate = translate
+        self.chunk_size = chunk_size
+        self._raw = queue.Queue(maxsize=queue_size)
+        self._translated = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._threads = []
+        self._started = None
+        self._finished = None
+        self._stats = {name: _StageStats(name) for name in ("produce", "translate", "write")}
+
+    def start(self, entities: Iterable | None = None) -> "Pipeline":
+        """Start the stage threads.
+
+        Args:
+        ----
+            entities (Iterable): The input entities. If not given, the
+                producer stage is fed using :meth:`put` and :meth:`close`.
+
+        Returns:
+        -------
+            Pipeline: The pipeline itself, to be iterated by the consumer.
+
+        """
+        self._started = time.perf_counter()
+        self._spawn(self._run_translate, "translate")
+        if entities is not None:
+            self._spawn(self._run_produce, "produce", entities)
+        return self
+
+    def _spawn(self, target: Callable, name: str, *args) -> None:
+        thread = threading.Thread(
+            target=target,
+            args=args,
+            name=f"biocypher-pipeline-{name}",
+            daemon=True,
+        )
+        thread.start()
+        self._threads.append(thread)
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Put an item into a queue, giving up once the pipeline stops."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def put(self, batch: list, busy: float = 0.0) -> bool:
+        """Feed a batch of input entities to the translation stage.
+
+        Blocks while the queue to the translation stage is full.
+
+        Args:
+        ----
+            batch (list): The input entities.
+
+            busy (float): Time in seconds spent producing the batch.
+
+        Returns:
+        -------
+            bool: False if the pipeline has been stopped.
+
+        """
+        stats = self._stats["produce"]
+        stats.busy += busy
+        t0 = time.perf_counter()
+        passed = self._put(self._raw, batch)
+        stats.wait += time.perf_counter() - t0
+        stats.batches += 1
+        stats.entities += len(batch)
+        return passed
+
+    def close(self, exception: BaseException | None = None) -> None:
+        """Signal the end of the input, optionally with an error."""
+        self._put(self._raw, _PipelineError(exception) if exception else _DONE)
+
+    def _run_produce(self, entities: Iterable) -> None:
+        try:
+            it = iter(entities)
+            while not self._stop.is_set():
+                t0 = time.perf_counter()
+                batch = list(islice(it, self.chunk_size))
+                if not batch:
+                    break
+                if not self.put(batch, busy=time.perf_counter() - t0):
+                    return
+        except Exception as e:
+            logger.error(f"Error in pipeline producer stage: {e}")
+            self.close(e)
+            return
+        self.close()
+
+    def _run_translate(self) -> None:
+        stats = self._stats["translate"]
+        while True:
+            t0 = time.perf_counter()
+            try:
+                batch = self._raw.get(timeout=0.1)
+            except queue.Empty:
+                stats.wait += time.perf_counter() - t0
+                if self._stop.is_set():
+                    return
+                continue
+            stats.wait += time.perf_counter() - t0
+
+            if batch is _DONE or isinstance(batch, _PipelineError):
+                self._put(self._translated, batch)
+                return
+
+            t0 = time.perf_counter()
+            try:
+                translated = list(self._translate(batch))
+            except Exception as e:
+                logger.error(f"Error in pipeline translation stage: {e}")
+                self._put(self._translated, _PipelineError(e))
+                return
+            stats.busy += time.perf_counter() - t0
+            stats.batches += 1
+            stats.entities += len(translated)
+
+            t0 = time.perf_counter()
+            passed = self._put(self._translated, translated)
+            stats.wait += time.perf_counter() - t0
+            if not passed:
+                return
+
+    def __iter__(self) -> Iterator:
+        stats = self._stats["write"]
+        try:
+            while True:
+                t0 = time.perf_counter()
+                try:
+                    batch = self._translated.get(timeout=0.1)
+                except queue.Empty:
+                    stats.wait += time.perf_counter() - t0
+                    if self._stop.is_set():
+                        msg = "Pipeline stopped before the input was exhausted."
+                        logger.error(msg)
+                        raise RuntimeError(msg)
+                    continue
+                stats.wait += time.perf_counter() - t0
+
+                if batch is _DONE:
+                    return
+                if isinstance(batch, _PipelineError):
+                    raise batch.exception
+
+                stats.batches += 1
+                stats.entities += len(batch)
+                for entity in batch:
+                    t0 = time.perf_counter()
+                    yield entity
+                    stats.busy += time.perf_counter() - t0
+        finally:
+            self._finished = time.perf_counter()
+            self._stop.set()
+
+    def stop(self) -> None:
+        """Stop the pipeline without waiting; blocked puts return False."""
+        self._stop.set()
+
+    def join(self) -> None:
+        """Stop the pipeline and wait for the stage threads."""
+        self.stop()
+        for thread in self._threads:
+            thread.join()
+        if self._finished is None:
+            self._finished = time.perf_counter()
+
+    def get_stats(self) -> dict:
+        """Return the per-stage statistics.
+
+        Utilisation is the share of the pipeline's wall time a stage spent
+        working rather than waiting on a neighbouring stage; the stage with
+        the highest utilisation is the bottleneck.
+
+        Returns
+        -------
+            dict: Per stage, the busy and wait time in seconds, the number
+                of batches and entities, and the utilisation.
+
+        """
+        end = self._finished or time.perf_counter()
+        wall = end - self._started if self._started else 0.0
+        return {
+            name: {
+                "busy": s.busy,
+                "wait": s.wait,
+                "batches": s.batches,
+                "entities": s.entities,
+                "utilisation": s.busy / wall if wall else 0.0,
+            }
+            for name, s in self._stats.items()
+        }
+
+    def log_stats(self) -> None:
+        """Log the per-stage utilisation and the bottleneck stage."""
+        stats = self.get_stats()
+        msg = ", ".join(f"{name} {s['utilisation']:.0%} ({s['entities']} entities)" for name, s in stats.items())
+        bottleneck = max(stats, key=lambda name: stats[name]["utilisation"])
+        logger.info(f"Pipeline stage utilisation: {msg}; bottleneck: {bottleneck}.")
@@ -0,0 +1,196 @@
+"""BioCypher staging module.
+
+Holds entities passed to :py:meth:`BioCypher.add_nodes` and
+:py:meth:`BioCypher.add_edges` until they are translated into the in-memory
+knowledge graph.
+"""
+
+import contextlib
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import weakref
+
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+from ._logger import logger
+
+logger.debug(f"Loading module {__name__}.")
+
+__all__ = ["StagingBuffer"]
+
+# number of entities sampled to estimate the size of a chunk
+_SIZE_SAMPLE = 100
+
+
+def _entity_size(entity) -> int:
+    """Estimate the size of an entity tuple or object in bytes.
+
+    Counts the container, its direct members, and the members of
+    property dictionaries; deeper structures are not followed.
+    """
+    size = sys.getsizeof(entity)
+    members = entity if isinstance(entity, tuple | list) else getattr(entity, "__dict__", {}).values()
+    for member in members:
+        size += sys.getsizeof(member)
+        if isinstance(member, dict):
+            size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in member.items())
+    return size
+
+
+def _estimate_size(chunk: list) -> int:
+    """Estimate the size of a chunk in bytes from a sample of its entities."""
+    if not chunk:
+        return sys.getsizeof(chunk)
+    sample = chunk[:_SIZE_SAMPLE]
+    per_entity = sum(_entity_size(entity) for entity in sample) / len(sample)
+    return sys.getsizeof(chunk) + int(per_entity * len(chunk))
+
+
+def _remove_spilled(paths: list, directory: str | None) -> None:
+    """Remove spilled chunk files, and the temporary directory if given."""
+    for path in paths:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+class _SpilledChunk:
+    """A chunk that has been pickled to disk."""
+
+    def __init__(self, path: str, length: int):
+        self.path = path
+        self.length = length
+
+    def load(self) -> list:
+        with open(self.path, "rb") as f:
+            return pickle.load(f)
+
+
+class StagingBuffer:
+    """Append-only buffer of entity chunks.
+
+    Each call to :meth:`append` adds one chunk in constant time; staged
+    entities are never copied or concatenated. Lists are kept as they are
+    and their approximate size is accounted; other iterables (e.g.
+    generators) are stored lazily and consumed when the buffer is read.
+
+    If `memory_limit` is set, the oldest in-memory chunks are pickled to a
+    temporary directory once the accounted size exceeds the limit, and read
+    back from disk when the buffer is iterated. The spilled files, and the
+    temporary directory if no `spill_directory` is given, are removed by
+    :meth:`clear`, or when the buffer is garbage collected.
+
+    Args:
+    ----
+        memory_limit (int): Maximum accounted size of in-memory chunks in
+            bytes before chunks are spilled to disk. No limit by default.
+
+        spill_directory (str): Directory for spilled chunks. Defaults to a
+            new temporary directory.
+
+    """
+
+    def __init__(self, memory_limit: int | None = None, spill_directory: str | None = None):
+        self.memory_limit = memory_limit
+        self._spill_directory = spill_directory
+        self._temporary_directory = None
+        self._spill_files = []
+        self._cleanup = None
+        self._spill_from = 0  # chunks before this index are spilled or lazy
+        self._chunks = []
+        self._sizes = []
+        self.nbytes = 0
+        self.spilled_bytes = 0
+
+    def __len__(self) -> int:
+        """Return the number of staged chunks."""
+        return len(self._chunks)
+
+    def append(self, entities: Iterable) -> None:
+        """Stage a chunk of entities.
+
+        Args:
+        ----
+            entities (Iterable): The entities. Lists and tuples are accounted
+                and may be spilled to disk; other iterables are kept as they
+                are and consumed once when the buffer is read.
+
+        """
+        if isinstance(entities, tuple):
+            entities = list(entities)
+
+        if isinstance(entities, list):
+            size = _estimate_size(entities)
+        else:
+            size = 0
+
+        self._chunks.append(entities)
+        self._sizes.append(size)
+        self.nbytes += size
+
+        if self.memory_limit is not None and self.nbytes > self.memory_limit:
+            self._spill()
+
+    def _get_spill_directory(self) -> str:
+        if self._cleanup is None:
+            if not self._spill_directory:
+                self._temporary_directory = tempfile.mkdtemp(prefix="biocypher-staging-")
+            # removes the spilled files also if the buffer is abandoned
+            self._cleanup = weakref.finalize(self, _remove_spilled, self._spill_files, self._temporary_directory)
+        directory = self._spill_directory or self._temporary_directory
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    def _spill(self) -> None:
+        """Pickle the oldest in-memory chunks to disk until under the limit."""
+        for i in range(self._spill_from, len(self._chunks)):
+            if self.nbytes <= self.memory_limit:
+                break
+            self._spill_from = i + 1
+            chunk = self._chunks[i]
+            if not isinstance(chunk, list):
+                continue
+
+            fd, path = tempfile.mkstemp(prefix="chunk-", suffix=".pkl", dir=self._get_spill_directory())
+            self._spill_files.append(path)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            logger.debug(f"Spilled {len(chunk)} staged entities to {path}.")
+            self._chunks[i] = _SpilledChunk(path, len(chunk))
+            self.nbytes -= self._sizes[i]
+            self.spilled_bytes += self._sizes[i]
+
+    def iter_chunks(self, start: int = 0) -> Iterator[Iterable]:
+        """Iterate over the staged chunks, starting at chunk index `start`."""
+        for chunk in islice(self._chunks, start, None):
+            if isinstance(chunk, _SpilledChunk):
+                yield chunk.load()
+            else:
+                yield chunk
+
+    def iter_entities(self, start: int = 0) -> Iterator:
+        """Stream the staged entities, starting at chunk index `start`."""
+        for chunk in self.iter_chunks(start):
+            yield from chunk
+
+    def __iter__(self) -> Iterator:
+        return self.iter_entities()
+
+    def clear(self) -> None:
+        """Drop all staged chunks and remove spilled files and directory."""
+        self._chunks = []
+        self._sizes = []
+        self.nbytes = 0
+        self.spilled_bytes = 0
+        if self._cleanup is not None:
+            self._cleanup()
+            self._cleanup = None
+        self._temporary_directory = None
+        self._spill_files = []
+        self._spill_from = 0
@@ -50,6 +50,16 @@ def get_connector(
             password=dbms_config["password"],
             multi_db=dbms_config["multi_db"],
             translator=translator,
+            batch_size=dbms_config.get("batch_size"),
+            concurrency=dbms_config.get("concurrency"),
+            create_only=dbms_config.get("create_only", False),
+            query_cache_size=dbms_config.get("query_cache_size"),
+            query_cache_ttl=dbms_config.get("query_cache_ttl"),
+            query_stats=dbms_config.get("query_stats", False),
+            slow_query_ms=dbms_config.get("slow_query_ms"),
+            query_stats_interval=dbms_config.get("query_stats_interval"),
+            load_csv_directory=dbms_config.get("load_csv_directory"),
+            load_csv_url=dbms_config.get("load_csv_url"),
         )
 
     msg = f"Online mode is not supported for the DBMS {dbms}."
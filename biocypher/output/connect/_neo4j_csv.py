@@ -0,0 +1,242 @@
+"""
+Loading of online Neo4j input through ``LOAD CSV``.
+
+Nodes and edges are written to compressed CSV part files by the Neo4j batch
+writer, in a directory the Neo4j server can read from, e.g. its import
+directory. The server then loads each part with ``LOAD CSV`` in batched
+transactions, instead of receiving the entities as query parameters.
+"""
+
+import contextlib
+import csv
+import gzip
+import os
+import time
+
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from biocypher._deduplicate import Deduplicator
+from biocypher._logger import logger
+from biocypher.output.write._batch_writer import parse_label
+from biocypher.output.write.graph._neo4j import _Neo4jBatchWriter
+
+logger.debug(f"Loading module {__name__}.")
+__all__ = ["_CsvLoader"]
+
+# conversion of CSV values by the type in the header
+_CONVERSIONS = {
+    "long": "toInteger({})",
+    "double": "toFloat({})",
+    "boolean": "toBoolean({})",
+}
+
+
+class _LoadCsvWriter(_Neo4jBatchWriter):
+    """
+    Neo4j batch writer for ``LOAD CSV``.
+
+    Writes gzip compressed parts, numbered per label in memory, and keeps
+    the parts written since they were last taken, with the labels (or the
+    relationship type) of their entities.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._part_numbers = {}
+        self._new_parts = []
+
+    def _write_next_part(self, label: str, lines: list, keys: tuple | None = None):
+        label_pascal = self.translator.name_sentence_to_pascal(parse_label(label))
+        number = self._part_numbers[label_pascal] = self._part_numbers.get(label_pascal, -1) + 1
+        part = f"{label_pascal}-part{self.part_prefix}{number:03d}.csv.gz"
+        logger.info(f"Writing {len(lines)} entries to {part}")
+
+        with gzip.open(os.path.join(self.outdir, part), "wt", encoding="utf-8") as f:
+            f.writelines(lines)
+
+        self.parts.setdefault(label, []).append(part)
+
+        # labels of nodes, or the type of edges, are the same in all lines
+        (first,) = csv.reader(lines[:1], delimiter=self.delim, quotechar=self.quote)
+        kind = keys[0] if keys else "node"
+        self._new_parts.append((kind, label, part, first[-1].split(self.adelim)))
+
+    def take_parts(self) -> list:
+        """Return the parts written since the last call."""
+        parts, self._new_parts = self._new_parts, []
+        return parts
+
+
+class _CsvLoader:
+    """
+    Load nodes and edges into Neo4j through CSV files.
+
+    The entities of each call are first written to part files and headers
+    in ``directory``, deduplicated across calls. Then the parts are loaded
+    with ``LOAD CSV ... CALL { } IN TRANSACTIONS`` from ``url``, the same
+    directory as seen by the Neo4j server, and deleted, with the headers;
+    other files in the directory are left alone. The values are converted
+    to the types given in the headers. Parts of different node labels, or
+    of different relationship types, are loaded in parallel.
+
+    Nodes are merged, or created, with the label used for the constraints,
+    and get the further labels of their type. Source and target nodes of
+    edges are matched with the labels from the schema configuration, where
+    unambiguous, and otherwise merged on their id (see
+    ``_Neo4jDriver._endpoint``).
+
+    Args:
+        driver (_Neo4jDriver): The BioCypher driver to load with.
+
+        directory (str): The directory to write the files to; it must be
+            readable by the Neo4j server.
+
+        url (str): The URL of ``directory`` for the Neo4j server, by default
+            the server's import directory.
+    """
+
+    def __init__(self, driver, directory: str, url: str = "file:///"):
+        self.driver = driver
+        self.url = url if url.endswith("/") else f"{url}/"
+        self.writer = _LoadCsvWriter(
+            translator=driver.translator,
+            deduplicator=Deduplicator(),
+            delimiter=",",
+            array_delimiter="|",
+            quote='"',
+            output_directory=directory,
+            edge_labels_order="Leaves",
+        )
+        self._pool = ThreadPoolExecutor(max_workers=driver.concurrency, thread_name_prefix="biocypher-load-csv")
+
+    def close(self):
+        self._pool.shutdown()
+
+    def load_nodes(self, nodes: Iterable) -> int:
+        """Write nodes to CSV and load them; return the number of parts."""
+        if not self.writer.write_nodes(nodes, batch_size=self.driver.batch_size):
+            msg = "Failed to write nodes for LOAD CSV."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        return self._load_parts()
+
+    def load_edges(self, edges: Iterable) -> int:
+        """Write edges to CSV and load them; return the number of parts."""
+        if not self.writer.write_edges(edges, batch_size=self.driver.batch_size):
+            msg = "Failed to write edges for LOAD CSV."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        return self._load_parts()
+
+    def _load_parts(self) -> int:
+        parts = self.writer.take_parts()
+        start = time.perf_counter()
+
+        # nodes of relationships represented as nodes are loaded first
+        for kind in ("node", "edge"):
+            groups = {}
+            for part_kind, label, part, labels in parts:
+                if part_kind == kind:
+                    groups.setdefault(label, []).append((self._query(kind, label, labels), part))
+
+            if kind == "edge":
+                self.driver._ensure_id_indexes(
+                    end for label in groups for end in self.driver._get_schema_endpoint_labels(label)
+                )
+
+            # raises the first error of any label
+            list(self._pool.map(self._load_group, groups.values()))
+
+        self._remove_files(parts)
+        logger.info(f"Loaded {len(parts)} CSV parts in {time.perf_counter() - start:.1f} s.")
+
+        return len(parts)
+
+    def _load_group(self, group: list):
+        for query, part in group:
+            self.driver._driver.query(query, parameters={"url": f"{self.url}{part}"})
+
+    def _remove_files(self, parts: list):
+        """Delete the loaded parts, and the headers written by the writer."""
+        headers = {
+            self._header_path(label) for label in (*self.writer.node_property_dict, *self.writer.edge_property_dict)
+        }
+        for path in [*(os.path.join(self.writer.outdir, part) for _, _, part, _ in parts), *headers]:
+            # headers of earlier calls are not necessarily written again
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+    def _header_path(self, label: str) -> str:
+        label_pascal = self.writer.translator.name_sentence_to_pascal(parse_label(label))
+        return os.path.join(self.writer.outdir, f"{label_pascal}-header.csv")
+
+    def _read_header(self, label: str) -> list:
+        with open(self._header_path(label), encoding="utf-8") as f:
+            return f.readline().strip().split(self.writer.delim)
+
+    def _value(self, column: int, value_type: str | None) -> str:
+        """Cypher expression converting a column to its type."""
+        value = f"row[{column}]"
+        if not value_type or value_type == "string":
+            return value
+
+        if value_type.endswith("[]"):
+            element = _CONVERSIONS.get(value_type[:-2], "{}").format("v")
+            return (
+                f"CASE WHEN coalesce({value}, '') = '' THEN null "
+                f"ELSE [v IN split({value}, '{self.writer.adelim}') | {element}] END"
+            )
+
+        return _CONVERSIONS.get(value_type, "{}").format(value)
+
+    def _query(self, kind: str, label: str, labels: list) -> str:
+        """
+        Query loading one part of a node or edge type.
+
+        Args:
+            kind: ``node`` or ``edge``.
+            label: The BioCypher label of the type; the relationship type
+                of edges, as in online mode.
+            labels: The Neo4j labels of the nodes, as in the offline import.
+        """
+        escape = self.driver._escape
+        properties = []
+        columns = {}
+
+        for column, field in enumerate(self._read_header(label)):
+            name, _, value_type = field.partition(":")
+            if name:
+                properties.append(f"{escape(name)}: {self._value(column, value_type)}")
+            else:
+                columns[value_type] = column
+
+        properties = "{" + ", ".join(properties) + "}"
+        create = self.driver.create_only
+
+        if kind == "node":
+            primary = self.driver._neo4j_label(label)
+            others = "".join(f":{escape(other)}" for other in labels if other != primary)
+            ident = f"row[{columns['ID']}]"
+            if create:
+                write = f"CREATE (n:{escape(primary)} {{id: {ident}}}) SET n += {properties}"
+            else:
+                write = f"MERGE (n:{escape(primary)} {{id: {ident}}}) SET n += {properties}"
+            if others:
+                write += f" SET n{others}"
+
+        else:
+            source, target = self.driver._get_schema_endpoint_labels(label)
+            rel = f"(src)-[r:{escape(label)}]->(tar)"
+            write = (
+                self.driver._endpoint("src", source, f"row[{columns['START_ID']}]", "row")
+                + self.driver._endpoint("tar", target, f"row[{columns['END_ID']}]", "row")
+                + f"{'CREATE' if create else 'MERGE'} {rel} SET r += {properties}"
+            )
+
+        return (
+            f"LOAD CSV FROM $url AS row FIELDTERMINATOR '{self.writer.delim}' "
+            f"CALL {{ WITH row {write} }} IN TRANSACTIONS OF {self.driver.batch_size} ROWS"
+        )
@@ -3,18 +3,29 @@ BioCypher 'online' mode. Handles connection and manipulation of a running DBMS.
 """
 
 import itertools
+import time
 
+from collections import OrderedDict
 from collections.abc import Iterable
 
+from more_itertools import chunked
+
 from biocypher import _misc
 from biocypher._create import BioCypherEdge, BioCypherNode
 from biocypher._logger import logger
 from biocypher._translate import Translator
+from biocypher.output.connect._neo4j_csv import _CsvLoader
 from biocypher.output.connect._neo4j_driver_wrapper import Neo4jDriver
+from biocypher.output.connect._neo4j_loader import _ParallelLoader
 
 logger.debug(f"Loading module {__name__}.")
 __all__ = ["_Neo4jDriver"]
 
+# number of nodes or edges merged per transaction
+DEFAULT_BATCH_SIZE = 10_000
+# number of node ids whose label is remembered for matching edge endpoints
+NODE_LABEL_CACHE_SIZE = 1_000_000
+
 
 class _Neo4jDriver:
     """
@@ -41,6 +52,44 @@ class _Neo4jDriver:
 
         translator (Translator): The translator to use for mapping.
 
+        batch_size (int): The number of nodes or edges merged per
+            transaction.
+
+        driver (neo4j.Driver): An existing driver to use instead of
+            connecting to ``uri``.
+
+        concurrency (int): The number of transactions merging nodes or
+            edges in parallel. Up to the number of cores of the Neo4j
+            server is reasonable; 1 merges serially.
+
+        create_only (bool): Create nodes and relationships instead of
+            merging them. Only for loading deduplicated input into an empty
+            database, e.g. right after a wipe.
+
+        query_cache_size (int): The number of read query results to cache
+            in the ``Neo4jDriver``; 0 disables the cache.
+
+        query_cache_ttl (float): Seconds after which cached query results
+            expire.
+
+        query_stats (bool): Record latency and size statistics of the
+            queries run by the ``Neo4jDriver``.
+
+        slow_query_ms (float): Log queries slower than this many
+            milliseconds, with ``query_stats``.
+
+        query_stats_interval (float): Seconds between log lines summarising
+            the query statistics.
+
+        load_csv_directory (str): Load nodes and edges by writing them to
+            CSV files in this directory, which the Neo4j server must be able
+            to read, and running ``LOAD CSV`` (see ``_CsvLoader``). Much
+            faster for large inputs.
+
+        load_csv_url (str): The URL of ``load_csv_directory`` for the Neo4j
+            server; by default, the directory is the server's import
+            directory.
+
     """
 
     def __init__(
@@ -55,11 +104,35 @@ class _Neo4jDriver:
         fetch_size: int = 1000,
         increment_version: bool = True,
         force_enterprise: bool = False,
+        batch_size: int | None = None,
+        driver=None,
+        concurrency: int | None = None,
+        create_only: bool = False,
+        query_cache_size: int | None = None,
+        query_cache_ttl: float | None = None,
+        query_stats: bool = False,
+        slow_query_ms: float | None = None,
+        query_stats_interval: float | None = None,
+        load_csv_directory: str | None = None,
+        load_csv_url: str | None = None,
         **kwargs,
     ):
         self.translator = translator
+        self.create_only = bool(create_only)
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self.concurrency = max(1, concurrency or 1)
+
+        # labels of the nodes merged by this driver, by node id, least
+        # recently used first; with `create_only`, all ids are kept to skip
+        # duplicates, otherwise up to NODE_LABEL_CACHE_SIZE
+        self._node_labels = OrderedDict()
+        # source and target labels from the schema, by relationship label
+        self._schema_endpoint_labels = {}
+        # labels known to have an index on `id`
+        self._indexed_labels = None
 
         self._driver = Neo4jDriver(
+            driver=driver,
             db_name=database_name,
             db_uri=uri,
             db_user=user,
@@ -69,8 +142,15 @@ class _Neo4jDriver:
             multi_db=multi_db,
             raise_errors=True,
             force_enterprise=force_enterprise,
+            query_cache_size=query_cache_size or 0,
+            query_cache_ttl=query_cache_ttl,
+            query_stats=bool(query_stats),
+            slow_query_ms=slow_query_ms,
+            query_stats_interval=query_stats_interval,
         )
 
+        self._loader = _ParallelLoader(self._driver, self.concurrency) if self.concurrency > 1 else None
+
         # check for biocypher config in connected graph
 
         if wipe:
@@ -80,19 +160,12 @@ class _Neo4jDriver:
             # set new current version node
             self._update_meta_graph()
 
-    def _update_meta_graph(self):
-        """Update the BioCypher meta graph with version information.
-
-        Requires APOC to be installed. If APOC is not available, this
-        operation is skipped with a warning.
-        """
-        if not self._driver.has_apoc:
-            logger.warning(
-                "APOC plugin is not available. Skipping meta graph update. "
-                "Install APOC to enable version tracking: https://neo4j.com/labs/apoc/"
-            )
-            return
+        self._csv_loader = None
+        if load_csv_directory:
+            self._csv_loader = _CsvLoader(self, load_csv_directory, load_csv_url or "file:///")
 
+    def _update_meta_graph(self):
+        """Update the BioCypher meta graph with version information."""
         logger.info("Updating Neo4j meta graph.")
 
         # find current version node
@@ -139,16 +212,96 @@ class _Neo4jDriver:
         logger.info("Creating constraints for node types in config.")
 
         major_neo4j_version = int(self._get_neo4j_version().split(".")[0])
+        statements = []
         # get structure
         for leaf in self.translator.ontology.mapping.extended_schema.items():
-            label = _misc.sentencecase_to_pascalcase(leaf[0], sep=r"\s\.")
+            label = self._neo4j_label(leaf[0])
             if leaf[1]["represented_as"] == "node":
                 if major_neo4j_version >= 5:
                     s = f"CREATE CONSTRAINT `{label}_id` " f"IF NOT EXISTS FOR (n:`{label}`) " "REQUIRE n.id IS UNIQUE"
-                    self._driver.query(s)
                 else:
                     s = f"CREATE CONSTRAINT `{label}_id` " f"IF NOT EXISTS ON (n:`{label}`) " "ASSERT n.id IS UNIQUE"
-                    self._driver.query(s)
+                statements.append(s)
+
+        # one transaction for all constraints
+        self._driver.execute_many(statements)
+
+    @staticmethod
+    def _neo4j_label(label: str) -> str:
+        """Return the Neo4j label of a node label, as used by the constraints."""
+        return _misc.sentencecase_to_pascalcase(label, sep=r"\s\.")
+
+    def _ensure_id_indexes(self, labels: Iterable[str]):
+        """
+        Create an index on the `id` property of the given labels, unless
+        one exists already, e.g. backing a uniqueness constraint, and wait
+        for new indexes to come online.
+        """
+        if self._indexed_labels is None:
+            indexes, _ = self._driver.query(
+                "SHOW INDEXES YIELD labelsOrTypes, properties, entityType "
+                "WHERE entityType = 'NODE' AND properties = ['id'] "
+                "RETURN labelsOrTypes",
+                write=False,
+            )
+            self._indexed_labels = {label for index in indexes or [] for label in index["labelsOrTypes"] or []}
+
+        missing = [label for label in dict.fromkeys(labels) if label and label not in self._indexed_labels]
+        if not missing:
+            return
+
+        logger.info(f"Creating index on `id` of nodes labelled {', '.join(f'`{label}`' for label in missing)}.")
+        self._driver.execute_many(
+            f"CREATE INDEX `{label}_id_index` IF NOT EXISTS FOR (n:`{label}`) ON (n.id)" for label in missing
+        )
+        self._indexed_labels.update(missing)
+
+        self._driver.query("CALL db.awaitIndexes(300)")
+
+    def _get_endpoint_labels(self, rel: dict) -> tuple:
+        """
+        Return the labels of the source and target node of a relationship.
+
+        The label of a node merged by this driver is known from its id.
+        Otherwise, it is taken from the `source` and `target` of the
+        relationship in the schema configuration, if these are single
+        types. Unresolved labels are None.
+        """
+        source = self._get_node_label(rel["source_id"])
+        target = self._get_node_label(rel["target_id"])
+
+        if source is None or target is None:
+            label = rel["relationship_label"]
+            if label not in self._schema_endpoint_labels:
+                self._schema_endpoint_labels[label] = self._get_schema_endpoint_labels(label)
+            schema_source, schema_target = self._schema_endpoint_labels[label]
+            source = source or schema_source
+            target = target or schema_target
+
+        return source, target
+
+    def _get_node_label(self, node_id: str) -> str | None:
+        label = self._node_labels.get(node_id)
+        if label is not None:
+            self._node_labels.move_to_end(node_id)
+        return label
+
+    def _set_node_label(self, node_id: str, label: str):
+        self._node_labels[node_id] = label
+        self._node_labels.move_to_end(node_id)
+        if not self.create_only and len(self._node_labels) > NODE_LABEL_CACHE_SIZE:
+            self._node_labels.popitem(last=False)
+
+    def _get_schema_endpoint_labels(self, label: str) -> tuple:
+        schema = self.translator.ontology.mapping.extended_schema
+        entry = schema.get(label)
+        if not isinstance(entry, dict):
+            # find label in schema by label_as_edge
+            entry = next((v for v in schema.values() if v.get("label_as_edge") == label), {})
+
+        return tuple(
+            self._neo4j_label(entry[end]) if isinstance(entry.get(end), str) else None for end in ("source", "target")
+        )
 
     def _get_neo4j_version(self):
         """Get neo4j version.
@@ -230,6 +383,42 @@ class _Neo4jDriver:
         bn = self.translator.translate_edges(id_src_tar_type_tuples)
         return self.add_biocypher_edges(bn)
 
+    def _run_batch(self, query: str, name: str, rows: list, what: str, method: str):
+        """Run a query on one batch of rows and log the throughput.
+
+        Plain queries run in a managed write transaction, which the Neo4j
+        driver retries on transient errors.
+
+        Args:
+            query: The Cypher query, unwinding the parameter `name`.
+            name: The name of the query parameter holding the rows.
+            rows: The batch of node or edge dictionaries.
+            what: "nodes" or "edges", for logging.
+            method: "query", "explain", or "profile".
+
+        Returns:
+            The result of the driver method.
+        """
+        start = time.perf_counter()
+
+        if method == "query":
+            result = self._driver.execute_write(query, parameters={name: rows})
+        else:
+            result = getattr(self._driver, method)(query, parameters={name: rows})
+
+        self._log_throughput(len(rows), what, start)
+
+        return result
+
+    @staticmethod
+    def _log_throughput(n: int, what: str, start: float):
+        elapsed = time.perf_counter() - start
+        logger.info(f"Merged {n} {what} in {elapsed:.2f} s ({n / max(elapsed, 1e-6):.0f} {what}/s).")
+
+    @property
+    def _parallel(self) -> bool:
+        return self._loader is not None
+
     def add_biocypher_nodes(
         self,
         nodes: Iterable[BioCypherNode],
@@ -246,9 +435,18 @@ class _Neo4jDriver:
         :meth:`biocypher.create.BioCypherNode.get_dict()` method is
         passed into Neo4j as a map of maps, explicitly encoding node id
         and label, and adding all other properties from the 'properties'
-        key of the dict. The merge is performed via APOC, matching only
-        on node id to prevent duplicates. The same properties are set on
-        match and on create, irrespective of the actual event.
+        key of the dict. The nodes are merged with one plain Cypher query
+        per label, matching only on node id to prevent duplicates. The
+        same properties are set on match and on create, irrespective of
+        the actual event. The label is written in PascalCase, as in the
+        id constraints. With ``create_only``, nodes are created without
+        matching, skipping ids this driver has written before.
+
+        The nodes are consumed lazily and merged in batches of
+        ``batch_size``, one transaction per batch. With a ``concurrency``
+        above 1, batches are merged in parallel, partitioned by label.
+        With a ``load_csv_directory``, the nodes are loaded through CSV
+        files instead (see ``_CsvLoader``).
 
         Args:
             nodes:
@@ -259,55 +457,122 @@ class _Neo4jDriver:
                 Do profiling on the CYPHER query.
 
         Returns:
-            True for success, False otherwise.
-
-        Raises:
-            RuntimeError: If APOC is not available and required for the operation.
+            True for success, False otherwise. With ``explain`` or
+            ``profile``, the plan of the last batch.
         """
 
-        try:
-            nodes = _misc.to_list(nodes)
-
-            entities = [node.get_dict() for node in nodes]
-
-        except AttributeError:
-            msg = "Nodes must have a `get_dict` method."
-            logger.error(msg)
-
-            raise ValueError(msg)
+        method = "explain" if explain else "profile" if profile else "query"
 
-        # Check if APOC is available
-        if not self._driver.has_apoc:
-            msg = (
-                "APOC plugin is required for adding nodes. "
-                "Please install APOC in your Neo4j instance. "
-                "See: https://neo4j.com/labs/apoc/"
+        if method == "query" and self._csv_loader:
+            self._csv_loader.load_nodes(_misc.ensure_iterable(nodes))
+            return True
+
+        parallel = method == "query" and self._parallel
+        window_size = self.batch_size * self.concurrency if parallel else self.batch_size
+        result = True
+        n_nodes = 0
+
+        for batch in chunked(self._iter_node_dicts(nodes), window_size):
+            groups = {}
+            for entity in batch:
+                groups.setdefault(entity["node_label"], []).append(entity)
+
+            if parallel:
+                start = time.perf_counter()
+                self._loader.merge_nodes(
+                    {label: (self._node_query(label), group) for label, group in groups.items()},
+                    "entities",
+                    self.batch_size,
+                )
+                self._log_throughput(len(batch), "nodes", start)
+
+            else:
+                for label, group in groups.items():
+                    result = self._run_batch(self._node_query(label), "entities", group, "nodes", method)
+            n_nodes += len(batch)
+
+        logger.info(f"Finished merging {n_nodes} nodes.")
+
+        return result if method != "query" else True
+
+    def _iter_node_dicts(self, nodes: Iterable[BioCypherNode]) -> Iterable[dict]:
+        for node in _misc.ensure_iterable(nodes):
+            try:
+                entity = node.get_dict()
+
+            except AttributeError:
+                msg = "Nodes must have a `get_dict` method."
+                logger.error(msg)
+
+                raise ValueError(msg)
+
+            if self.create_only and entity["node_id"] in self._node_labels:
+                continue
+
+            entity["node_label"] = self._neo4j_label(entity["node_label"])
+            self._set_node_label(entity["node_id"], entity["node_label"])
+            yield entity
+
+    @staticmethod
+    def _escape(name: str) -> str:
+        """Quote a label or relationship type for use in Cypher."""
+        return "`" + name.replace("`", "``") + "`"
+
+    def _node_query(self, label: str) -> str:
+        """Return the query merging, or creating, nodes of one label."""
+        if self.create_only:
+            return (
+                "UNWIND $entities AS ent "
+                f"CREATE (n:{self._escape(label)}) "
+                "SET n = ent.properties, n.id = ent.node_id "
+                "RETURN count(n)"
             )
-            logger.error(msg)
-            raise RuntimeError(msg)
 
-        logger.info(f"Merging {len(entities)} nodes.")
-
-        entity_query = (
+        return (
             "UNWIND $entities AS ent "
-            "CALL apoc.merge.node([ent.node_label], "
-            "{id: ent.node_id}, ent.properties, ent.properties) "
-            "YIELD node "
-            "RETURN node"
+            f"MERGE (n:{self._escape(label)} {{id: ent.node_id}}) "
+            "SET n += ent.properties "
+            "RETURN count(n)"
         )
 
-        method = "explain" if explain else "profile" if profile else "query"
+    def _endpoint(self, var: str, label: str | None, node_id: str, row: str) -> str:
+        """
+        Return Cypher binding ``var`` to the node with id ``node_id``, an
+        expression of the variable ``row``. The label is only used to match
+        the node, so that the index on `id` is used. A node not found with
+        the label, e.g. of a child type of the schema label, or written with
+        other labels by an earlier import, is merged on its id alone, which
+        creates it, without label, if it is missing.
+        """
+        if not label:
+            return f"MERGE ({var} {{id: {node_id}}}) "
+
+        return (
+            f"OPTIONAL MATCH ({var}_found:{self._escape(label)} {{id: {node_id}}}) "
+            f"CALL {{ WITH {row}, {var}_found WITH {row}, {var}_found WHERE {var}_found IS NULL "
+            f"MERGE (n {{id: {node_id}}}) RETURN collect(n) AS {var}_merged }} "
+            f"WITH *, coalesce({var}_found, {var}_merged[0]) AS {var} "
+        )
 
-        result = getattr(self._driver, method)(
-            entity_query,
-            parameters={
-                "entities": entities,
-            },
+    def _edge_query(self, source: str | None, target: str | None, rel_type: str) -> str:
+        """
+        Return the query merging, or creating, relationships of one type
+        between nodes of the given labels. Nodes are matched on their id,
+        using the index of the label (see ``_endpoint``); without a label,
+        all nodes are scanned. Missing nodes are created.
+        """
+        rel_type = self._escape(rel_type)
+        endpoints = (
+            "UNWIND $rels AS r "
+            + self._endpoint("src", source, "r.source_id", "r")
+            + self._endpoint("tar", target, "r.target_id", "r")
         )
 
-        logger.info("Finished merging nodes.")
+        if self.create_only:
+            return endpoints + f"CREATE (src)-[rel:{rel_type}]->(tar) SET rel = r.properties RETURN count(rel)"
 
-        return result
+        # passing the properties on match and on create
+        return endpoints + f"MERGE (src)-[rel:{rel_type}]->(tar) SET rel += r.properties RETURN count(rel)"
 
     def add_biocypher_edges(
         self,
@@ -331,9 +596,26 @@ class _Neo4jDriver:
         passed into Neo4j as a map of maps, explicitly encoding source
         and target ids and the relationship label, and adding all edge
         properties from the 'properties' key of the dict. The merge is
-        performed via APOC, matching only on source and target id to
-        prevent duplicates. The same properties are set on match and on
-        create, irrespective of the actual event.
+        performed with plain Cypher, one query per relationship type,
+        matching only on source and target id to prevent duplicates. The
+        same properties are set on match and on create, irrespective of
+        the actual event. With ``create_only``, relationships are created
+        without matching.
+
+        Source and target nodes are matched with their label, which is
+        known from the nodes merged by this driver or from the schema
+        configuration, so that the index on their `id` is used; the
+        indexes are created if missing. Nodes not found with the label are
+        merged on their id alone. Each batch is merged in one query
+        per source label, target label, and relationship type.
+
+        The edges are consumed lazily in batches of ``batch_size``; the
+        nodes of relationships represented as nodes are merged before the
+        edges of their batch. With a ``concurrency`` above 1, batches are
+        merged in parallel, partitioned by relationship type and by
+        buckets of source and target ids (see ``_ParallelLoader``). With a
+        ``load_csv_directory``, the edges are loaded through CSV files
+        instead (see ``_CsvLoader``).
 
         Args:
             edges:
@@ -344,69 +626,69 @@ class _Neo4jDriver:
                 Do profiling on the CYPHER query.
 
         Returns:
-            `True` for success, `False` otherwise.
+            `True` for success, `False` otherwise. With ``explain`` or
+            ``profile``, the plan of the last batch.
         """
 
         edges = _misc.ensure_iterable(edges)
         edges = itertools.chain(*(_misc.ensure_iterable(i) for i in edges))
 
-        nodes = []
-        rels = []
+        method = "explain" if explain else "profile" if profile else "query"
 
-        try:
-            for e in edges:
-                if hasattr(e, "get_node"):
-                    nodes.append(e.get_node())
-                    rels.append(e.get_source_edge().get_dict())
-                    rels.append(e.get_target_edge().get_dict())
+        if method == "query" and self._csv_loader:
+            self._csv_loader.load_edges(edges)
+            return True
 
-                else:
-                    rels.append(e.get_dict())
+        result = True
+        n_edges = 0
 
-        except AttributeError:
-            msg = "Edges and nodes must have a `get_dict` method."
-            logger.error(msg)
+        parallel = method == "query" and self._parallel
+        window_size = self.batch_size * self.concurrency if parallel else self.batch_size
 
-            raise ValueError(msg)
+        for batch in chunked(edges, window_size):
+            nodes = []
+            rels = []
 
-        self.add_biocypher_nodes(nodes)
-        logger.info(f"Merging {len(rels)} edges.")
+            try:
+                for e in batch:
+                    if hasattr(e, "get_node"):
+                        nodes.append(e.get_node())
+                        rels.append(e.get_source_edge().get_dict())
+                        rels.append(e.get_target_edge().get_dict())
 
-        # Check if APOC is available
-        if not self._driver.has_apoc:
-            msg = (
-                "APOC plugin is required for adding edges. "
-                "Please install APOC in your Neo4j instance. "
-                "See: https://neo4j.com/labs/apoc/"
-            )
-            logger.error(msg)
-            raise RuntimeError(msg)
+                    else:
+                        rels.append(e.get_dict())
 
-        # cypher query
+            except AttributeError:
+                msg = "Edges and nodes must have a `get_dict` method."
+                logger.error(msg)
 
-        # merging only on the ids of the entities, passing the
-        # properties on match and on create;
-        # TODO add node labels?
-        node_query = "UNWIND $rels AS r " "MERGE (src {id: r.source_id}) " "MERGE (tar {id: r.target_id}) "
+                raise ValueError(msg)
 
-        self._driver.query(node_query, parameters={"rels": rels})
+            if nodes:
+                self.add_biocypher_nodes(nodes)
 
-        edge_query = (
-            "UNWIND $rels AS r "
-            "MATCH (src {id: r.source_id}) "
-            "MATCH (tar {id: r.target_id}) "
-            "WITH src, tar, r "
-            "CALL apoc.merge.relationship"
-            "(src, r.relationship_label, NULL, "
-            "r.properties, tar, r.properties) "
-            "YIELD rel "
-            "RETURN rel"
-        )
+            groups = {}
+            for rel in rels:
+                key = (*self._get_endpoint_labels(rel), rel["relationship_label"])
+                groups.setdefault(key, []).append(rel)
 
-        method = "explain" if explain else "profile" if profile else "query"
+            self._ensure_id_indexes(label for key in groups for label in key[:2])
 
-        result = getattr(self._driver, method)(edge_query, parameters={"rels": rels})
+            if parallel:
+                start = time.perf_counter()
+                self._loader.merge_edges(
+                    {key: (self._edge_query(*key), group) for key, group in groups.items()},
+                    "rels",
+                    self.batch_size,
+                )
+                self._log_throughput(len(rels), "edges", start)
 
-        logger.info("Finished merging edges.")
+            else:
+                for key, group in groups.items():
+                    result = self._run_batch(self._edge_query(*key), "rels", group, "edges", method)
+            n_edges += len(rels)
 
-        return result
+        logger.info(f"Finished merging {n_edges} edges.")
+
+        return result if method != "query" else True
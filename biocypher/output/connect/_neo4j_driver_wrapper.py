@@ -9,16 +9,27 @@ is configured for online mode with Neo4j.
 from __future__ import annotations
 
 import contextlib
+import copy
 import itertools
+import json
+import math
 import os
 import re
+import threading
+import time
 import warnings
 
+from collections import Counter, OrderedDict, deque
+from collections.abc import Iterable, Iterator
 from typing import Literal
 
 import appdirs
 import yaml
 
+from more_itertools import chunked
+
+import pandas as pd
+
 from biocypher._logger import logger
 from biocypher._misc import to_list
 
@@ -35,6 +46,21 @@ except ImportError:
     neo4j = None
     neo4j_exc = None
 
+try:
+    import pyarrow
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+BATCH_FORMATS = ("dicts", "pandas", "arrow")
+# relationships or nodes deleted per transaction when wiping a database
+WIPE_BATCH_SIZE = 10_000
+# transactions per query when wiping a database in batches (Neo4j 5+)
+WIPE_ROUND_BATCHES = 100
+# number of slow queries kept in the slow query log
+SLOW_QUERY_LOG_SIZE = 100
+
 CONFIG_FILES = Literal["neo4j.yaml", "neo4j.yml"]
 DEFAULT_CONFIG = {
     "user": "neo4j",
@@ -151,6 +177,223 @@ def _get_neo4j_version(driver) -> str | None:
     return None
 
 
+def _normalize_query(query: str) -> str:
+    """Collapse the whitespace of a query."""
+    return " ".join(query.split())
+
+
+def _db_hits(profile: dict | None) -> int:
+    """Total database hits of a query profile."""
+    if not profile:
+        return 0
+    return profile.get("dbHits", 0) + sum(_db_hits(child) for child in profile.get("children", []))
+
+
+def _consume(result) -> tuple:
+    """Discard the records of a result; their number and the summary."""
+    rows = sum(1 for _ in result)
+    return rows, result.consume()
+
+
+def _parameter_size(parameters: dict) -> int:
+    """Number of values in the parameters, counting the items of collections."""
+    return sum(len(v) if isinstance(v, list | tuple | dict) else 1 for v in parameters.values())
+
+
+class _QueryStats:
+    """
+    Latency and size statistics of queries, by normalized query.
+
+    For each query, records the number of runs and errors, the total and
+    maximum latency, the number of records returned, the database hits of
+    profiled runs, and a histogram of parameter sizes, in powers of ten.
+    Runs slower than ``slow_ms`` are added to a log of the latest slow
+    queries; for each slow read query, a ``PROFILE`` plan is captured once.
+
+    Args:
+        slow_ms (float): The latency in milliseconds above which a query
+            is logged as slow; None to log no queries.
+
+        log_interval (float): Seconds between log lines summarising the
+            statistics; None for no log lines.
+    """
+
+    def __init__(self, slow_ms: float | None = None, log_interval: float | None = None):
+        self.slow_ms = slow_ms
+        self.log_interval = log_interval
+        self.queries = {}
+        self.slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+        self._lock = threading.Lock()
+        self._last_log = time.monotonic()
+
+    def record(
+        self,
+        query: str,
+        db: str,
+        ms: float,
+        rows: int = 0,
+        parameters: dict | None = None,
+        profile: dict | None = None,
+        error: bool = False,
+    ) -> bool:
+        """Record a run of a query; True if it is slow and not profiled yet."""
+        size = _parameter_size(parameters or {})
+        bucket = 10 ** math.ceil(math.log10(size + 1))
+        slow = self.slow_ms is not None and ms > self.slow_ms
+
+        with self._lock:
+            stats = self.queries.setdefault(
+                _normalize_query(query),
+                {
+                    "runs": 0,
+                    "errors": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "db_hits": 0,
+                    "parameter_sizes": Counter(),
+                    "profile": None,
+                    "profiled_db_hits": None,
+                },
+            )
+            stats["runs"] += 1
+            stats["errors"] += error
+            stats["total_ms"] += ms
+            stats["max_ms"] = max(stats["max_ms"], ms)
+            stats["rows"] += rows
+            stats["db_hits"] += _db_hits(profile)
+            stats["parameter_sizes"][bucket] += 1
+
+            if slow:
+                self.slow_queries.append(
+                    {"time": time.time(), "query": query, "db": db, "ms": ms, "rows": rows, "parameter_size": size}
+                )
+                logger.warning(f"Slow query ({ms:.0f} ms, {rows} records): {_normalize_query(query)[:200]}")
+
+            capture = slow and not error and stats["profile"] is None
+
+        self._maybe_log()
+        return capture
+
+    def add_profile(self, query: str, profile: dict) -> None:
+        """Keep the profile of a query, counting its database hits."""
+        with self._lock:
+            stats = self.queries.get(_normalize_query(query))
+            if stats is not None:
+                stats["profile"] = _pretty_profile(copy.deepcopy(profile))
+                stats["profiled_db_hits"] = _db_hits(profile)
+
+    def summary(self, top: int | None = None, sort_by: str = "total_ms") -> list[dict]:
+        with self._lock:
+            rows = [
+                {
+                    "query": query,
+                    **stats,
+                    "mean_ms": stats["total_ms"] / stats["runs"],
+                    "parameter_sizes": dict(sorted(stats["parameter_sizes"].items())),
+                }
+                for query, stats in self.queries.items()
+            ]
+        rows.sort(key=lambda row: row[sort_by], reverse=True)
+        return rows[:top] if top else rows
+
+    def reset(self) -> None:
+        with self._lock:
+            self.queries.clear()
+            self.slow_queries.clear()
+
+    def _maybe_log(self) -> None:
+        if self.log_interval is None or time.monotonic() - self._last_log < self.log_interval:
+            return
+        self._last_log = time.monotonic()
+
+        rows = self.summary()
+        if not rows:
+            return
+        runs = sum(row["runs"] for row in rows)
+        total_ms = sum(row["total_ms"] for row in rows)
+        top = rows[0]
+        logger.info(
+            f"Query stats: {runs} runs of {len(rows)} queries, {total_ms / runs:.1f} ms on average; "
+            f"most time in ({top['runs']} runs, {top['mean_ms']:.1f} ms on average): {top['query'][:200]}"
+        )
+
+
+class _QueryCache:
+    """
+    Results of read queries, by database, query, and parameters.
+
+    A least recently used cache with a maximum number of entries, whose
+    entries expire after ``ttl`` seconds. The results of a database are
+    dropped whenever a write query runs against it. Queries differing only
+    in whitespace share an entry; queries with parameters that are not
+    JSON serializable are not cached.
+
+    Args:
+        maxsize (int): The maximum number of cached results.
+
+        ttl (float): Seconds after which a result expires; None to keep
+            results until they are evicted or invalidated.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(db: str, query: str, parameters: dict) -> tuple | None:
+        try:
+            parameters = json.dumps(parameters, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return db, _normalize_query(query), parameters
+
+    def get(self, key: tuple) -> tuple | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+        data, summary = entry[1]
+        return copy.deepcopy(data), summary
+
+    def put(self, key: tuple, result: tuple) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, db: str | None = None) -> None:
+        """Drop the results of one database, or all results."""
+        with self._lock:
+            for key in [key for key in self._entries if db is None or key[0] == db]:
+                del self._entries[key]
+
+    def info(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+        }
+
+
 class Neo4jDriver:
     """
     Manage the connection to the Neo4j server.
@@ -177,6 +420,11 @@ class Neo4jDriver:
         fallback_on: str | set[str] | None = None,
         multi_db: bool | None = None,
         force_enterprise: bool = False,
+        query_cache_size: int = 0,
+        query_cache_ttl: float | None = None,
+        query_stats: bool = False,
+        slow_query_ms: float | None = None,
+        query_stats_interval: float | None = None,
         **kwargs,
     ):
         """
@@ -216,6 +464,22 @@ class Neo4jDriver:
                 Switch to the fallback databases upon these errors.
             multi_db:
                 Whether to use multi-database mode (Neo4j 4.0+).
+            query_cache_size:
+                Cache the results of up to this many read queries (run with
+                ``write=False``); 0 disables the cache. The cached results
+                of a database are dropped by any write query to it.
+            query_cache_ttl:
+                Seconds after which cached results expire; None to keep
+                them until they are dropped.
+            query_stats:
+                Record latency and size statistics of the queries run,
+                available from :meth:`query_stats`.
+            slow_query_ms:
+                With ``query_stats``, log queries slower than this many
+                milliseconds, and capture a profile of slow read queries.
+            query_stats_interval:
+                With ``query_stats``, log a summary of the statistics every
+                this many seconds.
             kwargs:
                 Ignored.
         """
@@ -240,6 +504,8 @@ class Neo4jDriver:
         self.multi_db = multi_db
         self._neo4j_version_cache = None
         self._force_enterprise = force_enterprise
+        self._query_cache = _QueryCache(query_cache_size, query_cache_ttl) if query_cache_size else None
+        self._query_stats = _QueryStats(slow_query_ms, query_stats_interval) if query_stats else None
 
         if self.driver:
             logger.info("Using the driver provided.")
@@ -644,16 +910,19 @@ class Neo4jDriver:
         # Combine parameters dict with kwargs (kwargs for backward compatibility)
         query_params = dict(parameters or {}, **kwargs)
 
-        # Neo4j 5+ uses database parameter, older versions use it conditionally
-        session_kwargs = {
-            "fetch_size": fetch_size,
-            "default_access_mode": (neo4j.WRITE_ACCESS if write else neo4j.READ_ACCESS),
-        }
+        session_kwargs = self._session_kwargs(db, fetch_size, write)
 
-        # For Neo4j 4.0+, use database parameter if multi_db is True
-        # For Neo4j 5.0+, always use database parameter
-        if self.multi_db or self._is_neo4j_5_plus():
-            session_kwargs["database"] = db
+        cache_key = None
+        if self._query_cache:
+            if write:
+                self._query_cache.invalidate(db)
+            elif not (explain or profile):
+                cache_key = self._query_cache.key(db, query, query_params)
+                cached = cache_key and self._query_cache.get(cache_key)
+                if cached:
+                    return cached
+
+        start = time.perf_counter()
 
         try:
             with self.session(**session_kwargs) as session:
@@ -664,9 +933,36 @@ class Neo4jDriver:
                     res = session.run(query, parameters=query_params)
                 else:
                     res = session.run(query)
-                return res.data(), res.consume()
+                data, summary = res.data(), res.consume()
+
+            if cache_key:
+                self._query_cache.put(cache_key, (copy.deepcopy(data), summary))
+
+            if self._query_stats:
+                slow = self._query_stats.record(
+                    query,
+                    db,
+                    (time.perf_counter() - start) * 1000,
+                    rows=len(data),
+                    parameters=query_params,
+                    profile=summary.profile if profile else None,
+                )
+                # profiling runs the query again, which is safe for reads only
+                if slow and not (write or explain or profile):
+                    self._capture_profile(query, session_kwargs, query_params)
+
+            return data, summary
 
         except (neo4j_exc.Neo4jError, neo4j_exc.DriverError) as e:
+            if self._query_stats:
+                self._query_stats.record(
+                    query,
+                    db,
+                    (time.perf_counter() - start) * 1000,
+                    parameters=query_params,
+                    error=True,
+                )
+
             fallback_db = fallback_db or getattr(self, "_fallback_db", ())
             fallback_on = _to_set(_if_none(fallback_on, self._get_fallback_on))
 
@@ -696,6 +992,391 @@ class Neo4jDriver:
 
             return None, None
 
+    def _capture_profile(self, query: str, session_kwargs: dict, parameters: dict):
+        """Profile a slow read query and keep the plan in the statistics."""
+        try:
+            with self.session(**session_kwargs) as session:
+                summary = session.run("PROFILE " + query, parameters=parameters).consume()
+
+        except (neo4j_exc.Neo4jError, neo4j_exc.DriverError) as e:
+            logger.debug(f"Failed to profile slow query: {e}")
+            return
+
+        if summary.profile:
+            self._query_stats.add_profile(query, summary.profile)
+
+    def query_stats(self, top: int | None = None, sort_by: str = "total_ms") -> list[dict] | None:
+        """
+        Statistics of the queries run, by normalized query.
+
+        Requires ``query_stats``. Results served from the query cache are
+        not counted.
+
+        Args:
+            top:
+                Return only this many queries.
+            sort_by:
+                The statistic to sort the queries by, in descending order,
+                e.g. ``total_ms``, ``max_ms``, ``mean_ms``, or ``runs``.
+
+        Returns:
+            For each query, a dictionary of the number of runs and errors,
+            the total, mean, and maximum latency in milliseconds, the number
+            of records returned, the database hits of profiled runs, the
+            histogram of parameter sizes, and the profile of slow read
+            queries (as lines for printing); None if statistics are
+            disabled.
+        """
+        return self._query_stats.summary(top, sort_by) if self._query_stats else None
+
+    def slow_queries(self) -> list[dict] | None:
+        """The latest queries slower than ``slow_query_ms``, oldest first."""
+        return list(self._query_stats.slow_queries) if self._query_stats else None
+
+    def reset_query_stats(self):
+        """Discard the query statistics recorded so far."""
+        if self._query_stats:
+            self._query_stats.reset()
+
+    def _session_kwargs(self, db: str, fetch_size: int, write: bool = True) -> dict:
+        """Session parameters for a database, fetch size, and access mode."""
+        # Neo4j 5+ uses database parameter, older versions use it conditionally
+        session_kwargs = {
+            "fetch_size": fetch_size,
+            "default_access_mode": (neo4j.WRITE_ACCESS if write else neo4j.READ_ACCESS),
+        }
+
+        # For Neo4j 4.0+, use database parameter if multi_db is True
+        # For Neo4j 5.0+, always use database parameter
+        if self.multi_db or self._is_neo4j_5_plus():
+            session_kwargs["database"] = db
+
+        return session_kwargs
+
+    def execute_write(
+        self,
+        query: str,
+        parameters: dict | None = None,
+        db: str | None = None,
+        raise_errors: bool | None = None,
+    ) -> neo4j.ResultSummary | None:
+        """
+        Run a write query in a managed transaction.
+
+        The Neo4j driver retries managed transactions on transient errors,
+        e.g. deadlocks or leader changes in a cluster, until its maximum
+        retry time. The records returned by the query are discarded. With
+        ``query_stats``, the query is recorded like those of :meth:`query`,
+        but never profiled.
+
+        Args:
+            query:
+                A valid Cypher query.
+            parameters:
+                Parameters dictionary for the query.
+            db:
+                The DB inside the Neo4j server that should be queried.
+            raise_errors:
+                Raise Neo4j errors instead of only printing them.
+
+        Returns:
+            neo4j.ResultSummary: information about the result, None if the
+                query failed or the driver is offline.
+        """
+        if self.offline:
+            logger.info(f"Offline mode, not running query: `{query}`.")
+            return None
+
+        db = db or self._db_config["db"] or neo4j.DEFAULT_DATABASE
+        raise_errors = self._db_config["raise_errors"] if raise_errors is None else raise_errors
+
+        if self._query_cache:
+            self._query_cache.invalidate(db)
+
+        def work(tx):
+            return _consume(tx.run(query, parameters=parameters or {}))
+
+        start = time.perf_counter()
+
+        try:
+            with self.session(**self._session_kwargs(db, self._db_config["fetch_size"])) as session:
+                # `write_transaction` is the name in Neo4j drivers before 5.0
+                execute = getattr(session, "execute_write", None) or session.write_transaction
+                rows, summary = execute(work)
+
+            # slow writes are not profiled, which would run them again
+            if self._query_stats:
+                self._query_stats.record(
+                    query,
+                    db,
+                    (time.perf_counter() - start) * 1000,
+                    rows=rows,
+                    parameters=parameters,
+                )
+
+            return summary
+
+        except (neo4j_exc.Neo4jError, neo4j_exc.DriverError) as e:
+            if self._query_stats:
+                self._query_stats.record(
+                    query,
+                    db,
+                    (time.perf_counter() - start) * 1000,
+                    parameters=parameters,
+                    error=True,
+                )
+
+            logger.error(f"Failed to run query: {e.__class__.__name__}: {e}")
+            logger.error(f"The error happened with this query: {query}")
+
+            if raise_errors:
+                raise
+
+            return None
+
+    def execute_many(
+        self,
+        statements: Iterable[str],
+        parameters_list: Iterable[dict | None] | None = None,
+        db: str | None = None,
+        transaction: bool = True,
+        raise_errors: bool | None = None,
+    ) -> list[neo4j.ResultSummary] | None:
+        """
+        Run a sequence of statements over one session.
+
+        With ``transaction``, all statements run in one managed write
+        transaction, which is committed once and retried by the Neo4j
+        driver on transient errors; each statement is sent without waiting
+        for the records of the previous one. Otherwise, each statement runs
+        in its own auto-commit transaction of the same session, as needed
+        e.g. for ``CALL { } IN TRANSACTIONS``. Schema statements, such as
+        creating constraints, may share a transaction with each other, but
+        not with data writes. The records returned are discarded.
+
+        With ``query_stats``, each statement is recorded like the queries
+        of :meth:`query`, but never profiled; its latency is the time from
+        consuming the result of the previous statement to consuming its
+        own.
+
+        Args:
+            statements:
+                Valid Cypher queries.
+            parameters_list:
+                Parameters dictionaries for the statements, one per
+                statement.
+            db:
+                The DB inside the Neo4j server that should be queried.
+            transaction:
+                Run all statements in one transaction.
+            raise_errors:
+                Raise Neo4j errors instead of only printing them.
+
+        Returns:
+            The summaries of the statements, in their order; None if a
+            statement failed or the driver is offline.
+        """
+        statements = list(statements)
+        parameters_list = [None] * len(statements) if parameters_list is None else list(parameters_list)
+
+        if len(parameters_list) != len(statements):
+            msg = f"Got {len(parameters_list)} parameter dictionaries for {len(statements)} statements."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        if self.offline:
+            logger.info(f"Offline mode, not running {len(statements)} statements.")
+            return None
+
+        if not statements:
+            return []
+
+        db = db or self._db_config["db"] or neo4j.DEFAULT_DATABASE
+        raise_errors = self._db_config["raise_errors"] if raise_errors is None else raise_errors
+
+        if self._query_cache:
+            self._query_cache.invalidate(db)
+
+        def work(runner):
+            began = time.perf_counter()
+            results = [
+                runner.run(statement, parameters=parameters or {})
+                for statement, parameters in zip(statements, parameters_list)
+            ]
+            return self._consume_timed(results, began)
+
+        start = time.perf_counter()
+
+        try:
+            with self.session(**self._session_kwargs(db, self._db_config["fetch_size"])) as session:
+                if not transaction:
+                    consumed = self._consume_timed(
+                        session.run(statement, parameters=parameters or {})
+                        for statement, parameters in zip(statements, parameters_list)
+                    )
+
+                else:
+                    # `write_transaction` is the name in Neo4j drivers before 5.0
+                    execute = getattr(session, "execute_write", None) or session.write_transaction
+                    consumed = execute(work)
+
+            # slow writes are not profiled, which would run them again
+            if self._query_stats:
+                for statement, parameters, (ms, rows, _) in zip(statements, parameters_list, consumed):
+                    self._query_stats.record(statement, db, ms, rows=rows, parameters=parameters)
+
+            return [summary for _, _, summary in consumed]
+
+        except (neo4j_exc.Neo4jError, neo4j_exc.DriverError) as e:
+            if self._query_stats:
+                ms = (time.perf_counter() - start) * 1000 / len(statements)
+                for statement, parameters in zip(statements, parameters_list):
+                    self._query_stats.record(statement, db, ms, parameters=parameters, error=True)
+
+            logger.error(f"Failed to run statements: {e.__class__.__name__}: {e}")
+            logger.error(f"The error happened with these statements: {statements}")
+
+            if raise_errors:
+                raise
+
+            return None
+
+    @staticmethod
+    def _consume_timed(results: Iterable, start: float | None = None) -> list[tuple]:
+        """
+        Consume results in order; for each, the milliseconds since the
+        previous one was consumed, or since ``start``, the number of
+        records, and the summary.
+        """
+        consumed = []
+        last = start or time.perf_counter()
+        for result in results:
+            rows, summary = _consume(result)
+            now = time.perf_counter()
+            consumed.append(((now - last) * 1000, rows, summary))
+            last = now
+        return consumed
+
+    def query_iter(
+        self,
+        query: str,
+        db: str | None = None,
+        fetch_size: int | None = None,
+        write: bool = True,
+        raise_errors: bool | None = None,
+        parameters: dict | None = None,
+        **kwargs,
+    ) -> Iterator[dict]:
+        """
+        Run a Cypher query and yield its records as they arrive.
+
+        Unlike :meth:`query`, the result is not loaded into memory at once:
+        the driver fetches ``fetch_size`` records at a time from the server
+        while the records are consumed. The session stays open until the
+        iterator is exhausted or closed, so it is best consumed completely
+        or used with :func:`contextlib.closing`.
+
+        Args:
+            query:
+                A valid Cypher query.
+            db:
+                The DB inside the Neo4j server that should be queried.
+            fetch_size:
+                The Neo4j fetch size parameter.
+            write:
+                Indicates whether to address write- or read-servers.
+            raise_errors:
+                Raise Neo4j errors instead of only printing them.
+            parameters:
+                Parameters dictionary for the query.
+            **kwargs:
+                Additional parameters (deprecated, use parameters dict instead).
+
+        Yields:
+            The records as dictionaries, as in ``neo4j.Record.data``.
+        """
+        raise_errors = self._db_config["raise_errors"] if raise_errors is None else raise_errors
+
+        if self.offline:
+            logger.info(f"Offline mode, not running query: `{query}`.")
+            return
+
+        if not self.driver or getattr(self.driver, "_closed", False):
+            msg = "Driver is not available. Cannot execute query."
+            logger.error(msg)
+            if raise_errors:
+                raise RuntimeError(msg)
+            return
+
+        db = db or self._db_config["db"] or neo4j.DEFAULT_DATABASE
+        fetch_size = fetch_size or self._db_config["fetch_size"]
+        query_params = dict(parameters or {}, **kwargs)
+
+        if write and self._query_cache:
+            self._query_cache.invalidate(db)
+
+        try:
+            with self.session(**self._session_kwargs(db, fetch_size, write)) as session:
+                for record in session.run(query, parameters=query_params):
+                    yield record.data()
+
+        except (neo4j_exc.Neo4jError, neo4j_exc.DriverError) as e:
+            logger.error(f"Failed to run query: {e.__class__.__name__}: {e}")
+            logger.error(f"The error happened with this query: {query}")
+
+            if raise_errors:
+                raise
+
+    def query_batches(
+        self,
+        query: str,
+        batch_size: int | None = None,
+        as_: Literal["dicts", "pandas", "arrow"] = "dicts",
+        **kwargs,
+    ) -> Iterator[list[dict] | pd.DataFrame | pyarrow.RecordBatch]:
+        """
+        Run a Cypher query and yield its records in batches.
+
+        The records are streamed as in :meth:`query_iter`, and each batch
+        is converted to the requested format, so that only one batch is held
+        in memory at a time.
+
+        Args:
+            query:
+                A valid Cypher query.
+            batch_size:
+                The number of records per batch; by default the fetch size.
+            as_:
+                The format of the batches: ``dicts`` for lists of
+                dictionaries, ``pandas`` for data frames, or ``arrow`` for
+                Arrow record batches (requires pyarrow).
+            **kwargs:
+                Passed to :meth:`query_iter`, e.g. ``db``, ``fetch_size``,
+                ``write``, or ``parameters``.
+
+        Yields:
+            The batches of records, in the requested format.
+        """
+        if as_ not in BATCH_FORMATS:
+            msg = f"Unsupported batch format `{as_}`. Supported formats: {BATCH_FORMATS}."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        if as_ == "arrow" and not HAS_PYARROW:
+            msg = "Arrow batches require pyarrow. Please install it with pip install pyarrow."
+            logger.error(msg)
+            raise ImportError(msg)
+
+        batch_size = batch_size or kwargs.get("fetch_size") or self._db_config["fetch_size"]
+
+        for batch in chunked(self.query_iter(query, **kwargs), batch_size):
+            if as_ == "pandas":
+                yield pd.DataFrame.from_records(batch)
+            elif as_ == "arrow":
+                yield pyarrow.RecordBatch.from_pylist(batch)
+            else:
+                yield batch
+
     def _is_neo4j_5_plus(self) -> bool:
         """Check if Neo4j version is 5.0 or higher."""
         if self._neo4j_version_cache is None:
@@ -834,8 +1515,23 @@ class Neo4jDriver:
             fallback_db=self._get_fallback_db,
         )
 
-    def wipe_db(self):
-        """Delete all contents of the current database."""
+    def wipe_db(self, batch_size: int = WIPE_BATCH_SIZE, recreate: bool = True):
+        """
+        Delete all contents of the current database.
+
+        In Enterprise Edition, the database is replaced by an empty one,
+        which is the fastest way to wipe it. Otherwise, or if replacing
+        fails, relationships and then nodes are deleted in batches, so
+        that no transaction holds more than ``batch_size`` deletions, and
+        then all indexes and constraints are dropped.
+
+        Args:
+            batch_size:
+                The number of relationships or nodes deleted per
+                transaction.
+            recreate:
+                Replace the database by an empty one if the edition allows.
+        """
         if not self.driver:
             raise RuntimeError(
                 "Driver is not available. Cannot wipe database. " "The driver may be closed or in offline mode."
@@ -871,9 +1567,71 @@ class Neo4jDriver:
                 self._register_current_driver()
 
         logger.info(f"Wiping database `{db_to_wipe}`.")
-        self.query("MATCH (n) DETACH DELETE n;")
+
+        if recreate and (self._force_enterprise or self.multi_db) and self._replace_db(db_to_wipe):
+            return
+
+        self._delete_in_batches("relationships", "MATCH ()-[x]->()", "DELETE x", batch_size)
+        self._delete_in_batches("nodes", "MATCH (x)", "DETACH DELETE x", batch_size)
         self.drop_indices_constraints()
 
+    def _replace_db(self, name: str) -> bool:
+        """Replace a database by an empty one; False if that fails."""
+        try:
+            self.query(
+                f"CREATE OR REPLACE DATABASE `{name}` WAIT;",
+                db="system",
+                fallback_on=set(),
+                raise_errors=True,
+            )
+
+        except (neo4j_exc.Neo4jError, neo4j_exc.DriverError) as e:
+            logger.warning(f"Could not replace database `{name}`, deleting its contents instead: {e}")
+            return False
+
+        if self._query_cache:
+            self._query_cache.invalidate(name)
+
+        logger.info(f"Replaced database `{name}` by an empty one.")
+        return True
+
+    def _delete_in_batches(self, what: str, match: str, delete: str, batch_size: int):
+        """
+        Delete the entities matched as `x` in rounds of batches.
+
+        In Neo4j 5+, each round deletes up to ``WIPE_ROUND_BATCHES`` batches
+        in separate transactions with ``CALL { } IN TRANSACTIONS``; before,
+        each round is one transaction of one batch. The number of remaining
+        entities is logged after each round.
+        """
+
+        def remaining() -> int:
+            data, _ = self.query(f"{match} RETURN count(x) AS count")
+            return data[0]["count"] if data else 0
+
+        if self._is_neo4j_5_plus():
+            query = (
+                f"{match} WITH x LIMIT {batch_size * WIPE_ROUND_BATCHES} "
+                f"CALL {{ WITH x {delete} }} IN TRANSACTIONS OF {batch_size} ROWS"
+            )
+        else:
+            query = f"{match} WITH x LIMIT {batch_size} {delete}"
+
+        total = left = remaining()
+        start = time.perf_counter()
+
+        while left:
+            if self.query(query)[1] is None:
+                logger.error(f"Failed to delete {what}, {left:,} of {total:,} left.")
+                return
+
+            previous, left = left, remaining()
+            logger.info(f"Deleted {total - left:,} of {total:,} {what} ({time.perf_counter() - start:.1f} s).")
+
+            if left >= previous:
+                logger.error(f"Deleting {what} made no progress, {left:,} of {total:,} left.")
+                return
+
     def ensure_db(self):
         """Make sure the database exists and is online."""
         db_name = self.current_db
@@ -1008,29 +1766,28 @@ class Neo4jDriver:
         """
         what_u = self._idx_cstr_synonyms(what)
 
-        with self.session() as s:
-            try:
-                # SHOW INDEXES and SHOW CONSTRAINTS work in both Neo4j 4.x and 5.x
-                # Neo4j 5.x unified constraints and indexes, but separate commands still work
-                if what == "constraints":
-                    query = "SHOW CONSTRAINTS"
-                elif what in ("indexes", "indices"):
-                    query = "SHOW INDEXES"
-                else:
-                    query = f"SHOW {what_u}S"  # Plural form
-
-                indices = s.run(query)
-                indices = list(indices)
-                n_indices = len(indices)
-                index_names = ", ".join(i["name"] for i in indices)
+        # SHOW INDEXES and SHOW CONSTRAINTS work in both Neo4j 4.x and 5.x
+        # Neo4j 5.x unified constraints and indexes, but separate commands still work
+        if what == "constraints":
+            query = "SHOW CONSTRAINTS"
+        elif what in ("indexes", "indices"):
+            query = "SHOW INDEXES"
+        else:
+            query = f"SHOW {what_u}S"  # Plural form
 
-                for idx in indices:
-                    s.run(f"DROP {what_u} `{idx['name']}` IF EXISTS")
+        indices, _ = self.query(query, raise_errors=False)
+        if indices is None:
+            return
 
-                logger.info(f"Dropped {n_indices} {what}: {index_names}.")
+        # constraints are dropped with their backing indexes
+        names = [
+            i["name"]
+            for i in indices
+            if what_u != "INDEX" or not (i.get("owningConstraint") or i.get("uniqueness") == "UNIQUE")
+        ]
 
-            except (neo4j_exc.Neo4jError, neo4j_exc.DriverError) as e:
-                logger.error(f"Failed to run query: {e}")
+        if self.execute_many([f"DROP {what_u} `{name}` IF EXISTS" for name in names], raise_errors=False) is not None:
+            logger.info(f"Dropped {len(names)} {what}: {', '.join(names)}.")
 
     def _list_indices(
         self,
@@ -1067,15 +1824,30 @@ class Neo4jDriver:
     @property
     def node_count(self) -> int | None:
         """Number of nodes in the database."""
-        res, summary = self.query("MATCH (n) RETURN COUNT(n) AS count;")
+        res, summary = self.query("MATCH (n) RETURN COUNT(n) AS count;", write=False)
         return res[0]["count"] if res else None
 
     @property
     def edge_count(self) -> int | None:
         """Number of edges in the database."""
-        res, summary = self.query("MATCH ()-[r]->() RETURN COUNT(r) AS count;")
+        res, summary = self.query("MATCH ()-[r]->() RETURN COUNT(r) AS count;", write=False)
         return res[0]["count"] if res else None
 
+    def cache_info(self) -> dict | None:
+        """
+        Statistics of the read query cache.
+
+        Returns:
+            Dictionary of hits, misses, hit rate, current and maximum size,
+            and time to live of the results; None if the cache is disabled.
+        """
+        return self._query_cache.info() if self._query_cache else None
+
+    def clear_cache(self):
+        """Drop all cached query results."""
+        if self._query_cache:
+            self._query_cache.invalidate()
+
     @property
     def user(self) -> str | None:
         """User for the currently active connection."""
@@ -1274,6 +2046,8 @@ class Neo4jDriver:
     ):
         """Switch to online mode."""
         self._offline = False
+        # the server may be a different one
+        self.clear_cache()
 
         try:
             for k, current in self._db_config.items():
@@ -0,0 +1,136 @@
+"""
+Parallel execution of online Neo4j merges.
+
+Batches of a merge are partitioned such that concurrent transactions rarely
+lock the same nodes, and run over sessions of one shared driver.
+"""
+
+import time
+
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from more_itertools import chunked
+
+from biocypher._logger import logger
+from biocypher.output.connect._neo4j_driver_wrapper import Neo4jDriver, neo4j_exc
+
+logger.debug(f"Loading module {__name__}.")
+__all__ = ["_ParallelLoader"]
+
+
+class _ParallelLoader:
+    """
+    Run write queries concurrently in managed transactions.
+
+    A task is a list of `(query, parameters)` pairs, run one after another
+    in the same worker. The tasks of a round run concurrently, each in its
+    own session of the shared driver; rounds run one after another.
+
+    Nodes are partitioned by label. Edges are assigned to a grid of
+    buckets by the hashes of their source and target id; round `k` runs
+    the cells `(i, (i + k) % n)` for all `i`, so the edges of one round
+    never share a source bucket or a target bucket, and parallel
+    transactions rarely wait for each other's locks. Transactions that
+    still fail with a transient error, e.g. a deadlock, are retried with
+    exponential backoff once the Neo4j driver has given up on them.
+
+    Args:
+        driver (Neo4jDriver): The driver wrapper to run the queries with.
+
+        concurrency (int): The number of concurrent transactions.
+
+        max_retries (int): How often to retry a failed transaction.
+
+        retry_delay (float): The delay before the first retry, in seconds.
+    """
+
+    def __init__(
+        self,
+        driver: Neo4jDriver,
+        concurrency: int,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+    ):
+        self.driver = driver
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="biocypher-neo4j")
+
+    def close(self):
+        self._pool.shutdown()
+
+    def _run_task(self, task: list) -> int:
+        n_rows = 0
+        for query, parameters in task:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    self.driver.execute_write(query, parameters=parameters, raise_errors=True)
+                    break
+                except neo4j_exc.TransientError as e:
+                    if attempt == self.max_retries:
+                        raise
+                    delay = self.retry_delay * 2**attempt
+                    logger.warning(f"Transient error, retrying in {delay:.1f} s: {e.__class__.__name__}: {e}")
+                    time.sleep(delay)
+            n_rows += sum(len(rows) for rows in parameters.values() if isinstance(rows, list))
+        return n_rows
+
+    def run_round(self, tasks: Iterable[list]) -> int:
+        """Run tasks concurrently and return the number of rows written."""
+        return sum(self._pool.map(self._run_task, [task for task in tasks if task]))
+
+    def merge_nodes(self, groups: dict, name: str, batch_size: int) -> int:
+        """
+        Merge node dictionaries in concurrent batches of one label each.
+
+        Args:
+            groups: For each label, a tuple of the query merging its nodes
+                and their dictionaries.
+            name: The name of the query parameter holding the rows.
+            batch_size: The maximum number of rows per transaction.
+
+        Returns:
+            The number of merged nodes.
+        """
+        tasks = [
+            [(query, {name: list(batch)})] for query, rows in groups.values() for batch in chunked(rows, batch_size)
+        ]
+        return self.run_round(tasks)
+
+    def merge_edges(self, groups: dict, name: str, batch_size: int) -> int:
+        """
+        Merge relationship dictionaries in rounds of endpoint buckets.
+
+        Args:
+            groups: For each group of relationships, a tuple of the query
+                merging them and their dictionaries with `source_id` and
+                `target_id`.
+            name: The name of the query parameter holding the rows.
+            batch_size: The maximum number of rows per transaction.
+
+        Returns:
+            The number of merged relationships.
+        """
+        n = self.concurrency
+        grid = [[{} for _ in range(n)] for _ in range(n)]
+        for key, (_, rels) in groups.items():
+            for rel in rels:
+                cell = grid[hash(rel["source_id"]) % n][hash(rel["target_id"]) % n]
+                cell.setdefault(key, []).append(rel)
+
+        n_rows = 0
+        for k in range(n):
+            tasks = []
+            for i in range(n):
+                cell = grid[i][(i + k) % n]
+                tasks.append(
+                    [
+                        (groups[key][0], {name: list(batch)})
+                        for key, rels in cell.items()
+                        for batch in chunked(rels, batch_size)
+                    ]
+                )
+            n_rows += self.run_round(tasks)
+        return n_rows
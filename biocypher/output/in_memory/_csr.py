@@ -0,0 +1,268 @@
+from array import array
+from dataclasses import dataclass
+
+import numpy as np
+
+from biocypher._create import BioCypherNode
+from biocypher._logger import logger
+from biocypher.output.in_memory._in_memory_kg import _InMemoryKG
+
+try:
+    import scipy.sparse
+
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+# type code of nodes only known as edge endpoints
+_NO_TYPE = -1
+
+
+@dataclass(frozen=True)
+class CsrAdjacency:
+    """Compressed sparse row adjacency of one relationship type.
+
+    The targets of the node with index `i` are
+    `indices[indptr[i]:indptr[i + 1]]`; `edges` holds the insertion position
+    of each edge, to look up its properties.
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    edges: np.ndarray
+    shape: tuple
+
+
+class _EdgeBuffer:
+    """Edges of one relationship type in coordinate form, plus properties."""
+
+    def __init__(self):
+        self.sources = array("i")
+        self.targets = array("i")
+        self.columns = {}
+
+    def __len__(self):
+        return len(self.sources)
+
+
+def _append_row(columns: dict, n_rows: int, index: int, values: dict) -> None:
+    """Set the values of row `index` in property columns of `n_rows` rows."""
+    for key in values:
+        if key not in columns:
+            columns[key] = []
+
+    # grow all columns to the new number of rows
+    for column in columns.values():
+        if len(column) < n_rows:
+            column.extend([None] * (n_rows - len(column)))
+
+    for key, value in values.items():
+        columns[key][index] = value
+
+
+class CsrKG(_InMemoryKG):
+    """In-memory knowledge graph as sparse adjacency arrays.
+
+    Node ids are interned to contiguous integer indices on arrival. Edges
+    are appended per relationship type to integer coordinate arrays, which
+    are converted to a compressed sparse row (CSR) structure on first
+    access after a change, at about 12 bytes per edge. Node and edge
+    properties are stored column by column.
+
+    `get_kg` returns the instance itself; use :meth:`csr`,
+    :attr:`node_ids`, :attr:`node_index`, and :meth:`node_property` to
+    access the graph, or :meth:`to_scipy` for a SciPy sparse array.
+
+    Args:
+        deduplicator (Deduplicator): the deduplicator instance
+    """
+
+    def __init__(self, deduplicator):
+        super().__init__()  # keeping in spite of ABC not having __init__
+        self.deduplicator = deduplicator
+
+        self.node_ids = []
+        self.node_index = {}
+        self.node_types = []
+        self._node_type_index = {}
+        self._node_type_codes = array("i")
+        self._node_columns = {}
+
+        self._edges = {}
+        self._csr = {}
+
+    def get_kg(self):
+        return self
+
+    def add_nodes(self, nodes):
+        self._add_entities(nodes)
+        return True
+
+    def add_edges(self, edges):
+        self._add_entities(edges)
+        return True
+
+    def _add_entities(self, entities):
+        for entity in self._iter_deduplicated(entities):
+            if isinstance(entity, BioCypherNode):
+                self._add_node(entity)
+            else:
+                self._add_edge(entity)
+
+    def _intern(self, node_id: str) -> int:
+        """Return the index of a node id, assigning the next one if new."""
+        index = self.node_index.get(node_id)
+        if index is None:
+            index = self.node_index[node_id] = len(self.node_ids)
+            self.node_ids.append(node_id)
+            self._node_type_codes.append(_NO_TYPE)
+        return index
+
+    def _add_node(self, node):
+        index = self._intern(node.get_id())
+
+        label = node.get_label()
+        code = self._node_type_index.get(label)
+        if code is None:
+            code = self._node_type_index[label] = len(self.node_types)
+            self.node_types.append(label)
+        self._node_type_codes[index] = code
+
+        _append_row(self._node_columns, len(self.node_ids), index, node.get_properties())
+
+    def _add_edge(self, edge):
+        rel_type = edge.get_label()
+        buffer = self._edges.get(rel_type)
+        if buffer is None:
+            buffer = self._edges[rel_type] = _EdgeBuffer()
+
+        buffer.sources.append(self._intern(edge.get_source_id()))
+        buffer.targets.append(self._intern(edge.get_target_id()))
+
+        values = dict(edge.get_properties())
+        if edge.get_id() is not None:
+            values["relationship_id"] = edge.get_id()
+        _append_row(buffer.columns, len(buffer), len(buffer) - 1, values)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def relationship_types(self) -> list:
+        return list(self._edges)
+
+    def n_edges(self, rel_type: str | None = None) -> int:
+        """Return the number of edges of a relationship type, or of all types."""
+        if rel_type is None:
+            return sum(len(buffer) for buffer in self._edges.values())
+        buffer = self._edges.get(rel_type)
+        return len(buffer) if buffer else 0
+
+    def csr(self, rel_type: str) -> CsrAdjacency:
+        """Return the CSR adjacency of a relationship type.
+
+        The arrays are built once per change of the graph and returned
+        without copying; they must not be modified.
+
+        Args:
+            rel_type (str): the relationship label
+
+        Returns:
+            CsrAdjacency: `indptr` (int64, one entry per node plus one),
+                `indices` (int32 target node indices), and `edges` (int32
+                insertion positions of the edges)
+        """
+        buffer = self._edges.get(rel_type)
+        if buffer is None:
+            msg = f"No edges of relationship type `{rel_type}`. Available: {self.relationship_types}."
+            logger.error(msg)
+            raise KeyError(msg)
+
+        n_nodes = self.n_nodes
+        adjacency = self._csr.get(rel_type)
+        if adjacency is not None and adjacency.shape[0] == n_nodes and len(adjacency.indices) == len(buffer):
+            return adjacency
+
+        sources = np.frombuffer(buffer.sources, dtype=np.int32)
+        targets = np.frombuffer(buffer.targets, dtype=np.int32)
+        order = np.argsort(sources, kind="stable")
+
+        indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n_nodes), out=indptr[1:])
+        adjacency = CsrAdjacency(
+            indptr=indptr,
+            indices=targets[order],
+            edges=order.astype(np.int32),
+            shape=(n_nodes, n_nodes),
+        )
+        # drop the views so the coordinate arrays can grow again
+        del sources, targets
+
+        self._csr[rel_type] = adjacency
+        return adjacency
+
+    def neighbors(self, node_id: str, rel_type: str) -> list:
+        """Return the ids of the targets of a node's edges of one type."""
+        adjacency = self.csr(rel_type)
+        index = self.node_index[node_id]
+        targets = adjacency.indices[adjacency.indptr[index] : adjacency.indptr[index + 1]]
+        return [self.node_ids[i] for i in targets]
+
+    def node_type(self, node_id: str) -> str | None:
+        """Return the label of a node, or None if only known from edges."""
+        code = self._node_type_codes[self.node_index[node_id]]
+        return None if code == _NO_TYPE else self.node_types[code]
+
+    def node_type_codes(self) -> np.ndarray:
+        """Return the label code of every node, indexing :attr:`node_types`.
+
+        Nodes only known as edge endpoints have code -1.
+        """
+        return np.array(self._node_type_codes, dtype=np.int32)
+
+    def node_property(self, key: str) -> np.ndarray:
+        """Return a node property as an array aligned with :attr:`node_ids`.
+
+        Missing values are None in object arrays and NaN in float arrays.
+        """
+        return self._to_array(self._node_columns.get(key, []), self.n_nodes, key)
+
+    def edge_property(self, rel_type: str, key: str) -> np.ndarray:
+        """Return an edge property in insertion order.
+
+        Index the result with `csr(rel_type).edges` to align it with the
+        CSR `indices`.
+        """
+        buffer = self._edges[rel_type]
+        return self._to_array(buffer.columns.get(key, []), len(buffer), key)
+
+    @staticmethod
+    def _to_array(column: list, n_rows: int, key: str) -> np.ndarray:
+        if len(column) < n_rows:
+            column = column + [None] * (n_rows - len(column))
+
+        values = [value for value in column if value is not None]
+        if values and all(isinstance(v, bool) for v in values) and len(values) == n_rows:
+            return np.array(column, dtype=bool)
+        if values and all(isinstance(v, int | float) and not isinstance(v, bool) for v in values):
+            return np.array([np.nan if v is None else v for v in column], dtype=float)
+
+        array_ = np.empty(n_rows, dtype=object)
+        array_[:] = column
+        return array_
+
+    def to_scipy(self, rel_type: str):
+        """Return the adjacency of a relationship type as a SciPy CSR array.
+
+        The entries are ones, with parallel edges stored as duplicate
+        entries; the index arrays are shared with :meth:`csr`.
+        """
+        if not HAS_SCIPY:
+            msg = "SciPy is not installed. Please install it to use `to_scipy`."
+            logger.error(msg)
+            raise ImportError(msg)
+
+        adjacency = self.csr(rel_type)
+        data = np.ones(len(adjacency.indices), dtype=np.int32)
+        return scipy.sparse.csr_array((data, adjacency.indices, adjacency.indptr), shape=adjacency.shape)
@@ -7,8 +7,10 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from biocypher._config import config as _config
 from biocypher._logger import logger
 from biocypher.output.in_memory._airr import AirrKG
+from biocypher.output.in_memory._csr import CsrKG
 from biocypher.output.in_memory._networkx import NetworkxKG
 from biocypher.output.in_memory._pandas import PandasKG
 
@@ -20,26 +22,47 @@ logger.debug(f"Loading module {__name__}.")
 
 __all__ = ["get_in_memory_kg"]
 
-IN_MEMORY_DBMS = ["csv", "pandas", "tabular", "networkx", "airr"]
+IN_MEMORY_DBMS = ["csv", "pandas", "tabular", "networkx", "airr", "csr"]
 
 
 def get_in_memory_kg(
     dbms: str,
     deduplicator: Deduplicator,
+    extended_schema: dict | None = None,
 ) -> _InMemoryKG:
     """Return the in-memory KG class.
 
+    Args:
+    ----
+        dbms: the in-memory DBMS to use
+        deduplicator: the deduplicator instance
+        extended_schema: the extended schema configuration, used to derive
+            the column dtypes of the Pandas KG
+
     Returns
     -------
         _InMemoryKG: the in-memory KG class
 
     """
+    dbms_config = _config(dbms) or {}
+
     if dbms in ["csv", "pandas", "tabular"]:
-        return PandasKG(deduplicator)
+        # the Pandas KG options are documented in the `csv` section
+        csv_config = _config("csv") or {}
+        return PandasKG(
+            deduplicator,
+            extended_schema=extended_schema,
+            pyarrow_strings=csv_config.get("pyarrow_strings", False),
+        )
     if dbms == "networkx":
-        return NetworkxKG(deduplicator)
+        return NetworkxKG(
+            deduplicator,
+            multigraph=dbms_config.get("multigraph", False),
+        )
     elif dbms == "airr":
         return AirrKG(deduplicator)
+    elif dbms == "csr":
+        return CsrKG(deduplicator)
     else:
         msg = f"Getting the in memory BioCypher KG is not supported for the DBMS {dbms}. Supported: {IN_MEMORY_DBMS}."
         logger.error(msg)
@@ -42,12 +42,12 @@ class _InMemoryKG(ABC):
         """Return the in-memory knowledge graph."""
         raise NotImplementedError("InMemoryKG implementation must override 'get_kg'")
 
-    def _separate_entity_types(self, entities):
+    def _iter_deduplicated(self, entities):
         """
-        Given mixed iterable of BioCypher objects, separate them into lists by
-        type. Also deduplicates using the `Deduplicator` instance.
+        Given mixed iterable of BioCypher objects, yield the nodes and edges
+        not seen before, using the `Deduplicator` instance. Relationships
+        represented as nodes are yielded as their node and two edges.
         """
-        lists = {}
         for entity in entities:
             if (
                 not isinstance(entity, BioCypherNode)
@@ -69,26 +69,20 @@ class _InMemoryKG(ABC):
                 continue
 
             if isinstance(entity, BioCypherRelAsNode):
-                node = entity.get_node()
-                source_edge = entity.get_source_edge()
-                target_edge = entity.get_target_edge()
-
-                _type = node.get_type()
-                if _type not in lists:
-                    lists[_type] = []
-                lists[_type].append(node)
-
-                _source_type = source_edge.get_type()
-                if _source_type not in lists:
-                    lists[_source_type] = []
-                lists[_source_type].append(source_edge)
-
-                _target_type = target_edge.get_type()
-                if _target_type not in lists:
-                    lists[_target_type] = []
-                lists[_target_type].append(target_edge)
+                yield entity.get_node()
+                yield entity.get_source_edge()
+                yield entity.get_target_edge()
                 continue
 
+            yield entity
+
+    def _separate_entity_types(self, entities):
+        """
+        Given mixed iterable of BioCypher objects, separate them into lists by
+        type. Also deduplicates using the `Deduplicator` instance.
+        """
+        lists = {}
+        for entity in self._iter_deduplicated(entities):
             _type = entity.get_type()
             if _type not in lists:
                 lists[_type] = []
@@ -1,44 +1,56 @@
 import networkx as nx
 
+from biocypher._create import BioCypherNode
 from biocypher.output.in_memory._in_memory_kg import _InMemoryKG
-from biocypher.output.in_memory._pandas import PandasKG
 
 
 class NetworkxKG(_InMemoryKG):
-    def __init__(self, deduplicator):
+    """In-memory knowledge graph as a NetworkX DiGraph or MultiDiGraph.
+
+    Nodes and edges are added to the graph as they arrive, without
+    intermediate tables. Node attributes are the node label and properties,
+    edge attributes the relationship id, label, and properties.
+
+    Args:
+        deduplicator (Deduplicator): the deduplicator instance
+        multigraph (bool): whether to build a MultiDiGraph, which keeps
+            parallel edges between the same nodes (keyed by relationship
+            id), instead of a DiGraph
+    """
+
+    def __init__(self, deduplicator, multigraph: bool = False):
         super().__init__()  # keeping in spite of ABC not having __init__
         self.deduplicator = deduplicator
-        self._pd = PandasKG(
-            deduplicator=self.deduplicator,
-        )
-        self.KG = None
+        self.multigraph = multigraph
+        self.KG = nx.MultiDiGraph() if multigraph else nx.DiGraph()
 
     def get_kg(self):
-        if not self.KG:
-            self.KG = self._create_networkx_kg()
         return self.KG
 
     def add_nodes(self, nodes):
-        self._pd.add_nodes(nodes)
+        self._add_entities(nodes)
         return True
 
     def add_edges(self, edges):
-        self._pd.add_edges(edges)
+        self._add_entities(edges)
         return True
 
-    def _create_networkx_kg(self) -> nx.DiGraph:
-        self.KG = nx.DiGraph()
-        all_dfs = self._pd.dfs
-        node_dfs = [df for df in all_dfs.values() if df.columns.str.contains("node_id").any()]
-        edge_dfs = [
-            df
-            for df in all_dfs.values()
-            if df.columns.str.contains("source_id").any() and df.columns.str.contains("target_id").any()
-        ]
-        for df in node_dfs:
-            nodes = df.set_index("node_id").to_dict(orient="index")
-            self.KG.add_nodes_from(nodes.items())
-        for df in edge_dfs:
-            edges = df.set_index(["source_id", "target_id"]).to_dict(orient="index")
-            self.KG.add_edges_from(((source, target, attrs) for (source, target), attrs in edges.items()))
-        return self.KG
+    def _add_entities(self, entities):
+        for entity in self._iter_deduplicated(entities):
+            if isinstance(entity, BioCypherNode):
+                attrs = {"node_label": entity.get_label()}
+                for key, value in entity.get_properties().items():
+                    attrs.setdefault(key, value)
+                self.KG.add_node(entity.get_id(), **attrs)
+                continue
+
+            attrs = {
+                "relationship_id": entity.get_id(),
+                "relationship_label": entity.get_label(),
+            }
+            for key, value in entity.get_properties().items():
+                attrs.setdefault(key, value)
+            if self.multigraph:
+                self.KG.add_edge(entity.get_source_id(), entity.get_target_id(), key=entity.get_id(), **attrs)
+            else:
+                self.KG.add_edge(entity.get_source_id(), entity.get_target_id(), **attrs)
@@ -1,14 +1,90 @@
 import pandas as pd
 
+from biocypher._create import BioCypherNode
+from biocypher._logger import logger
 from biocypher.output.in_memory._in_memory_kg import _InMemoryKG
 
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# pandas dtypes for the property types of the schema configuration
+_SCHEMA_DTYPES = {
+    "int": "Int64",
+    "integer": "Int64",
+    "long": "Int64",
+    "float": "Float64",
+    "double": "Float64",
+    "dbl": "Float64",
+    "bool": "boolean",
+    "boolean": "boolean",
+}
+_STRING_TYPES = ("str", "string")
+_ID_COLUMNS = ("node_id", "relationship_id", "source_id", "target_id")
+_LABEL_COLUMNS = ("node_label", "relationship_label")
+
+
+def _flatten(props: dict, prefix: str = ""):
+    """Flatten nested property dictionaries into dotted keys."""
+    for key, value in props.items():
+        if isinstance(value, dict) and value:
+            yield from _flatten(value, f"{prefix}{key}.")
+        else:
+            yield f"{prefix}{key}", value
+
+
+class _ColumnBuffer:
+    """Rows of one node or edge type, stored column by column."""
+
+    def __init__(self):
+        self.columns = {}
+        self.n_rows = 0
+
+    def append(self, row: dict):
+        columns = self.columns
+        for key, value in row.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * self.n_rows
+            column.append(value)
+        self.n_rows += 1
+
+        # fill in properties missing from this row
+        if len(row) != len(columns):
+            for column in columns.values():
+                if len(column) < self.n_rows:
+                    column.append(None)
+
 
 class PandasKG(_InMemoryKG):
-    def __init__(self, deduplicator):
+    def __init__(self, deduplicator, extended_schema: dict | None = None, pyarrow_strings: bool = False):
         super().__init__()  # keeping in spite of ABC not having __init__
         self.deduplicator = deduplicator
+        self.extended_schema = extended_schema or {}
+
+        if pyarrow_strings and not HAS_PYARROW:
+            logger.warning("pyarrow is not installed; string columns keep the default dtype.")
+            pyarrow_strings = False
+        self.pyarrow_strings = pyarrow_strings
+
+        self._dfs = {}
+        # rows added since the last access, per type
+        self._buffers = {}
 
-        self.dfs = {}
+    @property
+    def dfs(self):
+        """Data frames per node and edge type, including all added entities."""
+        if self._buffers:
+            self._materialize()
+        return self._dfs
+
+    @dfs.setter
+    def dfs(self, dfs):
+        self._dfs = dfs
+        self._buffers = {}
 
     def get_kg(self):
         return self.dfs
@@ -20,18 +96,83 @@ class PandasKG(_InMemoryKG):
         self.add_tables(edges)
 
     def add_tables(self, entities):
-        """Add Pandas dataframes for each node and edge type in the input."""
-        lists = self._separate_entity_types(entities)
+        """Add the entities of the input to the tables of their type.
 
-        for _type, _entities in lists.items():
-            self._add_entity_df(_type, _entities)
+        The rows are buffered per column and only turned into data frames
+        on the next access of :py:attr:`dfs`.
+        """
+        for entity in self._iter_deduplicated(entities):
+            self._append(entity)
 
-    def _add_entity_df(self, _type, _entities):
-        df = pd.DataFrame(pd.json_normalize([node.get_dict() for node in _entities]))
-        # replace "properties." with "" in column names
-        df.columns = [col.replace("properties.", "") for col in df.columns]
-        if _type not in self.dfs:
-            self.dfs[_type] = df
+    def _append(self, entity):
+        _type = entity.get_type()
+        buffer = self._buffers.get(_type)
+        if buffer is None:
+            buffer = self._buffers[_type] = _ColumnBuffer()
+
+        if isinstance(entity, BioCypherNode):
+            row = {"node_id": entity.get_id(), "node_label": entity.get_label()}
         else:
-            self.dfs[_type] = pd.concat([self.dfs[_type], df], ignore_index=True)
+            row = {
+                "relationship_id": entity.get_id(),
+                "source_id": entity.get_source_id(),
+                "target_id": entity.get_target_id(),
+                "relationship_label": entity.get_label(),
+            }
+        for key, value in _flatten(entity.get_properties()):
+            row.setdefault(key, value)
+
+        buffer.append(row)
+
+    def _add_entity_df(self, _type, _entities):
+        for entity in _entities:
+            self._append(entity)
         return self.dfs[_type]
+
+    def _materialize(self):
+        """Turn the buffered rows into data frames and append them."""
+        for _type, buffer in self._buffers.items():
+            df = pd.DataFrame(buffer.columns)
+            if _type in self._dfs:
+                df = pd.concat([self._dfs[_type], df], ignore_index=True)
+            self._dfs[_type] = self._apply_dtypes(_type, df)
+        self._buffers = {}
+
+    def _get_dtypes(self, _type, columns) -> dict:
+        """Get the dtypes of a table from the schema configuration.
+
+        Labels are categorical, and integer, float, and boolean properties
+        use the nullable pandas dtypes. Strings are backed by pyarrow if
+        enabled. Columns without a schema type keep the inferred dtype.
+        """
+        string_dtype = "string[pyarrow]" if self.pyarrow_strings else None
+
+        dtypes = {}
+        for column in columns:
+            if column in _LABEL_COLUMNS:
+                dtypes[column] = "category"
+            elif column in _ID_COLUMNS and string_dtype:
+                dtypes[column] = string_dtype
+
+        schema_entry = self.extended_schema.get(_type)
+        properties = schema_entry.get("properties") if isinstance(schema_entry, dict) else None
+        for key, prop_type in (properties or {}).items():
+            if key not in columns:
+                continue
+            prop_type = str(prop_type).lower()
+            if prop_type in _SCHEMA_DTYPES:
+                dtypes[key] = _SCHEMA_DTYPES[prop_type]
+            elif prop_type in _STRING_TYPES and string_dtype:
+                dtypes[key] = string_dtype
+
+        return dtypes
+
+    def _apply_dtypes(self, _type, df):
+        for column, dtype in self._get_dtypes(_type, df.columns).items():
+            if str(df[column].dtype) == dtype:
+                continue
+            try:
+                df[column] = df[column].astype(dtype)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Keeping inferred dtype for `{column}` of `{_type}`; cannot convert to {dtype}: {e}")
+        return df
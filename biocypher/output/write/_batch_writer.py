@@ -20,6 +20,9 @@ from biocypher.output.write._writer import _Writer
 class _BatchWriter(_Writer, ABC):
     """Abstract batch writer class."""
 
+    # part files are written independently of the headers
+    _parallel_write = True
+
     @abstractmethod
     def _quote_string(self, value: str) -> str:
         """Quote a string.
@@ -310,6 +313,14 @@ class _BatchWriter(_Writer, ABC):
 
         self.parts = {}  # dict to store the paths of part files for each label
 
+        # inserted into part file names to keep the parts of concurrent
+        # writers apart, e.g. `Protein-part-a003-000.csv`
+        self.part_prefix = ""
+
+        # if set to a dict, records the deduplication keys of the entities
+        # in each part file, in line order: {part: (kind, label, keys)}
+        self.part_keys = None
+
         self._labels_orders = ["Alphabetical", "Ascending", "Descending", "Leaves", "None"]
         self.labels_order = labels_order
         self.node_labels_order = node_labels_order
@@ -451,6 +462,47 @@ class _BatchWriter(_Writer, ABC):
         -------
             bool: The return value. True for success, False otherwise.
 
+        """
+        passed, has_node = self._write_edge_stream(edges, batch_size)
+        if not passed:
+            logger.error("Error while writing edge data.")
+            return False
+
+        if has_node:
+            # pass property data to header writer per node type written
+            passed = self._write_node_headers()
+            if not passed:
+                logger.error("Error while writing node headers.")
+                return False
+
+        # pass property data to header writer per edge type written
+        passed = self._write_edge_headers()
+        if not passed:
+            logger.error("Error while writing edge headers.")
+            return False
+
+        return True
+
+    def _write_edge_stream(self, edges: Iterable, batch_size: int) -> tuple[bool, bool]:
+        """Write edge data, including relationships represented as nodes.
+
+        Deduplicates the incoming edges and writes the part files, but does
+        not write any headers.
+
+        Args:
+        ----
+            edges (Iterable): an iterable of edges in
+                :py:class:`BioCypherEdge` or :py:class:`BioCypherRelAsNode`
+                format
+
+            batch_size (int): The number of entities per type to buffer
+                before writing a part file.
+
+        Returns:
+        -------
+            tuple[bool, bool]: Whether writing succeeded, and whether any
+                relationship was written as a node.
+
         """
         passed = True
         empty = True
@@ -490,24 +542,7 @@ class _BatchWriter(_Writer, ABC):
                 "No edges to write, possibly due to no matched Biolink classes.",
             )
 
-        if not passed:
-            logger.error("Error while writing edge data.")
-            return False
-
-        if has_node:
-            # pass property data to header writer per node type written
-            passed = self._write_node_headers()
-            if not passed:
-                logger.error("Error while writing node headers.")
-                return False
-
-        # pass property data to header writer per edge type written
-        passed = self._write_edge_headers()
-        if not passed:
-            logger.error("Error while writing edge headers.")
-            return False
-
-        return True
+        return passed, has_node
 
     def _get_all_labels(self, label, labels_order, force: bool = False):
         all_labels = {}
@@ -828,7 +863,10 @@ class _BatchWriter(_Writer, ABC):
 
         # avoid writing empty files
         if lines:
-            self._write_next_part(label, lines)
+            keys = None
+            if self.part_keys is not None:
+                keys = [n.get_id() for n in node_list]
+            self._write_next_part(label, lines, ("node", keys))
 
         return True
 
@@ -1147,11 +1185,14 @@ class _BatchWriter(_Writer, ABC):
 
         # avoid writing empty files
         if lines:
-            self._write_next_part(label, lines)
+            keys = None
+            if self.part_keys is not None:
+                keys = [Deduplicator.edge_key(e) for e in edge_list]
+            self._write_next_part(label, lines, ("edge", keys))
 
         return True
 
-    def _write_next_part(self, label: str, lines: list):
+    def _write_next_part(self, label: str, lines: list, keys: tuple | None = None):
         """Write a list of strings to a new part file.
 
         Args:
@@ -1162,6 +1203,10 @@ class _BatchWriter(_Writer, ABC):
 
             lines (list): list of strings to be written
 
+            keys (tuple): the kind of entity ("node" or "edge") and the
+                deduplication keys of the written entities, stored in
+                :py:attr:`self.part_keys` if key recording is enabled
+
         Returns:
         -------
             bool: The return value. True for success, False otherwise.
@@ -1171,27 +1216,17 @@ class _BatchWriter(_Writer, ABC):
         label_pascal = self.translator.name_sentence_to_pascal(parse_label(label))
 
         # list files in self.outdir
-        files = glob.glob(os.path.join(self.outdir, f"{label_pascal}-part*.csv"))
-        # find file with highest part number
-        if not files:
-            next_part = 0
-
-        else:
-            next_part = (
-                max(
-                    [int(f.split(".")[-2].split("-")[-1].replace("part", "")) for f in files],
-                )
-                + 1
-            )
+        files = glob.glob(os.path.join(self.outdir, f"{label_pascal}-part{self.part_prefix}*.csv"))
+        # find file with highest part number, ignoring parts of other writers
+        pattern = re.compile(rf"{re.escape(label_pascal)}-part{re.escape(self.part_prefix)}(\d+)\.csv")
+        numbers = [int(m.group(1)) for m in (pattern.fullmatch(os.path.basename(f)) for f in files) if m]
+        next_part = max(numbers) + 1 if numbers else 0
 
         # write to file
         padded_part = str(next_part).zfill(3)
-        logger.info(
-            f"Writing {len(lines)} entries to {label_pascal}-part{padded_part}.csv",
-        )
-
         # store name only in case import_call_file_prefix is set
-        part = f"{label_pascal}-part{padded_part}.csv"
+        part = f"{label_pascal}-part{self.part_prefix}{padded_part}.csv"
+        logger.info(f"Writing {len(lines)} entries to {part}")
         file_path = os.path.join(self.outdir, part)
 
         with open(file_path, "w", encoding="utf-8") as f:
@@ -1203,6 +1238,10 @@ class _BatchWriter(_Writer, ABC):
         else:
             self.parts[label].append(part)
 
+        if self.part_keys is not None and keys is not None:
+            kind, entity_keys = keys
+            self.part_keys[part] = (kind, label, entity_keys)
+
     def get_import_call(self) -> str:
         """Eeturn the import call.
 
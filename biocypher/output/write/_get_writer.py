@@ -16,6 +16,7 @@ from biocypher.output.write.graph._neo4j import _Neo4jBatchWriter
 from biocypher.output.write.graph._networkx import _NetworkXWriter
 from biocypher.output.write.graph._owl import _OWLWriter
 from biocypher.output.write.graph._rdf import _RDFWriter
+from biocypher.output.write.graph._tensor import _TensorWriter
 from biocypher.output.write.relational._csv import _PandasCSVWriter
 from biocypher.output.write.relational._postgresql import _PostgreSQLBatchWriter
 from biocypher.output.write.relational._sqlite import _SQLiteBatchWriter
@@ -55,6 +56,8 @@ DBMS_TO_CLASS = {
     "networkx": _NetworkXWriter,
     "NetworkX": _NetworkXWriter,
     "airr": _AirrWriter,
+    "tensor": _TensorWriter,
+    "Tensor": _TensorWriter,
 }
 
 
@@ -129,8 +132,12 @@ def get_writer(
             db_user=dbms_config.get("user"),  # psql
             db_password=dbms_config.get("password"),  # psql
             db_port=dbms_config.get("port"),  # psql
-            file_format=dbms_config.get("file_format"),  # rdf, owl
+            file_format=dbms_config.get("file_format"),  # rdf, owl, networkx
             rdf_namespaces=dbms_config.get("rdf_namespaces"),  # rdf, owl
+            streaming=dbms_config.get("streaming"),  # rdf, owl
+            compression=dbms_config.get("compression"),  # rdf, owl
             edge_model=dbms_config.get("edge_model"),  # owl
+            multigraph=dbms_config.get("multigraph"),  # networkx
+            keep_in_memory=dbms_config.get("keep_in_memory"),  # csv
         )
     return None
@@ -0,0 +1,241 @@
+"""Parallel writing of the output of several adapters.
+
+Each adapter runs in a worker process on its own copy of the batch writer,
+which writes part files with a unique part prefix but no headers. The
+coordinator then deduplicates across workers, merges the property
+dictionaries, and writes the headers and the import call once.
+"""
+
+import copy
+import os
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+
+from more_itertools import peekable
+
+from biocypher._create import BioCypherNode
+from biocypher._deduplicate import Deduplicator
+from biocypher._logger import logger
+from biocypher.output.write._writer import _Writer
+
+logger.debug(f"Loading module {__name__}.")
+
+__all__ = ["write_parallel"]
+
+# writer template of the worker process, set by `_init_worker`
+_worker_writer = None
+
+
+def _init_worker(writer: _Writer) -> None:
+    """Store the writer template in the worker process."""
+    global _worker_writer
+    _worker_writer = writer
+
+
+def _write_adapter(index: int, adapter: Callable[[], Iterable], batch_size: int) -> dict:
+    """Translate and write the entities of one adapter in a worker process.
+
+    Args:
+    ----
+        index (int): Position of the adapter, used for the part prefix.
+
+        adapter (Callable): Callable returning an iterable of nodes or edges.
+
+        batch_size (int): The number of entities per type to buffer before
+            writing a part file.
+
+    Returns:
+    -------
+        dict: Everything the coordinator needs to merge the worker output.
+
+    """
+    writer = copy.copy(_worker_writer)
+    writer.translator = copy.copy(writer.translator)
+    writer.translator.notype = {}
+    writer.deduplicator = Deduplicator()
+    writer.node_property_dict = {}
+    writer.edge_property_dict = {}
+    writer.parts = {}
+    writer.part_prefix = f"-a{index:03d}-"
+    writer.part_keys = {}
+
+    entities = peekable(writer.translator.translate_entities(adapter()))
+    first = entities.peek(None)
+    if first is None:
+        passed = True
+    elif isinstance(first, BioCypherNode):
+        passed = writer._write_node_data(entities, batch_size)
+    else:
+        passed, _ = writer._write_edge_stream(entities, batch_size)
+
+    deduplicator = writer.deduplicator
+    return {
+        "passed": passed,
+        "node_property_dict": writer.node_property_dict,
+        "edge_property_dict": writer.edge_property_dict,
+        "parts": writer.parts,
+        "part_keys": writer.part_keys,
+        "notype": writer.translator.notype,
+        "relationship_types": list(deduplicator.seen_relationships),
+        "duplicate_entity_ids": deduplicator.duplicate_entity_ids,
+        "duplicate_entity_types": deduplicator.duplicate_entity_types,
+        "duplicate_relationship_ids": deduplicator.duplicate_relationship_ids,
+        "duplicate_relationship_types": deduplicator.duplicate_relationship_types,
+    }
+
+
+def _drop_duplicate_lines(path: str, seen: list) -> bool:
+    """Remove the lines of entities already written by another worker.
+
+    Args:
+    ----
+        path (str): Path of the part file.
+
+        seen (list): One flag per line, True if the line is a duplicate.
+
+    Returns:
+    -------
+        bool: True if the part file still holds any lines.
+
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+
+    if len(lines) != len(seen):
+        logger.warning(
+            f"Cannot deduplicate `{path}` across adapters: the file has "
+            f"{len(lines)} lines for {len(seen)} entities (multiline fields?).",
+        )
+        return True
+
+    kept = [line for line, dup in zip(lines, seen) if not dup]
+    if not kept:
+        os.remove(path)
+        return False
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(kept)
+    return True
+
+
+def _merge_property_dict(target: dict, source: dict) -> None:
+    """Merge the property dictionary of a worker into the coordinator's."""
+    for label, props in source.items():
+        if label in target and target[label] != props:
+            logger.warning(
+                f"Adapters disagree on the properties of `{label}`; "
+                f"keeping {list(target[label])}, ignoring {list(props)}.",
+            )
+            continue
+        target[label] = props
+
+
+def _merge_result(writer: _Writer, result: dict) -> None:
+    """Merge the output of one worker into the coordinating writer.
+
+    Entities that an earlier adapter already wrote are removed from the part
+    files of this worker, so the first adapter providing an entity wins.
+    """
+    deduplicator = writer.deduplicator
+    dropped = set()
+    for part, (kind, label, keys) in result["part_keys"].items():
+        if kind == "node":
+            seen = [deduplicator.node_id_seen(key, label) for key in keys]
+        else:
+            seen = [deduplicator.edge_key_seen(key, label) for key in keys]
+        if any(seen) and not _drop_duplicate_lines(os.path.join(writer.outdir, part), seen):
+            dropped.add(part)
+
+    for label, parts in result["parts"].items():
+        kept = [part for part in parts if part not in dropped]
+        if kept:
+            writer.parts.setdefault(label, []).extend(kept)
+
+    _merge_property_dict(writer.node_property_dict, result["node_property_dict"])
+    _merge_property_dict(writer.edge_property_dict, result["edge_property_dict"])
+
+    for _type, count in result["notype"].items():
+        writer.translator.notype[_type] = writer.translator.notype.get(_type, 0) + count
+
+    for edge_type in result["relationship_types"]:
+        deduplicator.seen_relationships.setdefault(edge_type, set())
+    deduplicator.duplicate_entity_ids |= result["duplicate_entity_ids"]
+    deduplicator.duplicate_entity_types |= result["duplicate_entity_types"]
+    deduplicator.duplicate_relationship_ids |= result["duplicate_relationship_ids"]
+    deduplicator.duplicate_relationship_types |= result["duplicate_relationship_types"]
+
+
+def write_parallel(
+    writer: _Writer,
+    adapters: Iterable[Callable[[], Iterable]],
+    processes: int | None = None,
+    batch_size: int = int(1e6),
+) -> bool:
+    """Write the output of several adapters in parallel worker processes.
+
+    Args:
+    ----
+        writer (_Writer): The coordinating batch writer. Its headers and
+            import call are written once all workers are done.
+
+        adapters (Iterable[Callable]): Picklable callables without arguments
+            returning an iterable of nodes or of edges, e.g.
+            `adapter.get_nodes`.
+
+        processes (int): Maximum number of worker processes. Defaults to the
+            number of CPUs.
+
+        batch_size (int): The number of entities per type to buffer before
+            writing a part file.
+
+    Returns:
+    -------
+        bool: True for success, False otherwise.
+
+    """
+    if not writer._parallel_write:
+        msg = f"Parallel writing is not supported by {type(writer).__name__}."
+        logger.error(msg)
+        raise NotImplementedError(msg)
+
+    adapters = list(adapters)
+    if not adapters:
+        logger.warning("No adapters given; nothing to write.")
+        return True
+
+    processes = min(processes or os.cpu_count() or 1, len(adapters))
+    logger.info(f"Writing {len(adapters)} adapters with {processes} worker processes.")
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(writer,),
+    ) as executor:
+        futures = [
+            executor.submit(_write_adapter, index, adapter, batch_size) for index, adapter in enumerate(adapters)
+        ]
+        # merge in adapter order to keep deduplication deterministic
+        results = [future.result() for future in futures]
+
+    passed = True
+    for index, result in enumerate(results):
+        if not result["passed"]:
+            logger.error(f"Error while writing data of adapter {index}.")
+            passed = False
+        _merge_result(writer, result)
+
+    if not passed:
+        return False
+
+    if writer.node_property_dict and not writer._write_node_headers():
+        logger.error("Error while writing node headers.")
+        return False
+
+    if writer.edge_property_dict and not writer._write_edge_headers():
+        logger.error("Error while writing edge headers.")
+        return False
+
+    writer.write_import_call()
+
+    return True
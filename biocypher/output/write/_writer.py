@@ -39,6 +39,9 @@ class _Writer(ABC):
 
     """
 
+    # whether the writer can be used by `write_parallel`
+    _parallel_write = False
+
     def __init__(
         self,
         translator: Translator,
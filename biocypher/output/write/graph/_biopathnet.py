@@ -22,6 +22,10 @@ class _BioPathNetWriter(_Writer):
     the biocypher's BioPathNet writer must be called 3 tymes, with the corresponding
     3 SKGs.
 
+    Lines are streamed to the output files in batches of `batch_size`
+    entities; the ontology hierarchy and the ancestors of each semantic type
+    are computed once per writer.
+
     """
 
     def __init__(
@@ -51,64 +55,122 @@ class _BioPathNetWriter(_Writer):
         self.background_graph_file_stem = (background_graph_file_stem,)
         self.skg_file_stem = (skg_file_stem,)
 
+        # built on first use and kept for all calls
+        self._graph_hierarchy = None
+        self._ancestors = {}
+
+    def _file_name(self, stem: tuple) -> str:
+        return os.path.join(self.output_directory, f"{stem[0]}.{self.file_format[0]}")
+
+    def _get_graph_hierarchy(self) -> nx.DiGraph:
+        """Return the reversed head ontology graph, built once per writer."""
+        if self._graph_hierarchy is None:
+            self._graph_hierarchy = copy.copy(self.translator.ontology._head_ontology.get_nx_graph()).reverse()
+            logger.debug(f"graph_hierarchy = {self._graph_hierarchy.nodes()}")
+        return self._graph_hierarchy
+
+    def _get_ancestors(self, semantic_type: str) -> set:
+        """Return a type and its ancestors in the hierarchy, cached per type."""
+        ancestors = self._ancestors.get(semantic_type)
+        if ancestors is None:
+            ancestors = nx.ancestors(self._get_graph_hierarchy(), semantic_type) | {semantic_type}
+            logger.debug(f"Ancestors of {semantic_type}: {ancestors}")
+            self._ancestors[semantic_type] = ancestors
+        return ancestors
+
+    def write_nodes(self, nodes, batch_size: int = int(1e6), force: bool = False) -> bool:
+        """Write nodes, buffering the lines of `batch_size` nodes at a time."""
+        passed = self._write_node_data(nodes, batch_size=int(batch_size))
+        if not passed:
+            logger.error("Error while writing node data.")
+            return False
+        return True
+
+    def write_edges(self, edges, batch_size: int = int(1e6), force: bool = False) -> bool:
+        """Write edges, buffering the lines of `batch_size` edges at a time."""
+        passed = self._write_edge_data(edges, batch_size=int(batch_size))
+        if not passed:
+            logger.error("Error while writing edge data.")
+            return False
+        return True
+
     def _write_node_data(
         self,
         nodes,
+        batch_size: int = int(1e6),
     ) -> bool:
         """Implement how to output.write nodes to disk.
 
+        The semantic type and properties of each node are appended to the
+        entity types, entity names, and background graph files, which are
+        opened once per call; the lines of `batch_size` nodes are buffered
+        before writing. The used part of the ontology is written last.
+
         Args:
         ----
             nodes (Iterable): An iterable of BioCypherNode / BioCypherEdge / BioCypherRelAsNode objects.
 
+            batch_size (int): The number of nodes to buffer before writing.
+
         Returns:
         -------
             bool: The return value. True for success, False otherwise.
 
         """
-        dict_entity_types = {}
-        str_nodes_props_graph = []
-
-        graph_hierarchy = copy.copy(self.translator.ontology._head_ontology.get_nx_graph()).reverse()
-        logger.debug(f"type(graph_hierarchy) = {type(graph_hierarchy)}")
-        logger.debug(f"graph_hierarchy = {graph_hierarchy.nodes()}")
+        seen_entities = set()
+        seen_names = set()
         ancestors_set = set()
 
-        for entity in nodes:
-            semantic_type = entity.get_type()
-            entity_id = entity.get_id()
-            # store the sematic types of each node of the graph to be
-            # written in the `entity_types.txt` file of BioPathNet
-            if entity_id not in dict_entity_types.keys():
-                dict_entity_types[entity_id] = semantic_type
-
-            properties = entity.get_properties()
-            for key, value in properties.items():
-                # only write value if it exists.
-                if value:
-                    str_nodes_props_graph.append("\t".join([entity_id, key, str(value).replace(" ", "")]))
-
-            # Add all ancestors of the entity type in the set, in order to reconstruct
-            # the useful part of the ontology for passing it to BioPathNet
-            ancestors = nx.ancestors(graph_hierarchy, semantic_type) | {semantic_type}
-            logger.debug(f"Adding the type : {semantic_type}")
-            logger.debug(f"Ancestors : {ancestors}")
-            ancestors_set.update(ancestors)
+        brg_lines, types_lines, names_lines = [], [], []
+        with (
+            open(self._file_name(self.background_graph_file_stem), "a+", encoding="utf-8") as brg,
+            open(self._file_name(self.entity_types_file_stem), "a+", encoding="utf-8") as types,
+            open(self._file_name(self.entity_names_file_stem), "a+", encoding="utf-8") as names,
+        ):
+
+            def flush():
+                brg.writelines(brg_lines)
+                types.writelines(types_lines)
+                names.writelines(names_lines)
+                brg_lines.clear()
+                types_lines.clear()
+                names_lines.clear()
+
+            for i, entity in enumerate(nodes, start=1):
+                semantic_type = entity.get_type()
+                entity_id = entity.get_id()
+                # store the sematic types of each node of the graph to be
+                # written in the `entity_types.txt` file of BioPathNet
+                if entity_id not in seen_entities:
+                    seen_entities.add(entity_id)
+                    types_lines.append(f"{entity_id}\t{semantic_type}\n")
+                for name in (entity_id, semantic_type):
+                    if name not in seen_names:
+                        seen_names.add(name)
+                        names_lines.append(f"{name}\t{name}\n")
+
+                for key, value in entity.get_properties().items():
+                    # only write value if it exists.
+                    if value:
+                        value = str(value).replace(" ", "")
+                        prefixed_value = f"{key}_{value}"
+                        brg_lines.append(f"{entity_id}\t{key}\t{prefixed_value}\n")
+                        types_lines.append(f"{prefixed_value}\tproperty_value\n")
+                        names_lines.append(f"{prefixed_value}\t{value}\n")
+
+                # Add all ancestors of the entity type in the set, in order to reconstruct
+                # the useful part of the ontology for passing it to BioPathNet
+                ancestors_set.update(self._get_ancestors(semantic_type))
+
+                if i % batch_size == 0:
+                    flush()
+            flush()
 
         # Reconstruct the subgraph corresponding to the usefull part of the ontology
         logger.debug(f"ancestors_set : {ancestors_set}")
-        sub_hierarchy = graph_hierarchy.subgraph(ancestors_set)
+        sub_hierarchy = self._get_graph_hierarchy().subgraph(ancestors_set)
 
-        passed = self._write_semantic_types_in_file(dict_entity_types)
-        if passed:
-            passed = self._write_properties_in_file(str_nodes_props_graph)
-            if passed:
-                passed = self._write_hierarchy_in_file(sub_hierarchy)
-
-        if passed:
-            return True
-        else:
-            return False
+        return self._write_hierarchy_in_file(sub_hierarchy)
 
     def _write_hierarchy_in_file(
         self,
@@ -124,106 +186,37 @@ class _BioPathNetWriter(_Writer):
 
         the entity_types and entity_names files are completed with values of all the hierarchy nodes.
         """
-        file_name = os.path.join(self.output_directory, f"{self.background_graph_file_stem[0]}.{self.file_format[0]}")
-        file2_name = os.path.join(self.output_directory, f"{self.entity_types_file_stem[0]}.{self.file_format[0]}")
-        file3_name = os.path.join(self.output_directory, f"{self.entity_names_file_stem[0]}.{self.file_format[0]}")
-        with open(file_name, "a+", encoding="utf-8") as f:
-            with open(file2_name, "a+", encoding="utf-8") as f2:
-                with open(file3_name, "a+", encoding="utf-8") as f3:
-                    logger.debug(f"subgraph = {subgraph}")
-                    logger.debug(f"subgraph.edges() = {subgraph.edges()}")
-                    all_classes = set()
-                    all_entities = set()
-                    for edge in subgraph.edges():
-                        source, target = edge
-                        relation = "is_a"
-                        str_line = "\t".join([target, relation, source])
-                        f.write(str_line + "\n")
-                        str_line2 = "\t".join([target, source])
-                        f2.write(str_line2 + "\n")
-                        str_line3 = "\t".join([target, target])
-                        f3.write(str_line3 + "\n")
-                        all_classes.add(source)
-                        all_entities.add(target)
-                    root_type = list(all_classes - all_entities)[0]
-                    f2.write("\t".join([root_type, "THING"]) + "\n")
-                    f3.write("\t".join([root_type, root_type]) + "\n")
-
-        return True
-
-    def _write_semantic_types_in_file(
-        self,
-        entities_semantic_types: dict,
-    ) -> bool:
-        """
-        Write the list of entities semantic types in the entity_types.txt
-        file required by BioPathNet
-
-        For each entity of the graph, a line containing the following string:
-            entity_id entity_semantic_type
-        is written.
-        """
-        file_name = os.path.join(self.output_directory, f"{self.entity_types_file_stem[0]}.{self.file_format[0]}")
-        file3_name = os.path.join(self.output_directory, f"{self.entity_names_file_stem[0]}.{self.file_format[0]}")
-        logger.debug(f"In _biopathnet.py, output_directory = {self.output_directory}")
-        logger.debug(f"In _biopathnet.py, entity_types_file_stem = {self.entity_types_file_stem}")
-        logger.debug(f"In _biopathnet.py, file_format= {self.file_format}")
-        logger.debug(f"In _biopathnet.py, filename = {file_name}")
-
-        all_nodes = set()
-
-        with open(file_name, "a+", encoding="utf-8") as f:
-            with open(file3_name, "a+", encoding="utf-8") as f3:
-                for id, type in entities_semantic_types.items():
-                    line1 = "\t".join([id, type])
-                    f.write(line1 + "\n")
-                    # FIXME commented for now,
-                    # to write all the type hierarchy in the BGR,
-                    # but we should add an option to choose wether
-                    # to write the hierarchy in the BGR or in the
-                    # learning graph.
-                    # line2 = "\t".join([id, "is_a", type])
-                    # f2.write(line2+'\n')
-                    all_nodes.add(id)
-                    all_nodes.add(type)
-                for n in all_nodes:
-                    line3 = "\t".join([n, n])
-                    f3.write(line3 + "\n")
-
-        return True
+        if not subgraph.number_of_edges():
+            logger.debug("No type hierarchy to write.")
+            return True
 
-    def _write_properties_in_file(
-        self,
-        list_str_node_props: list,
-    ) -> bool:
-        """
-        Write the properties of each entity node as a list of triples
-        in the background graph file (train1.txt by default)
-        file required by BioPathNet
-
-        For each entity of the graph, this function write one line
-        for each one of its properties.
-        A line contains the following string:
-            entity_id property_type property_value
-        """
-        file_name = os.path.join(self.output_directory, f"{self.background_graph_file_stem[0]}.{self.file_format[0]}")
-        file2_name = os.path.join(self.output_directory, f"{self.entity_types_file_stem[0]}.{self.file_format[0]}")
-        file3_name = os.path.join(self.output_directory, f"{self.entity_names_file_stem[0]}.{self.file_format[0]}")
-        with open(file_name, "a+", encoding="utf-8") as f:
-            with open(file2_name, "a+", encoding="utf-8") as f2:
-                with open(file3_name, "a+", encoding="utf-8") as f3:
-                    for str_prop in list_str_node_props:
-                        entity, prop, value = str_prop.strip().split()
-                        prefixed_value = "_".join([prop, value])
-                        f.write("\t".join([entity, prop, prefixed_value]) + "\n")
-                        f2.write("\t".join([prefixed_value, "property_value"]) + "\n")
-                        f3.write("\t".join([prefixed_value, value]) + "\n")
+        with (
+            open(self._file_name(self.background_graph_file_stem), "a+", encoding="utf-8") as f,
+            open(self._file_name(self.entity_types_file_stem), "a+", encoding="utf-8") as f2,
+            open(self._file_name(self.entity_names_file_stem), "a+", encoding="utf-8") as f3,
+        ):
+            logger.debug(f"subgraph = {subgraph}")
+            logger.debug(f"subgraph.edges() = {subgraph.edges()}")
+            all_classes = set()
+            all_entities = set()
+            for edge in subgraph.edges():
+                source, target = edge
+                relation = "is_a"
+                f.write("\t".join([target, relation, source]) + "\n")
+                f2.write("\t".join([target, source]) + "\n")
+                f3.write("\t".join([target, target]) + "\n")
+                all_classes.add(source)
+                all_entities.add(target)
+            root_type = list(all_classes - all_entities)[0]
+            f2.write("\t".join([root_type, "THING"]) + "\n")
+            f3.write("\t".join([root_type, root_type]) + "\n")
 
         return True
 
     def _write_edge_data(
         self,
         edges,
+        batch_size: int = int(1e6),
     ) -> bool:
         """Implement how to output.write edges to disk.
 
@@ -231,6 +224,8 @@ class _BioPathNetWriter(_Writer):
         ----
             edges (Iterable): An iterable of BioCypherNode / BioCypherEdge / BioCypherRelAsNode objects.
 
+            batch_size (int): The number of edges to buffer before writing.
+
         Returns:
         -------
             bool: The return value. True for success, False otherwise.
@@ -241,9 +236,9 @@ class _BioPathNetWriter(_Writer):
         # It would require to transform the relations into nodes,
         # and thus add a lot of nodes to the BioPatNet NN.
         # See if it is needed or not. Fix if needed
-        file_name = os.path.join(self.output_directory, f"{self.skg_file_stem[0]}.{self.file_format[0]}")
-        with open(file_name, "a", encoding="utf-8") as f:
-            for edge in edges:
+        lines = []
+        with open(self._file_name(self.skg_file_stem), "a", encoding="utf-8") as f:
+            for i, edge in enumerate(edges, start=1):
                 source = edge.get_source_id()
                 target = edge.get_target_id()
                 relation = edge.get_label()
@@ -251,7 +246,11 @@ class _BioPathNetWriter(_Writer):
                 if not relation:
                     relation = "".join([source, "_", target])
 
-                f.write("\t".join([source, relation, target]) + "\n")
+                lines.append("\t".join([source, relation, target]) + "\n")
+                if i % batch_size == 0:
+                    f.writelines(lines)
+                    lines.clear()
+            f.writelines(lines)
         return True
 
     def _get_import_script_name(self) -> str:
@@ -1,8 +1,228 @@
+import json
+import os
 import pickle
 
+from collections.abc import Iterable
+
+import numpy as np
+
+from biocypher._create import BioCypherNode, BioCypherRelAsNode
 from biocypher._logger import logger
 from biocypher.output.in_memory._networkx import NetworkxKG
 from biocypher.output.write._writer import _Writer
+from biocypher.output.write.graph._tensor import METADATA_FILE, _NpyAppender, _safe_name
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+FILE_FORMATS = ["pickle", "arrays"]
+# directory of the graph in the `arrays` format
+ARRAYS_DIRECTORY = "networkx_graph"
+
+
+class _PropertyTable:
+    """Property rows of one node or edge type, written in parts.
+
+    Each flush writes one Parquet file, or a JSON lines file if pyarrow is
+    not installed, the rows have no properties, or they cannot be converted
+    to Arrow, e.g. because of values of mixed types. The Parquet columns
+    are the keys of all rows; missing values are null, and left out when
+    reading. The rows of all parts, in file name order, are aligned with
+    the index array of the type.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = os.path.join(directory, "properties")
+        os.makedirs(self.directory, exist_ok=True)
+        self.n_parts = 0
+        self._rows = []
+
+    def add(self, row: dict) -> None:
+        self._rows.append(row)
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        stem = os.path.join(self.directory, f"part-{self.n_parts:05d}")
+        self.n_parts += 1
+        rows, self._rows = self._rows, []
+
+        # columns of all keys, since rows of one type can differ in their
+        # properties; rows without any are kept as JSON lines
+        keys = list(dict.fromkeys(key for row in rows for key in row))
+        if HAS_PYARROW and keys:
+            try:
+                table = pyarrow.Table.from_pydict({key: [row.get(key) for row in rows] for key in keys})
+                pyarrow.parquet.write_table(table, f"{stem}.parquet")
+                return
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, pyarrow.ArrowNotImplementedError) as e:
+                logger.warning(f"Writing properties to {stem}.jsonl; cannot convert them to Arrow: {e}")
+
+        with open(f"{stem}.jsonl", "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(row, default=str) + "\n" for row in rows)
+
+
+class _GraphArrays:
+    """A graph on disk as interned node ids and edge arrays per type.
+
+    The directory holds:
+
+    - `node_ids.txt`: the ids of all nodes, one per line; the line number
+      is the node index
+    - `nodes/<label>/index.npy`: int32 indices of the nodes of a label
+    - `edges/<label>/edge_index.npy`: int32 array of shape (2, number of
+      edges) with source and target indices
+    - `properties/part-*.parquet` (or `.jsonl`) in each type directory:
+      the properties, row by row aligned with the index arrays
+    - `metadata.json`: the types, their paths, and sizes
+
+    Edge endpoints not written as nodes get an index, but no label, as in
+    a NetworkX graph. Only the node id mapping is kept in memory.
+    """
+
+    def __init__(self, directory: str, multigraph: bool = False):
+        self.directory = directory
+        self.multigraph = multigraph
+        os.makedirs(directory, exist_ok=True)
+        open(os.path.join(directory, "node_ids.txt"), "w").close()
+
+        self.node_index = {}
+        self._new_ids = []
+        self.nodes = {}
+        self.edges = {}
+
+    def _intern(self, node_id: str) -> int:
+        index = self.node_index.get(node_id)
+        if index is None:
+            index = self.node_index[node_id] = len(self.node_index)
+            self._new_ids.append(node_id.replace("\n", " ") + "\n")
+        return index
+
+    def _get_type(self, types: dict, kind: str, label: str, width: int | None) -> tuple:
+        entry = types.get(label)
+        if entry is None:
+            directory = os.path.join(self.directory, kind, _safe_name(label))
+            os.makedirs(directory, exist_ok=True)
+            name = "edge_index.npy" if width else "index.npy"
+            entry = types[label] = (
+                _NpyAppender(os.path.join(directory, name), np.int32, width, fortran_order=bool(width)),
+                _PropertyTable(directory),
+                [],
+            )
+        return entry
+
+    def add_node(self, node: BioCypherNode) -> None:
+        _, table, pending = self._get_type(self.nodes, "nodes", node.get_label(), None)
+        pending.append(self._intern(node.get_id()))
+        table.add(node.get_properties())
+
+    def add_edge(self, edge) -> None:
+        _, table, pending = self._get_type(self.edges, "edges", edge.get_label(), 2)
+        pending.append((self._intern(edge.get_source_id()), self._intern(edge.get_target_id())))
+        table.add({"relationship_id": edge.get_id(), **edge.get_properties()})
+
+    def flush(self) -> None:
+        """Append the pending nodes and edges to the files."""
+        with open(os.path.join(self.directory, "node_ids.txt"), "a", encoding="utf-8") as f:
+            f.writelines(self._new_ids)
+        self._new_ids = []
+
+        for appender, table, pending in (*self.nodes.values(), *self.edges.values()):
+            if pending:
+                appender.append(np.array(pending, dtype=np.int32))
+                pending.clear()
+            table.flush()
+
+        metadata = {
+            "num_nodes": len(self.node_index),
+            "multigraph": self.multigraph,
+            "node_types": {
+                label: {"path": f"nodes/{_safe_name(label)}", "num_nodes": appender.n_rows}
+                for label, (appender, _, _) in self.nodes.items()
+            },
+            "edge_types": {
+                label: {"path": f"edges/{_safe_name(label)}", "num_edges": appender.n_rows}
+                for label, (appender, _, _) in self.edges.items()
+            },
+        }
+        with open(os.path.join(self.directory, METADATA_FILE), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+
+
+# loader functions of the import script for the `arrays` format
+_ARRAYS_IMPORT_CALL = f"""import json
+import os
+
+import numpy as np
+
+
+def read_properties(path):
+\tdirectory = os.path.join(path, 'properties')
+\trows = []
+\tfor name in sorted(os.listdir(directory)):
+\t\tfile = os.path.join(directory, name)
+\t\tif name.endswith('.parquet'):
+\t\t\timport pyarrow.parquet as pq
+\t\t\trows.extend(
+\t\t\t\t{{k: v for k, v in row.items() if v is not None}} for row in pq.read_table(file).to_pylist()
+\t\t\t)
+\t\telse:
+\t\t\twith open(file) as f:
+\t\t\t\trows.extend(json.loads(line) for line in f)
+\treturn rows
+
+
+def load_arrays(path='./{ARRAYS_DIRECTORY}'):
+\twith open(os.path.join(path, '{METADATA_FILE}')) as f:
+\t\tmetadata = json.load(f)
+\twith open(os.path.join(path, 'node_ids.txt')) as f:
+\t\tnode_ids = f.read().splitlines()
+\tnode_index = {{
+\t\tlabel: np.load(os.path.join(path, t['path'], 'index.npy'), mmap_mode='r')
+\t\tfor label, t in metadata['node_types'].items()
+\t}}
+\tedge_index = {{
+\t\tlabel: np.load(os.path.join(path, t['path'], 'edge_index.npy'), mmap_mode='r')
+\t\tfor label, t in metadata['edge_types'].items()
+\t}}
+\treturn metadata, node_ids, node_index, edge_index
+
+
+def load_graph(path='./{ARRAYS_DIRECTORY}'):
+\timport networkx as nx
+
+\tmetadata, node_ids, node_index, edge_index = load_arrays(path)
+\tG = nx.MultiDiGraph() if metadata['multigraph'] else nx.DiGraph()
+\tG.add_nodes_from(node_ids)
+\tfor label, t in metadata['node_types'].items():
+\t\trows = read_properties(os.path.join(path, t['path']))
+\t\tG.add_nodes_from(
+\t\t\t(node_ids[i], {{'node_label': label, **row}}) for i, row in zip(node_index[label].tolist(), rows)
+\t\t)
+\tfor label, t in metadata['edge_types'].items():
+\t\trows = read_properties(os.path.join(path, t['path']))
+\t\tsources, targets = edge_index[label].tolist()
+\t\tedges = zip(sources, targets, rows)
+\t\tif metadata['multigraph']:
+\t\t\tG.add_edges_from(
+\t\t\t\t(node_ids[s], node_ids[o], row['relationship_id'], {{'relationship_label': label, **row}})
+\t\t\t\tfor s, o, row in edges
+\t\t\t)
+\t\telse:
+\t\t\tG.add_edges_from(
+\t\t\t\t(node_ids[s], node_ids[o], {{'relationship_label': label, **row}}) for s, o, row in edges
+\t\t\t)
+\treturn G
+
+
+if __name__ == '__main__':
+\tG_loaded = load_graph()
+"""
 
 
 class _NetworkXWriter(_Writer):
@@ -12,22 +232,47 @@ class _NetworkXWriter(_Writer):
     Call `_construct_import_call` to write the networkx DiGraph to a pickle
     file and return the Python call to load it.
 
+    With `file_format: arrays`, the graph is instead streamed to disk on
+    every call in a compact format (see `_GraphArrays`), without building
+    the graph in memory. The import script then provides `load_graph`,
+    which rebuilds the graph with bulk `add_edges_from` calls, and
+    `load_arrays`, which loads the node ids and edge arrays only.
+
     TODO: this is a non-intuitive name, should be adjusted.
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, multigraph: bool = False, file_format: str | None = None, **kwargs):
         super().__init__(*args, **kwargs)
-        self.in_memory_networkx_kg = NetworkxKG(
-            deduplicator=self.deduplicator,
-        )
+        self.file_format = file_format or "pickle"
+        if self.file_format not in FILE_FORMATS:
+            msg = f"Unsupported NetworkX file format `{self.file_format}`. Supported formats: {FILE_FORMATS}."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        if self.file_format == "arrays":
+            self.graph_arrays = _GraphArrays(
+                os.path.join(self.output_directory, ARRAYS_DIRECTORY),
+                multigraph=bool(multigraph),
+            )
+        else:
+            self.in_memory_networkx_kg = NetworkxKG(
+                deduplicator=self.deduplicator,
+                multigraph=bool(multigraph),
+            )
 
     def _construct_import_call(self) -> str:
         """Dump networkx graph to a pickle file and return Python call.
 
+        With the `arrays` format, the graph has been written already, and
+        the returned code defines the loader functions.
+
         Returns:
             str: Python code to load the networkx graph from a pickle file.
         """
-        self.G = self.in_memory_networkx_kg._create_networkx_kg()
+        if self.file_format == "arrays":
+            return _ARRAYS_IMPORT_CALL
+
+        self.G = self.in_memory_networkx_kg.get_kg()
         logger.info(f"Writing networkx {self.G} to pickle file networkx_graph.pkl.")
         with open(f"{self.output_directory}/networkx_graph.pkl", "wb") as f:
             pickle.dump(self.G, f)
@@ -40,30 +285,79 @@ class _NetworkXWriter(_Writer):
         """Function to return the name of the import script."""
         return "import_networkx.py"
 
-    def _write_node_data(self, nodes) -> bool:
+    def write_nodes(self, nodes, batch_size: int = int(1e6), force: bool = False) -> bool:
+        """Write nodes, appending `batch_size` nodes at a time in the `arrays` format."""
+        passed = self._write_node_data(nodes, batch_size=int(batch_size))
+        if not passed:
+            logger.error("Error while writing node data.")
+            return False
+        return True
+
+    def write_edges(self, edges, batch_size: int = int(1e6), force: bool = False) -> bool:
+        """Write edges, appending `batch_size` edges at a time in the `arrays` format."""
+        passed = self._write_edge_data(edges, batch_size=int(batch_size))
+        if not passed:
+            logger.error("Error while writing edge data.")
+            return False
+        return True
+
+    def _write_arrays(self, entities: Iterable, batch_size: int = int(1e6)) -> bool:
+        """Append nodes and edges to the graph arrays on disk.
+
+        Relationships represented as nodes are written as their node and
+        two edges. The pending rows are appended after every `batch_size`
+        entities.
+        """
+        arrays = self.graph_arrays
+        for i, entity in enumerate(entities, 1):
+            if isinstance(entity, BioCypherNode):
+                if not self.deduplicator.node_seen(entity):
+                    arrays.add_node(entity)
+            elif isinstance(entity, BioCypherRelAsNode):
+                if not self.deduplicator.rel_as_node_seen(entity):
+                    arrays.add_node(entity.get_node())
+                    arrays.add_edge(entity.get_source_edge())
+                    arrays.add_edge(entity.get_target_edge())
+            elif not self.deduplicator.edge_seen(entity):
+                arrays.add_edge(entity)
+
+            if i % batch_size == 0:
+                arrays.flush()
+        arrays.flush()
+        return True
+
+    def _write_node_data(self, nodes, batch_size: int = int(1e6)) -> bool:
         """Add nodes to the networkx graph.
 
         TODO: this is not strictly writing, should be refactored.
 
         Args:
             nodes (list): List of nodes to add to the networkx graph.
+            batch_size (int): The number of nodes to keep in memory in the
+                `arrays` format.
 
         Returns:
             bool: True if the nodes were added successfully, False otherwise.
         """
+        if self.file_format == "arrays":
+            return self._write_arrays(nodes, batch_size)
         passed = self.in_memory_networkx_kg.add_nodes(nodes)
         return passed
 
-    def _write_edge_data(self, edges) -> bool:
+    def _write_edge_data(self, edges, batch_size: int = int(1e6)) -> bool:
         """Add edges to the networkx graph.
 
         TODO: this is not strictly writing, should be refactored.
 
         Args:
             edges (list): List of edges to add to the networkx graph.
+            batch_size (int): The number of edges to keep in memory in the
+                `arrays` format.
 
         Returns:
             bool: True if the edges were added successfully, False otherwise.
         """
+        if self.file_format == "arrays":
+            return self._write_arrays(edges, batch_size)
         passed = self.in_memory_networkx_kg.add_edges(edges)
         return passed
@@ -15,7 +15,21 @@ from biocypher._create import BioCypherEdge, BioCypherNode
 from biocypher._deduplicate import Deduplicator
 from biocypher._logger import logger
 from biocypher._translate import Translator
-from biocypher.output.write.graph._rdf import _RDFWriter
+from biocypher.output.write.graph._rdf import _RDFWriter, nt_term
+
+
+class _TripleBuffer:
+    """Collects the instance triples of one batch in streaming mode."""
+
+    def __init__(self):
+        self.triples = []
+
+    def add(self, triple: tuple) -> None:
+        self.triples.append(triple)
+
+    def lines(self):
+        for s, p, o in self.triples:
+            yield f"{nt_term(s)} {nt_term(p)} {nt_term(o)} .\n"
 
 
 class _OWLWriter(_RDFWriter):
@@ -61,6 +75,12 @@ class _OWLWriter(_RDFWriter):
     To output a valid self-contained OWL file, it is required that
     you call *both* `write_nodes` *and* `write_edges`.
 
+    With `streaming` (N-Triples or Turtle only), the vocabulary (TBox) is
+    written once with the first batch, and the instances (ABox) of each
+    batch are appended to the same file as N-Triples lines, instead of
+    collecting all instances in one rdflib graph. Vocabulary terms created
+    later on are appended along with the instances.
+
     This class heavily relies on the _RDFWriter class interface and code.
     """
 
@@ -194,6 +214,10 @@ class _OWLWriter(_RDFWriter):
         self.graph = self.translator.ontology.get_rdf_graph()
         self._init_namespaces(self.graph)
 
+        # Instance triples go to the graph, or to a per-batch buffer when streaming.
+        self._abox = _TripleBuffer() if self.streaming else self.graph
+        self._tbox_written = False
+
         # Write guards because Biocypher has `write_nodes` and `write_edges`,
         # but not `write`, so we need to ensure to call both.
         self._has_nodes = False
@@ -304,7 +328,7 @@ class _OWLWriter(_RDFWriter):
                         if not uri_current:
                             uri_current = self.as_uri(current_label, "biocypher")
                             # Create the term in biocypher namespace.
-                            self.graph.add(
+                            self._add_tbox(
                                 (
                                     uri_current,
                                     RDF.type,
@@ -320,7 +344,7 @@ class _OWLWriter(_RDFWriter):
                     uri_current = rdf_currents[0][0]
 
             # Add the instance.
-            self.graph.add(
+            self._abox.add(
                 (
                     self.to_uri(rdf_subject),
                     RDF.type,
@@ -330,7 +354,7 @@ class _OWLWriter(_RDFWriter):
             logger.debug(f"\t[{rdf_subject}]--(type)->[{uri_current}]")
 
             # The instance is also a NamedIndividual, in OWL.
-            self.graph.add(
+            self._abox.add(
                 (
                     self.to_uri(rdf_subject),
                     RDF.type,
@@ -340,7 +364,7 @@ class _OWLWriter(_RDFWriter):
             logger.debug(f"\t[{rdf_subject}]--(type)->[NamedIndividual]")
 
             # Add a readable label.
-            self.graph.add(
+            self._abox.add(
                 (
                     self.to_uri(rdf_subject),
                     RDFS.label,
@@ -353,10 +377,10 @@ class _OWLWriter(_RDFWriter):
             for key, value in properties.items():
                 # only write value if it exists.
                 if value:
-                    self.add_property_to_graph(self.graph, rdf_subject, value, key)
+                    self._add_property(rdf_subject, value, key)
 
         self._has_nodes = True
-        return True
+        return self._flush_abox()
 
     def _write_single_edge_list_to_file(
         self,
@@ -402,7 +426,7 @@ class _OWLWriter(_RDFWriter):
 
             if self.edge_model == "ObjectProperty":
                 # Add to the subject the property toward the object.
-                self.graph.add(
+                self._abox.add(
                     (
                         self.to_uri(rdf_subject),
                         edge_uri,
@@ -430,11 +454,11 @@ class _OWLWriter(_RDFWriter):
                 #  classes are legal OWL DL classes. In OWL Full these restrictions
                 #  do not exist and therefore owl:Class and rdfs:Class are equivalent
                 #  in OWL Full.
-                self.graph.add((edge_uri, RDF.type, OWL.Class))
+                self._add_tbox((edge_uri, RDF.type, OWL.Class))
                 logger.debug(f"\tEdge object: [{edge_label}]--(type)->[Class]")
 
                 # Instantiate the edge object.
-                self.graph.add(
+                self._abox.add(
                     (
                         self.to_uri(rdf_id),
                         RDF.type,
@@ -447,7 +471,7 @@ class _OWLWriter(_RDFWriter):
                 # parts of the links around the object.
                 # edge_source and edge_target inherits from edge,
                 # and are in the biocypher namespace.
-                self.graph.add(
+                self._add_tbox(
                     (
                         self.as_uri("edge", "biocypher"),
                         RDF.type,
@@ -456,7 +480,7 @@ class _OWLWriter(_RDFWriter):
                 )
                 logger.debug("\tBase ObjectProperty type: [edge]--(type)->[ObjectProperty]")
 
-                self.graph.add(
+                self._add_tbox(
                     (
                         self.as_uri("edge_source", "biocypher"),
                         RDFS.subPropertyOf,
@@ -465,7 +489,7 @@ class _OWLWriter(_RDFWriter):
                 )
                 logger.debug("\tLeft ObjectProperty type: [edge_source]--(type)->[edge]")
 
-                self.graph.add(
+                self._add_tbox(
                     (
                         self.as_uri("edge_target", "biocypher"),
                         RDFS.subPropertyOf,
@@ -474,7 +498,7 @@ class _OWLWriter(_RDFWriter):
                 )
                 logger.debug("\tRight ObjectProperty type: [edge_target]--(type)->[edge]")
 
-                self.graph.add(
+                self._abox.add(
                     (
                         self.to_uri(rdf_subject),
                         self.as_uri("edge_source", "biocypher"),
@@ -483,7 +507,7 @@ class _OWLWriter(_RDFWriter):
                 )
                 logger.debug(f"\tLeft ObjectProperty: [{rdf_subject}]--(edge_source)->[{rdf_id}]")
 
-                self.graph.add(
+                self._abox.add(
                     (
                         self.as_uri(rdf_id, "biocypher"),
                         self.as_uri("edge_target", "biocypher"),
@@ -496,14 +520,14 @@ class _OWLWriter(_RDFWriter):
                 for key, value in rdf_properties.items():
                     # only write value if it exists.
                     if value:
-                        self.add_property_to_graph(self.graph, rdf_id, value, key)
+                        self._add_property(rdf_id, value, key)
 
             else:
                 logger.debug(f"{self.edge_model} not in {self.edge_models}")
                 assert self.edge_model in self.edge_models
 
         self._has_edges = True
-        return True
+        return self._flush_abox()
 
     def write_nodes(self, nodes, batch_size: int = int(1e6), force: bool = False) -> bool:
         """Insert nodes in `self.graph`.
@@ -559,9 +583,48 @@ class _OWLWriter(_RDFWriter):
         self._write_file()
         return True
 
+    def _add_tbox(self, triple: tuple) -> None:
+        """Add a vocabulary triple to the graph.
+
+        When streaming, triples added after the vocabulary has been written
+        are also appended to the output with the current batch.
+        """
+        if self.streaming and self._tbox_written and triple not in self.graph:
+            self._abox.add(triple)
+        self.graph.add(triple)
+
+    def _add_property(self, rdf_subject: str, value, key: str) -> None:
+        """Add a property of an instance to the graph or batch."""
+        self.add_property_to_graph(self._abox, rdf_subject, value, key)
+
+    def _get_file_name(self) -> str:
+        return os.path.join(self.outdir, f"{self.file_stem}.{self.extension}")
+
+    def _flush_abox(self) -> bool:
+        """Append the instances of the batch to the file, when streaming.
+
+        The vocabulary is written first, with the first batch.
+        """
+        if not self.streaming:
+            return True
+
+        file_name = self._get_file_name()
+        if not self._tbox_written:
+            logger.info(f"Writing {len(self.graph)} vocabulary terms to {self._sink.path(file_name)}")
+            self._sink.write(file_name, [self.graph.serialize(format="nt")])
+            self._tbox_written = True
+
+        logger.info(f"Appending {len(self._abox.triples)} terms to {self._sink.path(file_name)}")
+        self._sink.write(file_name, self._abox.lines())
+        self._abox = _TripleBuffer()
+        return True
+
     def _write_file(self):
         """Write an OWL file if nodes and edges are ready in self.graph."""
+        if self.streaming:
+            # written batch by batch
+            return
         if self._has_nodes and self._has_edges:
-            file_name = os.path.join(self.outdir, f"{self.file_stem}.{self.extension}")
+            file_name = self._get_file_name()
             logger.info(f"Writing {len(self.graph)} terms to {file_name}")
             self.graph.serialize(destination=file_name, format=self.file_format)
@@ -1,7 +1,10 @@
 """Module to provide the RDF writer class."""
 
+import gzip
+import math
 import os
 
+from collections.abc import Iterable
 from types import GeneratorType
 
 from rdflib import (
@@ -10,6 +13,7 @@ from rdflib import (
     RDF,
     RDFS,
     SKOS,
+    BNode,
     Graph,
     Literal,
     Namespace,
@@ -26,6 +30,91 @@ from biocypher._logger import logger
 from biocypher._translate import Translator
 from biocypher.output.write._batch_writer import _BatchWriter
 
+# formats that can be written line by line, without an rdflib graph;
+# Turtle is written as N-Triples, which is valid Turtle
+STREAMING_FORMATS = ["nt", "nquads", "turtle", "ttl"]
+COMPRESSIONS = ["gzip"]
+
+_XSD = "http://www.w3.org/2001/XMLSchema#"
+_LITERAL_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+# characters not allowed in N-Triples IRIs, written as unicode escapes
+_IRI_ESCAPES = str.maketrans({c: f"\\u{ord(c):04X}" for c in [*map(chr, range(0x21)), *'<>"{}|^`\\']})
+
+
+def nt_iri(iri: str) -> str:
+    """Format an IRI as an N-Triples term."""
+    return f"<{iri.translate(_IRI_ESCAPES)}>"
+
+
+def nt_literal(value) -> str:
+    """Format a Python value as an N-Triples literal, typed like rdflib."""
+    if isinstance(value, str):
+        return f'"{value.translate(_LITERAL_ESCAPES)}"'
+    if isinstance(value, bool):
+        return f'"{str(value).lower()}"^^<{_XSD}boolean>'
+    if isinstance(value, int):
+        return f'"{value}"^^<{_XSD}integer>'
+    if isinstance(value, float):
+        # xsd:double spells the special values NaN, INF and -INF
+        if math.isnan(value):
+            lexical = "NaN"
+        elif math.isinf(value):
+            lexical = "INF" if value > 0 else "-INF"
+        else:
+            lexical = repr(value)
+        return f'"{lexical}"^^<{_XSD}double>'
+    return Literal(value).n3()
+
+
+def nt_term(term) -> str:
+    """Format an rdflib term as an N-Triples term."""
+    if isinstance(term, Literal):
+        lexical = f'"{str(term).translate(_LITERAL_ESCAPES)}"'
+        if term.language:
+            return f"{lexical}@{term.language}"
+        if term.datatype:
+            return f"{lexical}^^{nt_iri(term.datatype)}"
+        return lexical
+    if isinstance(term, BNode):
+        return f"_:{term}"
+    return nt_iri(term)
+
+
+class _TripleSink:
+    """Append N-Triples or N-Quads lines to files, optionally compressed.
+
+    A file is truncated the first time it is written by the sink and
+    appended to afterwards, so that several batches of the same label end
+    up in the same file. Compressed files are written as one gzip member per
+    batch, which gzip readers concatenate transparently.
+    """
+
+    def __init__(self, compression: str | None = None, buffer_size: int = 1 << 20):
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self._started = set()
+
+    def path(self, file_name: str) -> str:
+        return f"{file_name}.gz" if self.compression else file_name
+
+    def write(self, file_name: str, lines: Iterable[str]) -> int:
+        """Write lines to a file and return their number."""
+        path = self.path(file_name)
+        mode = "a" if path in self._started else "w"
+        self._started.add(path)
+
+        if self.compression:
+            f = gzip.open(path, f"{mode}t", encoding="utf-8")
+        else:
+            f = open(path, mode, encoding="utf-8", buffering=self.buffer_size)
+
+        n_lines = 0
+        with f:
+            for line in lines:
+                f.write(line)
+                n_lines += 1
+        return n_lines
+
 
 class _RDFWriter(_BatchWriter):
     """Write BioCypher's property graph into an RDF format.
@@ -34,8 +123,16 @@ class _RDFWriter(_BatchWriter):
     N-Quads, Turtle, TriX, Trig and JSON-LD). By default, the conversion
     is done keeping only the minimum information about node and edges,
     skipping all properties.
+
+    With `streaming`, N-Triples, N-Quads and Turtle are formatted line by
+    line without building an rdflib graph, and all batches of a label are
+    appended to the same file, optionally gzip-compressed. N-Quads put the
+    triples of each label in a named graph of the label.
     """
 
+    # one file per label is written instead of part files
+    _parallel_write = False
+
     def __init__(
         self,
         translator: Translator,
@@ -57,6 +154,8 @@ class _RDFWriter(_BatchWriter):
         db_port: str = None,
         file_format: str = None,
         rdf_namespaces: dict = {},
+        streaming: bool = False,
+        compression: str | None = None,
         **kwargs,
     ):
         super().__init__(
@@ -101,6 +200,23 @@ class _RDFWriter(_BatchWriter):
             raise RuntimeError(msg)
 
         self.namespaces = {}
+        # property name -> URI, reset when the namespaces change
+        self._property_uris = {}
+        self._property_uri_hits = 0
+        self._property_uri_misses = 0
+        # prefixes not found in the namespaces, logged once each
+        self._unknown_prefixes = set()
+
+        self.streaming = bool(streaming)
+        if compression and compression not in COMPRESSIONS:
+            msg = f"Unsupported compression `{compression}`, use one of: {', '.join(COMPRESSIONS)}."
+            logger.error(msg)
+            raise ValueError(msg)
+        if compression and not self.streaming:
+            logger.warning("Compression is only applied in streaming mode.")
+        self._sink = _TripleSink(compression) if self.streaming else None
+        # classes already declared in the streamed output
+        self._declared = set()
 
         if self.edge_labels_order != "Leaves":
             msg = (
@@ -172,6 +288,12 @@ class _RDFWriter(_BatchWriter):
                 f"use one of the following: {', '.join(supported_formats)}.",
             )
             return False
+        elif self.streaming and file_format not in STREAMING_FORMATS:
+            logger.error(
+                f"RDF format '{file_format}' cannot be streamed, use one of the following: "
+                f"{', '.join(STREAMING_FORMATS)}.",
+            )
+            return False
         else:
             # Set the file extension to match the format
             if self.file_format == "turtle":
@@ -214,6 +336,11 @@ class _RDFWriter(_BatchWriter):
         # create file name
         file_name = os.path.join(self.outdir, f"{label_pascal}.{self.extension}")
 
+        if self.streaming:
+            n_lines = self._sink.write(file_name, self._iter_edge_lines(edge_list, label_pascal))
+            logger.info(f"Appending {len(edge_list)} entries ({n_lines} triples) to {self._sink.path(file_name)}")
+            return True
+
         # write data in graph
         graph = Graph()
         self._init_namespaces(graph)
@@ -380,6 +507,11 @@ class _RDFWriter(_BatchWriter):
         # create file name
         file_name = os.path.join(self.outdir, f"{label_pascal}.{self.extension}")
 
+        if self.streaming:
+            n_lines = self._sink.write(file_name, self._iter_node_lines(node_list, label_pascal))
+            logger.info(f"Appending {len(node_list)} entries ({n_lines} triples) to {self._sink.path(file_name)}")
+            return True
+
         # write data in graph
         graph = Graph()
         self._init_namespaces(graph)
@@ -416,6 +548,75 @@ class _RDFWriter(_BatchWriter):
 
         return True
 
+    def _statement(self, subject: str, predicate: str, obj: str, graph_name: str) -> str:
+        """Format an N-Triples or N-Quads line from formatted terms."""
+        if self.file_format == "nquads":
+            return f"{subject} {predicate} {obj} {graph_name} .\n"
+        return f"{subject} {predicate} {obj} .\n"
+
+    def _iter_property_lines(self, subject: str, properties: dict, graph_name: str):
+        """Yield the property statements of an entity, as `add_property_to_graph`."""
+        for key, value in properties.items():
+            # only write value if it exists.
+            if not value:
+                continue
+            if isinstance(value, str) and value.startswith("[") and value.endswith("]"):
+                value = self.transform_string_to_list(value)
+            predicate = nt_iri(self.property_to_uri(key))
+            for v in value if isinstance(value, list) else [value]:
+                yield self._statement(subject, predicate, nt_literal(v), graph_name)
+
+    def _iter_class_line(self, class_uri: str, graph_name: str):
+        """Yield the declaration of a class, once per output."""
+        if class_uri not in self._declared:
+            self._declared.add(class_uri)
+            yield self._statement(nt_iri(class_uri), nt_iri(RDF.type), nt_iri(RDFS.Class), graph_name)
+
+    def _iter_node_lines(self, node_list: list, label_pascal: str):
+        """Yield the statements of a list of nodes, in streaming mode."""
+        if not self.namespaces:
+            self._init_namespaces(Graph())
+        graph_name = nt_iri(self.as_uri(label_pascal, "biocypher"))
+        rdf_type = nt_iri(RDF.type)
+
+        for n in node_list:
+            class_uri = self.as_uri(self.translator.name_sentence_to_pascal(n.get_label()), "biocypher")
+            yield from self._iter_class_line(class_uri, graph_name)
+            subject = nt_iri(self.to_uri(n.get_id()))
+            yield self._statement(subject, rdf_type, nt_iri(class_uri), graph_name)
+            yield from self._iter_property_lines(subject, n.get_properties(), graph_name)
+
+    def _iter_edge_lines(self, edge_list: list, label_pascal: str):
+        """Yield the statements of a list of edges, in streaming mode."""
+        if not self.namespaces:
+            self._init_namespaces(Graph())
+        graph_name = nt_iri(self.as_uri(label_pascal, "biocypher"))
+        rdf_type = nt_iri(RDF.type)
+        rdf_subject_uri = nt_iri(self.as_uri("subject", "biocypher"))
+        rdf_object_uri = nt_iri(self.as_uri("object", "biocypher"))
+
+        for edge in edge_list:
+            rdf_subject = edge.get_source_id()
+            rdf_object = edge.get_target_id()
+            rdf_predicate = edge.get_id()
+            if rdf_predicate is None:
+                rdf_predicate = rdf_subject + rdf_object
+
+            edge_uri = self.as_uri(self.translator.name_sentence_to_pascal(edge.get_label()), "biocypher")
+            yield from self._iter_class_line(edge_uri, graph_name)
+
+            predicate = nt_iri(self.as_uri(rdf_predicate, "biocypher"))
+            yield self._statement(predicate, rdf_type, nt_iri(edge_uri), graph_name)
+            yield self._statement(predicate, rdf_subject_uri, nt_iri(self.to_uri(rdf_subject)), graph_name)
+            yield self._statement(predicate, rdf_object_uri, nt_iri(self.to_uri(rdf_object)), graph_name)
+
+            # add properties to the transformed edge --> node
+            yield from self._iter_property_lines(
+                nt_iri(self.to_uri(rdf_predicate)),
+                edge.get_properties(),
+                graph_name,
+            )
+
     def write_nodes(self, nodes, batch_size: int = int(1e6), force: bool = False) -> bool:
         """Write nodes in RDF format.
 
@@ -548,14 +749,16 @@ class _RDFWriter(_BatchWriter):
             str: The URI for the given name and namespace.
 
         """
-        if namespace in self.namespaces:
-            return URIRef(self.namespaces[namespace][name])
-        else:
+        ns = self.namespaces.get(namespace)
+        if ns is None:
             assert "biocypher" in self.namespaces
             # If no default empty NS, use the biocypher one,
             # which is always there.
-            logger.debug(f"I'll consider '{name}' as part of 'biocypher' namespace.")
-            return URIRef(self.namespaces["biocypher"][name])
+            if namespace not in self._unknown_prefixes:
+                self._unknown_prefixes.add(namespace)
+                logger.debug(f"I'll consider names with prefix '{namespace}' as part of 'biocypher' namespace.")
+            ns = self.namespaces["biocypher"]
+        return URIRef(f"{ns}{name}")
 
     def to_uri(self, subject: str) -> str:
         """Extract the namespace from the given subject.
@@ -573,9 +776,8 @@ class _RDFWriter(_BatchWriter):
             str: The corresponding URI for the subject.
 
         """
-        pref_id = subject.split(":")
-        if len(pref_id) == 2:
-            pref, id = pref_id
+        pref, sep, id = subject.partition(":")
+        if sep and ":" not in id:
             return self.as_uri(id, pref)
         else:
             return self.as_uri(subject)
@@ -603,7 +805,8 @@ class _RDFWriter(_BatchWriter):
 
         This function takes a property name and searches for its corresponding
         URI in various namespaces. It first checks the core namespaces for
-        rdflib, including owl, rdf, rdfs, xsd, and xml.
+        rdflib, including owl, rdf, rdfs, xsd, and xml. The result is cached
+        per property name, see :meth:`property_uri_cache_info`.
 
         Args:
         ----
@@ -614,6 +817,26 @@ class _RDFWriter(_BatchWriter):
             str: The corresponding URI for the input property name.
 
         """
+        uri = self._property_uris.get(property_name)
+        if uri is not None:
+            self._property_uri_hits += 1
+            return uri
+
+        self._property_uri_misses += 1
+        uri = self._resolve_property_uri(property_name)
+        self._property_uris[property_name] = uri
+        return uri
+
+    def property_uri_cache_info(self) -> dict:
+        """Return the hits, misses and size of the property URI cache."""
+        return {
+            "hits": self._property_uri_hits,
+            "misses": self._property_uri_misses,
+            "size": len(self._property_uris),
+        }
+
+    def _resolve_property_uri(self, property_name: str) -> str:
+        """Search the namespaces for the URI of a property name."""
         # These namespaces are core for rdflib; owl, rdf, rdfs, xsd and xml
         for namespace in _NAMESPACE_PREFIXES_CORE.values():
             if property_name in namespace:
@@ -634,7 +857,7 @@ class _RDFWriter(_BatchWriter):
         # If the property name is "licence", it recursively calls the function
         # with "license" as the input.
         if property_name == "licence":
-            return self.property_to_uri("license")
+            return self._resolve_property_uri("license")
 
         # TODO: add an option to search trough manually implemented namespaces
 
@@ -661,6 +884,8 @@ class _RDFWriter(_BatchWriter):
             None
 
         """
+        previous = self.namespaces
+
         # Bind and keep the biocypher namespace.
         bcns = Namespace("https://biocypher.org/biocypher#")
         bck = "biocypher"
@@ -685,3 +910,8 @@ class _RDFWriter(_BatchWriter):
             self.namespaces[prefix] = Namespace(ns)
             logger.debug(f"\t'{prefix}'\t->\t{ns}")
             graph.bind(prefix, self.namespaces[prefix])
+
+        # URIs resolved with other namespaces are outdated.
+        if self.namespaces != previous:
+            self._property_uris = {}
+            self._unknown_prefixes = set()
@@ -0,0 +1,415 @@
+"""Module to provide the tensor writer class.
+
+Writes the graph as NumPy `.npy` arrays for graph machine learning, i.e. per
+edge type an integer `edge_index` and per node and edge type numeric and
+categorical property matrices. The arrays are appended to on every call, so
+the graph never has to be held in memory, and can be loaded without copying
+using `np.load(path, mmap_mode="r")`.
+"""
+
+import json
+import os
+import re
+
+from collections.abc import Iterable
+
+import numpy as np
+
+from biocypher._create import BioCypherNode, BioCypherRelAsNode
+from biocypher._logger import logger
+from biocypher.output.write._writer import _Writer
+
+# bytes reserved for the .npy header, so that the shape can be updated in place
+_HEADER_SIZE = 128
+_NUMERIC_TYPES = ("int", "integer", "long", "float", "double", "dbl", "bool", "boolean")
+_STRING_TYPES = ("str", "string")
+# properties set by BioCypher itself, not used as features
+_ID_PROPERTIES = ("id", "preferred_id")
+# name of the metadata file describing all arrays
+METADATA_FILE = "metadata.json"
+
+
+def _safe_name(name: str) -> str:
+    """Make a label usable as a directory name."""
+    return re.sub(r"[^\w.-]+", "_", name)
+
+
+class _NpyAppender:
+    """A .npy file that rows are appended to.
+
+    The header is padded to a fixed size and rewritten with the new shape
+    after each append. Edge indices of shape (2, n) are stored in Fortran
+    order, so that appending edges appends to the file.
+    """
+
+    def __init__(self, path: str, dtype, width: int | None = None, fortran_order: bool = False):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.width = width
+        self.fortran_order = fortran_order
+        self.n_rows = 0
+        with open(path, "wb") as f:
+            f.write(self._header())
+
+    @property
+    def shape(self) -> tuple:
+        if self.width is None:
+            return (self.n_rows,)
+        if self.fortran_order:
+            return (self.width, self.n_rows)
+        return (self.n_rows, self.width)
+
+    def _header(self) -> bytes:
+        header = repr(
+            {
+                "descr": np.lib.format.dtype_to_descr(self.dtype),
+                "fortran_order": self.fortran_order,
+                "shape": self.shape,
+            }
+        ).encode("latin1")
+        magic = b"\x93NUMPY\x01\x00"
+        # magic string, 2 bytes of header length, header, padding, newline
+        padding = _HEADER_SIZE - len(magic) - 2 - len(header) - 1
+        if padding < 0:
+            msg = f"Array header of `{self.path}` exceeds {_HEADER_SIZE} bytes."
+            logger.error(msg)
+            raise ValueError(msg)
+        header += b" " * padding + b"\n"
+        return magic + len(header).to_bytes(2, "little") + header
+
+    def append(self, rows: np.ndarray) -> None:
+        """Append rows, i.e. one row per entity, to the file."""
+        if not len(rows):
+            return
+        rows = np.ascontiguousarray(rows, dtype=self.dtype)
+        with open(self.path, "r+b") as f:
+            f.seek(0, os.SEEK_END)
+            f.write(rows.tobytes())
+            self.n_rows += len(rows)
+            f.seek(0)
+            f.write(self._header())
+
+
+class _FeatureTable:
+    """Numeric and categorical property columns of one node or edge type.
+
+    The columns are fixed when the type is first seen, from the schema
+    configuration or else from the properties of the first entity, since
+    the matrices can only grow by rows; the id properties added by
+    BioCypher are left out. Numeric properties go into a
+    float32 matrix `x.npy` (NaN if missing), string properties are encoded
+    as int32 category codes in `categorical.npy` (-1 if missing). Other
+    properties, e.g. lists, are not exported.
+    """
+
+    def __init__(self, directory: str, numeric: list, categorical: list):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.numeric = numeric
+        self.categorical = categorical
+        self.categories = {key: {} for key in categorical}
+        self.x = _NpyAppender(os.path.join(directory, "x.npy"), np.float32, len(numeric)) if numeric else None
+        self.codes = (
+            _NpyAppender(os.path.join(directory, "categorical.npy"), np.int32, len(categorical))
+            if categorical
+            else None
+        )
+        self._x_rows = []
+        self._code_rows = []
+
+    @classmethod
+    def from_properties(cls, directory: str, schema_properties: dict | None, properties: dict) -> "_FeatureTable":
+        numeric, categorical = [], []
+        if schema_properties:
+            for key, prop_type in schema_properties.items():
+                prop_type = str(prop_type).lower()
+                if prop_type in _NUMERIC_TYPES:
+                    numeric.append(key)
+                elif prop_type in _STRING_TYPES:
+                    categorical.append(key)
+        else:
+            for key, value in properties.items():
+                if key in _ID_PROPERTIES:
+                    continue
+                if isinstance(value, bool | int | float):
+                    numeric.append(key)
+                elif isinstance(value, str):
+                    categorical.append(key)
+        return cls(directory, numeric, categorical)
+
+    def add(self, properties: dict) -> None:
+        if self.x is not None:
+            row = []
+            for key in self.numeric:
+                value = properties.get(key)
+                try:
+                    row.append(np.nan if value is None else float(value))
+                except (TypeError, ValueError):
+                    row.append(np.nan)
+            self._x_rows.append(row)
+
+        if self.codes is not None:
+            row = []
+            for key in self.categorical:
+                value = properties.get(key)
+                if value is None:
+                    row.append(-1)
+                    continue
+                categories = self.categories[key]
+                value = str(value)
+                code = categories.get(value)
+                if code is None:
+                    code = categories[value] = len(categories)
+                row.append(code)
+            self._code_rows.append(row)
+
+    def flush(self) -> None:
+        if self._x_rows:
+            self.x.append(np.array(self._x_rows, dtype=np.float32))
+            self._x_rows = []
+        if self._code_rows:
+            self.codes.append(np.array(self._code_rows, dtype=np.int32))
+            self._code_rows = []
+
+    def metadata(self) -> dict:
+        return {
+            "numeric": self.numeric,
+            "categorical": {key: list(categories) for key, categories in self.categories.items()},
+        }
+
+
+class _TensorWriter(_Writer):
+    """
+    Write the graph as NumPy arrays for PyG, DGL, or other GNN frameworks.
+
+    Nodes are numbered per node type in the order they are written. The
+    output directory holds:
+
+    - `nodes/<type>/node_ids.txt`: the node ids, one per line, in index order
+    - `nodes/<type>/x.npy`, `categorical.npy`: node property matrices
+    - `edges/<source type>__<label>__<target type>/edge_index.npy`: int64
+      array of shape (2, number of edges) with source and target indices
+    - `edges/.../x.npy`, `categorical.npy`: edge property matrices
+    - `metadata.json`: the types, their sizes, property columns, and
+      categories of the categorical columns
+
+    Nodes have to be written before the edges connecting them; edges with
+    unknown source or target are skipped. The node id mapping is kept in
+    memory, all arrays are appended to on disk.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.node_index = {}
+        self.node_tables = {}
+        self.edge_index = {}
+        self.edge_tables = {}
+        self.n_nodes = {}
+        self.n_skipped_edges = 0
+
+    def _get_schema_properties(self, label: str) -> dict | None:
+        ontology = getattr(self.translator, "ontology", None)
+        mapping = getattr(ontology, "mapping", None)
+        schema = getattr(mapping, "extended_schema", None) or {}
+        entry = schema.get(label)
+        return entry.get("properties") if isinstance(entry, dict) else None
+
+    def _add_node(self, node: BioCypherNode, id_files: dict) -> None:
+        label = node.get_label()
+        table = self.node_tables.get(label)
+        if table is None:
+            directory = os.path.join(self.output_directory, "nodes", _safe_name(label))
+            table = self.node_tables[label] = _FeatureTable.from_properties(
+                directory,
+                self._get_schema_properties(label),
+                node.get_properties(),
+            )
+            self.n_nodes[label] = 0
+            # start a new id table, matching the new property matrices
+            open(os.path.join(table.directory, "node_ids.txt"), "w").close()
+
+        f = id_files.get(label)
+        if f is None:
+            f = id_files[label] = open(os.path.join(table.directory, "node_ids.txt"), "a", encoding="utf-8")
+
+        self.node_index[node.get_id()] = (label, self.n_nodes[label])
+        self.n_nodes[label] += 1
+        f.write(node.get_id().replace("\n", " ") + "\n")
+        table.add(node.get_properties())
+
+    def write_nodes(self, nodes, batch_size: int = int(1e6), force: bool = False) -> bool:
+        """Write nodes, appending the rows of `batch_size` nodes at a time."""
+        passed = self._write_node_data(nodes, batch_size=int(batch_size))
+        if not passed:
+            logger.error("Error while writing node data.")
+            return False
+        return True
+
+    def write_edges(self, edges, batch_size: int = int(1e6), force: bool = False) -> bool:
+        """Write edges, appending the rows of `batch_size` edges at a time."""
+        passed = self._write_edge_data(edges, batch_size=int(batch_size))
+        if not passed:
+            logger.error("Error while writing edge data.")
+            return False
+        return True
+
+    def _flush(self, pending: dict) -> None:
+        """Append the pending edge indices and property rows to the files."""
+        for key, pairs in pending.items():
+            self.edge_index[key].append(np.array(pairs, dtype=np.int64))
+        pending.clear()
+        for table in (*self.node_tables.values(), *self.edge_tables.values()):
+            table.flush()
+
+    def _write_node_data(self, nodes: Iterable, batch_size: int = int(1e6)) -> bool:
+        """Append nodes to the node id tables and property matrices.
+
+        Args:
+        ----
+            nodes (Iterable): An iterable of BioCypherNode objects.
+            batch_size (int): The number of nodes to keep in memory before
+                appending their rows.
+
+        Returns:
+        -------
+            bool: The return value. True for success, False otherwise.
+
+        """
+        id_files = {}
+        try:
+            for i, node in enumerate(nodes, 1):
+                if not self.deduplicator.node_seen(node):
+                    self._add_node(node, id_files)
+                if i % batch_size == 0:
+                    self._flush({})
+        finally:
+            for f in id_files.values():
+                f.close()
+
+        self._flush({})
+        self._write_metadata()
+        return True
+
+    def _add_edge(self, edge, pending: dict) -> None:
+        source = self.node_index.get(edge.get_source_id())
+        target = self.node_index.get(edge.get_target_id())
+        if source is None or target is None:
+            self.n_skipped_edges += 1
+            return
+
+        key = (source[0], edge.get_label(), target[0])
+        table = self.edge_tables.get(key)
+        if table is None:
+            directory = os.path.join(self.output_directory, "edges", "__".join(_safe_name(part) for part in key))
+            table = self.edge_tables[key] = _FeatureTable.from_properties(
+                directory,
+                self._get_schema_properties(edge.get_label()),
+                edge.get_properties(),
+            )
+            self.edge_index[key] = _NpyAppender(
+                os.path.join(directory, "edge_index.npy"),
+                np.int64,
+                2,
+                fortran_order=True,
+            )
+
+        pending.setdefault(key, []).append((source[1], target[1]))
+        table.add(edge.get_properties())
+
+    def _write_edge_data(self, edges: Iterable, batch_size: int = int(1e6)) -> bool:
+        """Append edges to the edge index and property matrices.
+
+        Relationships represented as nodes are written as their node and
+        two edges.
+
+        Args:
+        ----
+            edges (Iterable): An iterable of BioCypherEdge / BioCypherRelAsNode objects.
+            batch_size (int): The number of edges to keep in memory before
+                appending their rows.
+
+        Returns:
+        -------
+            bool: The return value. True for success, False otherwise.
+
+        """
+        pending = {}
+        id_files = {}
+        skipped = self.n_skipped_edges
+        try:
+            for i, edge in enumerate(edges, 1):
+                if isinstance(edge, BioCypherRelAsNode):
+                    if not self.deduplicator.rel_as_node_seen(edge):
+                        self._add_node(edge.get_node(), id_files)
+                        self._add_edge(edge.get_source_edge(), pending)
+                        self._add_edge(edge.get_target_edge(), pending)
+                elif not self.deduplicator.edge_seen(edge):
+                    self._add_edge(edge, pending)
+
+                if i % batch_size == 0:
+                    self._flush(pending)
+        finally:
+            for f in id_files.values():
+                f.close()
+
+        self._flush(pending)
+
+        if self.n_skipped_edges > skipped:
+            logger.warning(
+                f"Skipped {self.n_skipped_edges - skipped} edges with a source or target "
+                "that has not been written as a node before.",
+            )
+
+        self._write_metadata()
+        return True
+
+    def _write_metadata(self) -> None:
+        metadata = {
+            "node_types": {
+                label: {
+                    "path": os.path.relpath(table.directory, self.output_directory),
+                    "num_nodes": self.n_nodes[label],
+                    **table.metadata(),
+                }
+                for label, table in self.node_tables.items()
+            },
+            "edge_types": [
+                {
+                    "source_type": key[0],
+                    "label": key[1],
+                    "target_type": key[2],
+                    "path": os.path.relpath(table.directory, self.output_directory),
+                    "num_edges": self.edge_index[key].n_rows,
+                    **table.metadata(),
+                }
+                for key, table in self.edge_tables.items()
+            ],
+        }
+        with open(os.path.join(self.output_directory, METADATA_FILE), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+
+    def _construct_import_call(self) -> str:
+        """Return Python code loading the arrays as memory maps.
+
+        Returns
+        -------
+            str: Python code to load the edge indices and property matrices.
+
+        """
+        import_call = "import json\nimport os\n\nimport numpy as np\n\n"
+        import_call += f"with open('./{METADATA_FILE}') as f:\n\tmetadata = json.load(f)\n\n"
+        import_call += "def load(path, name):\n"
+        import_call += "\tpath = os.path.join('.', path, name)\n"
+        import_call += "\treturn np.load(path, mmap_mode='r') if os.path.exists(path) else None\n\n"
+        import_call += (
+            "x = {label: load(t['path'], 'x.npy') for label, t in metadata['node_types'].items()}\n"
+            "edge_index = {\n"
+            "\t(t['source_type'], t['label'], t['target_type']): load(t['path'], 'edge_index.npy')\n"
+            "\tfor t in metadata['edge_types']\n"
+            "}\n"
+        )
+        return import_call
+
+    def _get_import_script_name(self) -> str:
+        """Function to return the name of the import script."""
+        return "import_tensors.py"
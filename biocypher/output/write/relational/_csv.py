@@ -1,5 +1,10 @@
+import csv
+import os
+
 from more_itertools import peekable
 
+import pandas as pd
+
 from biocypher._logger import logger
 from biocypher.output.in_memory._pandas import PandasKG
 from biocypher.output.write._writer import _Writer
@@ -8,20 +13,41 @@ from biocypher.output.write._writer import _Writer
 class _PandasCSVWriter(_Writer):
     """
     Class for writing node and edge representations to CSV files.
+
+    Each call to `write_nodes` or `write_edges` appends its entities to the
+    CSV file of their type; the header is written with the first batch. If
+    a later batch brings new columns, they are added at the end and the
+    existing file is rewritten once with empty values for them.
+
+    With `keep_in_memory` (the default), the written tables are also kept as
+    data frames in `stored_dfs`.
     """
 
-    def __init__(self, *args, write_to_file: bool = True, **kwargs):
+    def __init__(self, *args, write_to_file: bool = True, keep_in_memory: bool | None = None, **kwargs):
         kwargs["write_to_file"] = write_to_file
         super().__init__(*args, **kwargs)
         self.in_memory_dfs = {}
-        self.stored_dfs = {}
-        self.pandas_in_memory = PandasKG(
-            deduplicator=self.deduplicator,
-        )
         self.delimiter = kwargs.get("delimiter")
         if not self.delimiter:
             self.delimiter = ","
         self.write_to_file = write_to_file
+        self.keep_in_memory = True if keep_in_memory is None else keep_in_memory
+        if not (self.write_to_file or self.keep_in_memory):
+            logger.warning("Neither writing to file nor keeping in memory; the CSV writer discards all entities.")
+
+        # per file name: the columns written so far, and the number of rows
+        self._columns = {}
+        self._n_rows = {}
+        # per file name: data frames of the written batches, see `stored_dfs`
+        self._stored_parts = {}
+
+    @property
+    def stored_dfs(self) -> dict:
+        """Data frames of all written entities per file name."""
+        for name, parts in self._stored_parts.items():
+            if len(parts) > 1:
+                self._stored_parts[name] = [pd.concat(parts).reindex(columns=self._columns[name])]
+        return {name: parts[0] for name, parts in self._stored_parts.items()}
 
     def _construct_import_call(self) -> str:
         """Function to construct the Python code to load all node and edge csv files again into Pandas dfs.
@@ -30,7 +56,7 @@ class _PandasCSVWriter(_Writer):
             str: Python code to load the csv files into Pandas dfs.
         """
         import_call = "import pandas as pd\n\n"
-        for df_name in self.stored_dfs.keys():
+        for df_name in self._columns.keys():
             import_call += f"{df_name} = pd.read_csv('./{df_name}.csv', header=0, index_col=0)\n"
         return import_call
 
@@ -47,25 +73,63 @@ class _PandasCSVWriter(_Writer):
         return passed
 
     def _write_entities_to_file(self, entities: iter) -> bool:
-        """Function to write the entities to a CSV file.
+        """Function to append the entities to the CSV files of their types.
 
         Args:
             entities (iterable): An iterable of BioCypherNode / BioCypherEdge / BioCypherRelAsNode objects.
         """
         entities = peekable(entities)
-        entity_list = self.pandas_in_memory._separate_entity_types(entities)
-        for entity_type, entities in entity_list.items():
-            self.in_memory_dfs[entity_type] = self.pandas_in_memory._add_entity_df(entity_type, entities)
-        for entity_type in self.in_memory_dfs.keys():
-            entity_df = self.in_memory_dfs[entity_type]
+        # a table of this batch only; deduplication is shared with earlier batches
+        batch = PandasKG(deduplicator=self.deduplicator)
+        batch.add_tables(entities)
+        self.in_memory_dfs = batch.dfs
+
+        for entity_type, entity_df in self.in_memory_dfs.items():
             if " " in entity_type or "." in entity_type:
                 entity_type = entity_type.replace(" ", "_").replace(".", "_")
+
+            columns = self._columns.setdefault(entity_type, [])
+            new_columns = [column for column in entity_df.columns if column not in columns]
+            widen = bool(columns) and bool(new_columns)
+            columns.extend(new_columns)
+
+            offset = self._n_rows.get(entity_type, 0)
+            entity_df = entity_df.reindex(columns=columns)
+            entity_df.index = pd.RangeIndex(offset, offset + len(entity_df))
+            self._n_rows[entity_type] = offset + len(entity_df)
+
             if self.write_to_file:
+                path = f"{self.output_directory}/{entity_type}.csv"
+                if widen:
+                    self._widen_file(path, columns, len(new_columns))
                 logger.info(f"Writing {entity_df.shape[0]} entries to {entity_type}.csv.")
                 entity_df.to_csv(
-                    f"{self.output_directory}/{entity_type}.csv",
+                    path,
                     sep=self.delimiter,
+                    mode="a" if offset else "w",
+                    header=not offset,
                 )
-            self.stored_dfs[entity_type] = entity_df
+            if self.keep_in_memory:
+                self._stored_parts.setdefault(entity_type, []).append(entity_df)
         self.in_memory_dfs = {}
         return True
+
+    def _widen_file(self, path: str, columns: list, n_new: int) -> None:
+        """Rewrite a CSV file with a header of the widened columns.
+
+        Existing rows get empty values for the new columns.
+        """
+        logger.info(f"Adding {n_new} new columns to {path}.")
+        tmp_path = f"{path}.tmp"
+        with (
+            open(path, newline="", encoding="utf-8") as src,
+            open(tmp_path, "w", newline="", encoding="utf-8") as dst,
+        ):
+            reader = csv.reader(src, delimiter=self.delimiter)
+            writer = csv.writer(dst, delimiter=self.delimiter, lineterminator=os.linesep)
+            next(reader, None)
+            writer.writerow(["", *columns])
+            padding = [""] * n_new
+            for row in reader:
+                writer.writerow(row + padding)
+        os.replace(tmp_path, path)
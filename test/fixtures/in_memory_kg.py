@@ -3,6 +3,7 @@ import pytest
 from biocypher.output.in_memory._networkx import NetworkxKG
 from biocypher.output.in_memory._pandas import PandasKG
 from biocypher.output.in_memory._airr import AirrKG
+from biocypher.output.in_memory._csr import CsrKG
 
 
 @pytest.fixture(scope="function")
@@ -30,3 +31,12 @@ def in_memory_airr_kg(deduplicator):
     )
 
     yield in_memory_kg
+
+
+@pytest.fixture(scope="function")
+def in_memory_csr_kg(deduplicator):
+    in_memory_kg = CsrKG(
+        deduplicator=deduplicator,
+    )
+
+    yield in_memory_kg
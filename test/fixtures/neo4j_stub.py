@@ -0,0 +1,186 @@
+"""A stub of the Neo4j Python driver, to test online mode without a server.
+
+The stub records every query it runs and answers from a list of
+`(pattern, records)` responses, where `records` is a list of dictionaries or
+a function of the query and parameters returning one.
+"""
+
+import re
+import threading
+import types
+
+import pytest
+
+from biocypher.output.connect._neo4j_driver import _Neo4jDriver
+
+STUB_NEO4J_VERSION = "5.26.0"
+
+
+class StubSummary:
+    def __init__(self, query, parameters, database, n_records):
+        self.query = query
+        self.parameters = parameters
+        self.database = database
+        self.result_available_after = 1
+        self.result_consumed_after = 1
+        self.plan = {"operatorType": "ProduceResults@neo4j", "args": {}, "identifiers": ["n"]}
+        self.profile = {**self.plan, "dbHits": 2 * n_records, "rows": n_records}
+
+
+class StubRecord(dict):
+    def data(self):
+        return dict(self)
+
+
+class StubResult:
+    def __init__(self, records, summary):
+        self._records = records
+        self._summary = summary
+
+    def __iter__(self):
+        return (StubRecord(record) for record in self._records)
+
+    def keys(self):
+        return list(self._records[0]) if self._records else []
+
+    def data(self):
+        return [dict(record) for record in self._records]
+
+    def consume(self):
+        return self._summary
+
+
+class StubTransaction:
+    def __init__(self, session, kind):
+        self.session = session
+        self.kind = kind
+        self.committed = False
+
+    def run(self, query, parameters=None, **kwargs):
+        return self.session._run(query, parameters, self.kind)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None and not self.committed:
+            self.commit()
+
+
+class StubSession:
+    def __init__(self, driver, database=None, **kwargs):
+        self.driver = driver
+        self.database = database
+        self.config = kwargs
+        self.closed = False
+
+    def _run(self, query, parameters, kind):
+        return self.driver._respond(query, parameters or {}, self.database, kind)
+
+    def run(self, query, parameters=None, **kwargs):
+        return self._run(query, parameters, "auto")
+
+    def execute_write(self, work, *args, **kwargs):
+        return work(StubTransaction(self, "write"), *args, **kwargs)
+
+    def execute_read(self, work, *args, **kwargs):
+        return work(StubTransaction(self, "read"), *args, **kwargs)
+
+    def begin_transaction(self, **kwargs):
+        return StubTransaction(self, "explicit")
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StubDriver:
+    """Stands in for a `neo4j.Driver` connected to an online database."""
+
+    def __init__(self, responses=None, version=STUB_NEO4J_VERSION):
+        self.responses = list(responses or []) + [
+            (r"CALL dbms\.components", [{"version": version, "name": "Neo4j Kernel", "edition": "enterprise"}]),
+            (r"SHOW DATABASES", [{"name": "neo4j", "currentStatus": "online"}]),
+            (r"apoc\.version\(\)", [{"output": version}]),
+        ]
+        # (query, parameters, database, kind) of all queries run
+        self.queries = []
+        self.sessions = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        auth = ("neo4j", "neo4j")
+
+        def opener():
+            return auth
+
+        self._pool = types.SimpleNamespace(opener=opener, address=("localhost", 7687))
+
+    def session(self, **kwargs):
+        session = StubSession(self, **kwargs)
+        with self._lock:
+            self.sessions.append(session)
+        return session
+
+    def _respond(self, query, parameters, database, kind):
+        with self._lock:
+            self.queries.append((query, parameters, database, kind))
+
+        records = []
+        for pattern, response in self.responses:
+            if re.search(pattern, query):
+                records = response(query, parameters) if callable(response) else response
+                break
+
+        return StubResult(records, StubSummary(query, parameters, database, len(records)))
+
+    def run_queries(self, pattern=None, kind=None) -> list:
+        """The queries run, optionally matching a pattern or of one kind."""
+        return [
+            q for q in self.queries if (pattern is None or re.search(pattern, q[0])) and (kind is None or q[3] == kind)
+        ]
+
+    def verify_connectivity(self):
+        return None
+
+    def close(self):
+        self._closed = True
+
+
+@pytest.fixture(scope="function")
+def stub_neo4j():
+    return StubDriver()
+
+
+@pytest.fixture(scope="function")
+def stub_driver(stub_neo4j, translator):
+    driver = _Neo4jDriver(
+        database_name="neo4j",
+        uri=None,
+        user=None,
+        password=None,
+        multi_db=False,
+        translator=translator,
+        increment_version=False,
+        force_enterprise=True,
+        batch_size=2,
+        driver=stub_neo4j,
+    )
+    # leave out the queries of the connection setup
+    stub_neo4j.queries.clear()
+
+    yield driver
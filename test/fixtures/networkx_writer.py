@@ -12,3 +12,15 @@ def bw_networkx(translator, deduplicator, tmp_path_session):
     )
 
     yield bw_networkx
+
+
+@pytest.fixture(scope="function")
+def bw_networkx_arrays(translator, deduplicator, tmp_path):
+    bw_networkx = _NetworkXWriter(
+        translator=translator,
+        deduplicator=deduplicator,
+        output_directory=tmp_path,
+        file_format="arrays",
+    )
+
+    yield bw_networkx
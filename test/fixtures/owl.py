@@ -39,3 +39,18 @@ def bw_owl_ttl(translator, deduplicator, tmp_path_session):
     # teardown
     for f in os.listdir(tmp_path_session):
         os.remove(os.path.join(tmp_path_session, f))
+
+
+@pytest.fixture(scope="function")
+def bw_owl_streaming(translator, deduplicator, tmp_path):
+    """Fixture for OWL writer appending instances batch by batch."""
+    bw_owl_streaming = _OWLWriter(
+        translator=translator,
+        deduplicator=deduplicator,
+        output_directory=tmp_path,
+        delimiter=",",
+        file_format="nt",
+        file_stem="biocypher",
+        streaming=True,
+    )
+    yield bw_owl_streaming
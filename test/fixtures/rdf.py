@@ -38,3 +38,18 @@ def bw_rdf_ttl(translator, deduplicator, tmp_path_session):
     # teardown
     for f in os.listdir(tmp_path_session):
         os.remove(os.path.join(tmp_path_session, f))
+
+
+@pytest.fixture(scope="function")
+def bw_rdf_streaming(translator, deduplicator, tmp_path):
+    """Fixture for RDF writer streaming N-Triples."""
+    bw_rdf_streaming = _RDFWriter(
+        translator=translator,
+        deduplicator=deduplicator,
+        output_directory=tmp_path,
+        file_format="nt",
+        rdf_namespaces={},
+        delimiter=",",
+        streaming=True,
+    )
+    yield bw_rdf_streaming
@@ -0,0 +1,14 @@
+import pytest
+
+from biocypher.output.write.graph._tensor import _TensorWriter
+
+
+@pytest.fixture(scope="function")
+def bw_tensor(translator, deduplicator, tmp_path):
+    bw_tensor = _TensorWriter(
+        translator=translator,
+        deduplicator=deduplicator,
+        output_directory=tmp_path,
+    )
+
+    yield bw_tensor
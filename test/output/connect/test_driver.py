@@ -324,3 +324,503 @@ def test_pretty_explain(driver):
     )
 
     assert "args" in plan and "ProduceResults" in printout[0]
+
+
+def test_add_biocypher_nodes_in_batches(stub_driver, stub_neo4j):
+    consumed = []
+
+    def gen():
+        for i in range(5):
+            consumed.append(i)
+            yield BioCypherNode(node_id=f"n{i}", node_label="Test")
+
+    assert stub_driver.add_biocypher_nodes(gen()) is True
+
+    merges = stub_neo4j.run_queries("UNWIND \\$entities")
+    assert [len(q[1]["entities"]) for q in merges] == [2, 2, 1]
+    assert {q[3] for q in merges} == {"write"}
+    assert [e["node_id"] for q in merges for e in q[1]["entities"]] == [f"n{i}" for i in range(5)]
+    assert consumed == list(range(5))
+
+
+def test_add_biocypher_edges_in_batches(stub_driver, stub_neo4j):
+    node = BioCypherNode(node_id="int1", node_label="Int1")
+    edges = [
+        BioCypherEdge(source_id="src", target_id="tar", relationship_label="Test1"),
+        BioCypherRelAsNode(
+            node,
+            BioCypherEdge(source_id="int1", target_id="src", relationship_label="IS_SOURCE_OF"),
+            BioCypherEdge(source_id="int1", target_id="tar", relationship_label="IS_TARGET_OF"),
+        ),
+        BioCypherEdge(source_id="tar", target_id="src", relationship_label="Test2"),
+    ]
+
+    assert stub_driver.add_biocypher_edges(e for e in edges) is True
+
+    kinds = ["nodes" if "$entities" in q[0] else "edges" for q in stub_neo4j.run_queries("UNWIND", kind="write")]
+    assert kinds[0] == "nodes"
+    assert set(kinds[1:]) == {"edges"}
+
+    # one query per relationship type and batch
+    rels = stub_neo4j.run_queries("UNWIND \\$rels")
+    assert [q[1]["rels"][0]["relationship_label"] for q in rels] == ["Test1", "IS_SOURCE_OF", "IS_TARGET_OF", "Test2"]
+
+
+def test_add_invalid_biocypher_node_stub(stub_driver, stub_neo4j):
+    with pytest.raises(ValueError):
+        stub_driver.add_biocypher_nodes([BioCypherNode(node_id="n1", node_label="Test"), 1])
+
+
+def test_add_biocypher_edges_with_endpoint_labels(stub_driver, stub_neo4j):
+    stub_neo4j.responses.insert(0, (r"SHOW INDEXES", [{"labelsOrTypes": ["Disease"]}]))
+    stub_driver.add_biocypher_nodes(
+        [
+            BioCypherNode(node_id="p1", node_label="protein"),
+            BioCypherNode(node_id="d1", node_label="disease"),
+        ]
+    )
+    assert {e["node_label"] for q in stub_neo4j.run_queries("\\$entities") for e in q[1]["entities"]} == {
+        "Protein",
+        "Disease",
+    }
+
+    stub_driver.add_biocypher_edges(
+        [
+            BioCypherEdge(source_id="p1", target_id="d1", relationship_label="PERTURBED_IN_DISEASE"),
+            BioCypherEdge(
+                source_id="v1",
+                target_id="g1",
+                relationship_label="known.sequence variant.variant to gene association",
+            ),
+            BioCypherEdge(source_id="x1", target_id="x2", relationship_label="UNKNOWN"),
+        ]
+    )
+
+    rels = {q[1]["rels"][0]["relationship_label"]: q[0] for q in stub_neo4j.run_queries("\\$rels")}
+    # labels are only used to match; nodes not found are merged on their id
+    query = rels["PERTURBED_IN_DISEASE"]
+    assert "OPTIONAL MATCH (src_found:`Protein` {id: r.source_id})" in query
+    assert "OPTIONAL MATCH (tar_found:`Disease` {id: r.target_id})" in query
+    assert "WITH r, src_found WHERE src_found IS NULL MERGE (n {id: r.source_id})" in query
+    assert "WITH *, coalesce(tar_found, tar_merged[0]) AS tar" in query
+    assert "MERGE (src:" not in query and "MERGE (tar:" not in query
+    query = rels["known.sequence variant.variant to gene association"]
+    assert "(src_found:`KnownSequenceVariant` {id: r.source_id})" in query
+    assert "(tar_found:`Gene` {id: r.target_id})" in query
+    assert "MERGE (src {id: r.source_id}) MERGE (tar {id: r.target_id})" in rels["UNKNOWN"]
+
+    created = [q[0] for q in stub_neo4j.run_queries("CREATE INDEX")]
+    assert len(created) == 3
+    assert not any("`Disease`" in q for q in created)
+    assert len(stub_neo4j.run_queries("SHOW INDEXES")) == 1
+
+    # indexes are only created once
+    stub_driver.add_biocypher_edges(BioCypherEdge(source_id="p1", target_id="d1", relationship_label="Test"))
+    assert len(stub_neo4j.run_queries("CREATE INDEX")) == 3
+
+
+def test_node_label_cache_is_bounded(stub_driver, monkeypatch):
+    from biocypher.output.connect import _neo4j_driver
+
+    monkeypatch.setattr(_neo4j_driver, "NODE_LABEL_CACHE_SIZE", 2)
+
+    stub_driver.add_biocypher_nodes([BioCypherNode(node_id=f"n{i}", node_label="Test") for i in range(3)])
+    assert list(stub_driver._node_labels) == ["n1", "n2"]
+
+    # looking up a label marks it as recently used
+    stub_driver._get_node_label("n1")
+    stub_driver.add_biocypher_nodes(BioCypherNode(node_id="n3", node_label="Test"))
+    assert list(stub_driver._node_labels) == ["n1", "n3"]
+
+    # all ids are kept for skipping duplicates with create_only
+    stub_driver.create_only = True
+    stub_driver.add_biocypher_nodes([BioCypherNode(node_id=f"n{i}", node_label="Test") for i in range(4, 7)])
+    assert len(stub_driver._node_labels) == 5
+
+
+def test_parallel_loader_partitions(stub_neo4j, translator):
+    import threading
+    import time
+
+    from neo4j.exceptions import TransientError
+
+    threads = set()
+    failed = []
+
+    lock = threading.Lock()
+
+    def respond(query, parameters):
+        threads.add(threading.get_ident())
+        time.sleep(0.01)
+        # fail the first edge transaction once, as in a deadlock
+        with lock:
+            if "$rels" in query and not failed:
+                failed.append(parameters["rels"])
+                raise TransientError("deadlock")
+        return []
+
+    stub_neo4j.responses.insert(0, (r"UNWIND", respond))
+    driver = _Neo4jDriver(
+        database_name="neo4j",
+        uri=None,
+        user=None,
+        password=None,
+        multi_db=False,
+        translator=translator,
+        increment_version=False,
+        force_enterprise=True,
+        batch_size=3,
+        concurrency=3,
+        driver=stub_neo4j,
+    )
+    driver._loader.retry_delay = 0
+    stub_neo4j.queries.clear()
+
+    nodes = [BioCypherNode(node_id=f"n{i}", node_label="Test" if i % 2 else "Other") for i in range(20)]
+    edges = [
+        BioCypherEdge(source_id=f"n{i}", target_id=f"n{(i * 7) % 20}", relationship_label="Rel") for i in range(20)
+    ]
+    driver.add_biocypher_nodes(nodes)
+    driver.add_biocypher_edges(edges)
+
+    node_batches = [q[1]["entities"] for q in stub_neo4j.run_queries("\\$entities")]
+    assert sorted(e["node_id"] for batch in node_batches for e in batch) == sorted(n.get_id() for n in nodes)
+    assert all(len(batch) <= 3 and len({e["node_label"] for e in batch}) == 1 for batch in node_batches)
+
+    edge_batches = [q[1]["rels"] for q in stub_neo4j.run_queries("\\$rels")]
+    assert len(failed) == 1
+    # the failed transaction is retried with the same batch
+    assert sum(batch is failed[0] for batch in edge_batches) == 2
+    merged = [(r["source_id"], r["target_id"]) for batch in edge_batches for r in batch]
+    for r in failed[0]:
+        merged.remove((r["source_id"], r["target_id"]))
+    assert sorted(merged) == sorted((e.get_source_id(), e.get_target_id()) for e in edges)
+    for batch in edge_batches:
+        assert len({hash(r["source_id"]) % 3 for r in batch}) == 1
+        assert len({hash(r["target_id"]) % 3 for r in batch}) == 1
+
+    assert len(threads) > 1
+
+
+def test_merge_without_apoc(stub_driver, stub_neo4j):
+    stub_neo4j.responses.insert(0, (r"apoc\.version\(\)", []))
+
+    stub_driver.add_biocypher_nodes(
+        [
+            BioCypherNode(node_id="p1", node_label="protein", properties={"name": "a"}),
+            BioCypherNode(node_id="d1", node_label="disease"),
+        ]
+    )
+    stub_driver.add_biocypher_edges(
+        BioCypherEdge(source_id="p1", target_id="d1", relationship_label="PERTURBED_IN_DISEASE")
+    )
+
+    queries = [q[0] for q in stub_neo4j.run_queries("UNWIND")]
+    assert not any("apoc" in q for q in queries)
+    assert "UNWIND $entities AS ent MERGE (n:`Protein` {id: ent.node_id}) SET n += ent.properties" in queries[0]
+    assert "MERGE (src)-[rel:`PERTURBED_IN_DISEASE`]->(tar) SET rel += r.properties" in queries[-1]
+
+
+def test_create_only(stub_driver, stub_neo4j):
+    stub_driver.create_only = True
+
+    stub_driver.add_biocypher_nodes([BioCypherNode(node_id=f"n{i}", node_label="Test") for i in (1, 2, 1)])
+    stub_driver.add_biocypher_nodes(BioCypherNode(node_id="n2", node_label="Test"))
+    stub_driver.add_biocypher_edges(BioCypherEdge(source_id="n1", target_id="n2", relationship_label="Rel"))
+
+    nodes = stub_neo4j.run_queries("\\$entities")
+    assert [e["node_id"] for q in nodes for e in q[1]["entities"]] == ["n1", "n2"]
+    assert all("CREATE (n:`Test`) SET n = ent.properties, n.id = ent.node_id" in q[0] for q in nodes)
+
+    (rels,) = stub_neo4j.run_queries("\\$rels")
+    assert "CREATE (src)-[rel:`Rel`]->(tar) SET rel = r.properties" in rels[0]
+
+
+def test_query_names_are_escaped(stub_driver):
+    assert "MERGE (n:`A``B` {id: ent.node_id})" in stub_driver._node_query("A`B")
+    assert "[rel:`x``y`]" in stub_driver._edge_query(None, None, "x`y")
+
+
+def test_query_batches(stub_driver, stub_neo4j):
+    stub_neo4j.responses.insert(0, (r"MATCH \(n\)", [{"id": f"n{i}", "i": i} for i in range(5)]))
+    wrapper = stub_driver._driver
+
+    records = wrapper.query_iter("MATCH (n) RETURN n.id AS id, n.i AS i", fetch_size=2, write=False)
+    assert next(records) == {"id": "n0", "i": 0}
+    (session,) = stub_neo4j.sessions[-1:]
+    assert session.config["fetch_size"] == 2
+    assert not session.closed
+    records.close()
+    assert session.closed
+
+    batches = list(wrapper.query_batches("MATCH (n) RETURN n", batch_size=2))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert stub_neo4j.sessions[-1].closed
+
+    frames = list(wrapper.query_batches("MATCH (n) RETURN n", batch_size=3, as_="pandas"))
+    assert list(frames[0].columns) == ["id", "i"]
+    assert frames[1]["id"].tolist() == ["n3", "n4"]
+
+    with pytest.raises(ValueError):
+        next(wrapper.query_batches("MATCH (n) RETURN n", as_="csv"))
+
+
+def test_query_cache(stub_neo4j):
+    from biocypher.output.connect._neo4j_driver_wrapper import Neo4jDriver
+
+    counts = iter(range(100))
+    stub_neo4j.responses.insert(0, (r"COUNT\(n\)", lambda query, parameters: [{"count": next(counts)}]))
+    wrapper = Neo4jDriver(driver=stub_neo4j, db_name="neo4j", force_enterprise=True, query_cache_size=2)
+
+    assert wrapper.node_count == 0
+    assert wrapper.node_count == 0
+    # whitespace does not matter, parameters do
+    assert wrapper.query("MATCH (n)\n  RETURN COUNT(n) AS count;", write=False)[0] == [{"count": 0}]
+    assert wrapper.query("MATCH (n) RETURN COUNT(n) AS count;", write=False, parameters={"x": 1})[0] == [{"count": 1}]
+    assert wrapper.cache_info()["hits"] == 2
+
+    # cached results are copies
+    wrapper.query("MATCH (n) RETURN COUNT(n) AS count;", write=False)[0][0]["count"] = -1
+    assert wrapper.node_count == 0
+
+    # writes to the database drop its results
+    wrapper.query("CREATE (n:Test)")
+    assert wrapper.node_count == 2
+    wrapper.execute_write("CREATE (n:Test)")
+    assert wrapper.node_count == 3
+
+    info = wrapper.cache_info()
+    assert info["size"] <= 2
+    assert info["hit_rate"] == info["hits"] / (info["hits"] + info["misses"])
+
+    assert Neo4jDriver(driver=stub_neo4j, db_name="neo4j", force_enterprise=True).cache_info() is None
+
+
+def test_query_cache_ttl():
+    from biocypher.output.connect._neo4j_driver_wrapper import _QueryCache
+
+    import time
+
+    cache = _QueryCache(maxsize=2, ttl=0.01)
+    key = cache.key("neo4j", "RETURN 1", {})
+    cache.put(key, ([{"1": 1}], None))
+    time.sleep(0.02)
+    assert cache.get(key) is None
+
+    cache = _QueryCache(maxsize=2)
+    for i in range(3):
+        cache.put(cache.key("neo4j", f"RETURN {i}", {}), ([], None))
+    assert cache.get(cache.key("neo4j", "RETURN 0", {})) is None
+    assert cache.get(cache.key("neo4j", "RETURN 2", {})) == ([], None)
+    assert cache.key("neo4j", "RETURN $x", {"x": object()}) is None
+
+
+def test_execute_many(stub_driver, stub_neo4j):
+    wrapper = stub_driver._driver
+    n_sessions = len(stub_neo4j.sessions)
+
+    summaries = wrapper.execute_many(["CREATE (n:A {i: $i})"] * 3, [{"i": i} for i in range(3)])
+    assert [s.parameters for s in summaries] == [{"i": i} for i in range(3)]
+    assert [q[3] for q in stub_neo4j.queries] == ["write"] * 3
+
+    wrapper.execute_many(["CREATE INDEX a", "CREATE INDEX b"], transaction=False)
+    assert [q[3] for q in stub_neo4j.queries[3:]] == ["auto"] * 2
+    assert len(stub_neo4j.sessions) == n_sessions + 2
+
+    with pytest.raises(ValueError):
+        wrapper.execute_many(["RETURN 1", "RETURN 2"], [{}])
+
+
+def test_create_constraints_in_one_session(stub_driver, stub_neo4j):
+    n_sessions = len(stub_neo4j.sessions)
+    stub_driver.init_db()
+
+    constraints = stub_neo4j.run_queries("CREATE CONSTRAINT", kind="write")
+    assert len(constraints) > 1
+    assert len(stub_neo4j.sessions) - n_sessions == 2  # the version query and the constraints
+
+
+def test_drop_indices(stub_driver, stub_neo4j):
+    stub_neo4j.responses.insert(
+        0,
+        (
+            r"SHOW INDEXES",
+            [{"name": "a_index", "owningConstraint": None}, {"name": "b_id", "owningConstraint": "b_id"}],
+        ),
+    )
+    stub_driver._driver.drop_indices()
+
+    assert [q[0] for q in stub_neo4j.run_queries("DROP")] == ["DROP INDEX `a_index` IF EXISTS"]
+
+
+def test_wipe_db_replaces_database(stub_driver, stub_neo4j):
+    stub_driver._driver.wipe_db()
+
+    (replace,) = stub_neo4j.run_queries("CREATE OR REPLACE DATABASE")
+    assert replace[0] == "CREATE OR REPLACE DATABASE `neo4j` WAIT;"
+    assert replace[2] == "system"
+    assert not stub_neo4j.run_queries("DELETE")
+
+
+@pytest.mark.parametrize("version", ["5.26.0", "4.4.0"])
+def test_wipe_db_in_batches(version):
+    from neo4j.exceptions import ClientError
+
+    from biocypher.output.connect._neo4j_driver_wrapper import Neo4jDriver
+
+    from ...fixtures.neo4j_stub import StubDriver
+
+    left = {"relationships": 25, "nodes": 7}
+
+    def replace(query, parameters):
+        raise ClientError("Unsupported administration command")
+
+    def delete(query, parameters):
+        what = "relationships" if "]->" in query else "nodes"
+        limit = int(query.split("LIMIT ")[1].split()[0])
+        left[what] -= min(limit, left[what])
+        return []
+
+    def count(query, parameters):
+        return [{"count": left["relationships" if "]->" in query else "nodes"]}]
+
+    stub = StubDriver(
+        [(r"REPLACE DATABASE", replace), (r"RETURN count\(x\)", count), (r"DELETE x", delete)],
+        version=version,
+    )
+    wrapper = Neo4jDriver(driver=stub, db_name="neo4j", force_enterprise=True)
+    wrapper.wipe_db(batch_size=10)
+
+    assert left == {"relationships": 0, "nodes": 0}
+    deletes = [q[0] for q in stub.run_queries("DELETE x")]
+    if version.startswith("5"):
+        assert len(deletes) == 2
+        assert all("IN TRANSACTIONS OF 10 ROWS" in q for q in deletes)
+    else:
+        assert len(deletes) == 4
+        assert all("CALL" not in q for q in deletes)
+    # relationships first
+    assert "]->" in deletes[0] and "]->" not in deletes[-1]
+
+
+def test_query_stats(stub_neo4j):
+    import time
+
+    from biocypher.output.connect._neo4j_driver_wrapper import Neo4jDriver
+
+    stub_neo4j.responses.insert(0, (r"^MATCH\s+\(n:Slow\)", lambda query, parameters: time.sleep(0.02) or [{"n": 1}]))
+    wrapper = Neo4jDriver(driver=stub_neo4j, db_name="neo4j", force_enterprise=True, query_stats=True, slow_query_ms=10)
+    wrapper.reset_query_stats()
+
+    for _ in range(2):
+        wrapper.query("MATCH  (n:Slow)\n RETURN n", write=False)
+    wrapper.query("UNWIND $rows AS row CREATE (n:Fast)", parameters={"rows": list(range(50))})
+    wrapper.query("RETURN 1", profile=True)
+
+    stats = {row["query"]: row for row in wrapper.query_stats()}
+    slow = stats["MATCH (n:Slow) RETURN n"]
+    assert slow["runs"] == 2 and slow["rows"] == 2
+    assert slow["max_ms"] >= 20 and slow["mean_ms"] == slow["total_ms"] / 2
+    # profiled once, as a read query
+    assert len(stub_neo4j.run_queries("^PROFILE MATCH")) == 1
+    assert slow["profile"] and slow["profiled_db_hits"] is not None
+
+    assert stats["UNWIND $rows AS row CREATE (n:Fast)"]["parameter_sizes"] == {100: 1}
+    assert stats["PROFILE RETURN 1"]["db_hits"] == 0
+
+    assert [q["query"] for q in wrapper.slow_queries()] == ["MATCH  (n:Slow)\n RETURN n"] * 2
+    assert wrapper.query_stats(top=1)[0]["query"] == "MATCH (n:Slow) RETURN n"
+
+    assert Neo4jDriver(driver=stub_neo4j, db_name="neo4j", force_enterprise=True).query_stats() is None
+
+
+def test_query_stats_of_writes(stub_neo4j):
+    import time
+
+    from biocypher.output.connect._neo4j_driver_wrapper import Neo4jDriver
+
+    stub_neo4j.responses.insert(0, (r"^CREATE \(n:Slow\)", lambda query, parameters: time.sleep(0.02) or [{"n": 1}]))
+    wrapper = Neo4jDriver(driver=stub_neo4j, db_name="neo4j", force_enterprise=True, query_stats=True, slow_query_ms=10)
+    wrapper.reset_query_stats()
+
+    wrapper.execute_write("CREATE (n:Slow) RETURN n", parameters={"ids": [1, 2, 3]})
+    wrapper.execute_many(["CREATE (n:Slow) RETURN n", "CREATE (n:Fast)"], [None, {"x": 1}])
+    wrapper.execute_many(["CREATE (n:Fast)"], transaction=False)
+
+    stats = {row["query"]: row for row in wrapper.query_stats()}
+    slow = stats["CREATE (n:Slow) RETURN n"]
+    assert slow["runs"] == 2 and slow["rows"] == 2
+    assert slow["max_ms"] >= 20
+    assert slow["parameter_sizes"] == {1: 1, 10: 1}
+    assert stats["CREATE (n:Fast)"]["runs"] == 2
+    assert stats["CREATE (n:Fast)"]["max_ms"] < 20
+    assert len(wrapper.slow_queries()) == 2
+
+    # writes are never run again to profile them
+    assert not stub_neo4j.run_queries("^PROFILE")
+    assert slow["profile"] is None
+
+
+def test_load_csv(stub_neo4j, translator, tmp_path):
+    import gzip
+
+    loaded = {}
+
+    def load(query, parameters):
+        path = tmp_path / parameters["url"].removeprefix("file:///import/")
+        with gzip.open(path, "rt") as f:
+            loaded[path.name] = (query, f.read().splitlines())
+        return []
+
+    stub_neo4j.responses.insert(0, (r"^LOAD CSV", load))
+    driver = _Neo4jDriver(
+        database_name="neo4j",
+        uri=None,
+        user=None,
+        password=None,
+        multi_db=False,
+        translator=translator,
+        increment_version=False,
+        force_enterprise=True,
+        batch_size=2,
+        concurrency=2,
+        driver=stub_neo4j,
+        load_csv_directory=str(tmp_path),
+        load_csv_url="file:///import",
+    )
+
+    for name in ("Other-header.csv", "Other-part000.csv.gz"):
+        (tmp_path / name).touch()
+
+    driver.add_biocypher_nodes(
+        [
+            BioCypherNode(
+                node_id=f"p{i}",
+                node_label="protein",
+                properties={"name": f"P{i}", "score": i / 2, "taxon": 9606, "genes": ["a", "b"]},
+            )
+            for i in range(3)
+        ]
+    )
+    driver.add_biocypher_edges(
+        BioCypherEdge(source_id="p1", target_id="p2", relationship_label="Interacts", properties={"weight": 1})
+    )
+
+    assert sorted(loaded) == ["Interacts-part000.csv.gz", "Protein-part000.csv.gz", "Protein-part001.csv.gz"]
+    query, rows = loaded["Protein-part000.csv.gz"]
+    assert len(rows) == 2 and rows[0].startswith("p0,")
+    assert query.startswith("LOAD CSV FROM $url AS row FIELDTERMINATOR ','")
+    assert "MERGE (n:`Protein` {id: row[0]})" in query
+    assert "`score`: toFloat(row[" in query
+    assert "[v IN split(row[4], '|') | toInteger(v)]" not in query
+    assert "[v IN split(row[4], '|') | v]" in query
+    assert "IN TRANSACTIONS OF 2 ROWS" in query
+
+    query, rows = loaded["Interacts-part000.csv.gz"]
+    assert rows == ['p1,,1,p2,"Interacts"']
+    assert "MERGE (src)-[r:`Interacts`]->(tar) SET r += {`id`: row[1], `weight`: toInteger(row[2])}" in query
+    assert "MERGE (src {id: row[0]}) MERGE (tar {id: row[3]})" in query
+
+    # the files written are removed after loading, other files are kept
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["Other-header.csv", "Other-part000.csv.gz"]
+    assert not stub_neo4j.run_queries("UNWIND \\$")
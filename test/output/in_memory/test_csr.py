@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from biocypher._create import BioCypherEdge, BioCypherNode
+from biocypher.output.in_memory._csr import HAS_SCIPY
+
+
+@pytest.mark.parametrize("length", [4], scope="module")
+def test_nodes(in_memory_csr_kg, _get_nodes):
+    in_memory_csr_kg.add_nodes(_get_nodes)
+    kg = in_memory_csr_kg.get_kg()
+
+    assert kg.n_nodes == 8
+    assert kg.node_ids == ["p1", "m1", "p2", "m2", "p3", "m3", "p4", "m4"]
+    assert kg.node_index["p3"] == 4
+    assert kg.node_types == ["protein", "microRNA"]
+    assert kg.node_type("m2") == "microRNA"
+    assert list(kg.node_type_codes()) == [0, 1, 0, 1, 0, 1, 0, 1]
+
+    score = kg.node_property("score")
+    assert score.dtype == float
+    assert score[0] == 4.0
+    assert np.isnan(score[1])
+    assert list(kg.node_property("taxon")) == [9606] * 8
+    assert kg.node_property("genes")[1] is None
+
+
+@pytest.mark.parametrize("length", [4], scope="module")
+def test_edges(in_memory_csr_kg, _get_nodes, _get_edges):
+    in_memory_csr_kg.add_nodes(_get_nodes)
+    in_memory_csr_kg.add_edges(_get_edges)
+    kg = in_memory_csr_kg.get_kg()
+
+    assert sorted(kg.relationship_types) == ["Is_Mutated_In", "PERTURBED_IN_DISEASE"]
+    assert kg.n_edges() == 8
+    assert kg.n_edges("PERTURBED_IN_DISEASE") == 4
+
+    # p0 and m0 are only known as edge sources
+    assert kg.n_nodes == 10
+    assert kg.node_type("p0") is None
+
+    adjacency = kg.csr("PERTURBED_IN_DISEASE")
+    assert adjacency.shape == (10, 10)
+    assert adjacency.indptr.dtype == np.int64
+    assert adjacency.indices.dtype == np.int32
+    assert len(adjacency.indptr) == 11
+    assert adjacency.indptr[-1] == 4
+    assert kg.neighbors("p1", "PERTURBED_IN_DISEASE") == ["p2"]
+    assert kg.neighbors("p0", "PERTURBED_IN_DISEASE") == ["p1"]
+    assert kg.neighbors("p4", "PERTURBED_IN_DISEASE") == []
+
+    ids = kg.edge_property("PERTURBED_IN_DISEASE", "relationship_id")[adjacency.edges]
+    sources = np.repeat(np.arange(kg.n_nodes), np.diff(adjacency.indptr))
+    for source, target, rel_id in zip(sources, adjacency.indices, ids):
+        assert rel_id == f"prel{int(kg.node_ids[source][1:])}"
+        assert kg.node_ids[target] == f"p{int(rel_id[4:]) + 1}"
+    assert list(kg.edge_property("Is_Mutated_In", "confidence")) == [1.0] * 4
+
+
+def test_csr_is_cached_and_updated(in_memory_csr_kg):
+    kg = in_memory_csr_kg
+    kg.add_edges([BioCypherEdge(source_id="a", target_id="b", relationship_label="r")])
+    first = kg.csr("r")
+    assert kg.csr("r") is first
+
+    kg.add_edges(
+        [
+            BioCypherEdge(source_id="c", target_id="a", relationship_label="r"),
+            BioCypherEdge(source_id="a", target_id="c", relationship_label="r"),
+        ]
+    )
+    second = kg.csr("r")
+    assert second is not first
+    assert list(second.indptr) == [0, 2, 2, 3]
+    assert kg.neighbors("a", "r") == ["b", "c"]
+    assert kg.neighbors("c", "r") == ["a"]
+
+
+def test_duplicates_are_skipped(in_memory_csr_kg):
+    node = BioCypherNode(node_id="a", node_label="protein")
+    edge = BioCypherEdge(relationship_id="e1", source_id="a", target_id="a", relationship_label="r")
+    in_memory_csr_kg.add_nodes([node, node])
+    in_memory_csr_kg.add_edges([edge, edge])
+
+    assert in_memory_csr_kg.n_nodes == 1
+    assert in_memory_csr_kg.n_edges("r") == 1
+
+
+def test_unknown_relationship_type(in_memory_csr_kg):
+    with pytest.raises(KeyError):
+        in_memory_csr_kg.csr("r")
+
+
+@pytest.mark.skipif(not HAS_SCIPY, reason="SciPy is not installed")
+def test_to_scipy(in_memory_csr_kg):
+    in_memory_csr_kg.add_edges([BioCypherEdge(source_id="a", target_id="b", relationship_label="r")])
+    matrix = in_memory_csr_kg.to_scipy("r")
+    assert matrix.shape == (2, 2)
+    assert matrix[0, 1] == 1
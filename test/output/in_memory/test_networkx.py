@@ -1,5 +1,9 @@
+import networkx as nx
 import pytest
 
+from biocypher._create import BioCypherEdge
+from biocypher.output.in_memory._networkx import NetworkxKG
+
 
 @pytest.mark.parametrize("length", [4], scope="module")
 def test_nodes(in_memory_networkx_kg, _get_nodes):
@@ -95,7 +99,8 @@ def test_nodes(in_memory_networkx_kg, _get_nodes):
             },
         ),
     ]
-    assert list(networkx_kg.nodes(data=True)) == expected_nodes
+    # nodes are added in input order, not grouped by type
+    assert dict(networkx_kg.nodes(data=True)) == dict(expected_nodes)
 
 
 @pytest.mark.parametrize("length", [4], scope="module")
@@ -213,7 +218,7 @@ def test_edges(in_memory_networkx_kg, _get_edges):
             },
         ),
     ]
-    assert list(networkx_kg.edges(data=True)) == expected_edges
+    assert {(s, t): d for s, t, d in networkx_kg.edges(data=True)} == {(s, t): d for s, t, d in expected_edges}
 
 
 @pytest.mark.parametrize("length", [4], scope="module")
@@ -306,7 +311,7 @@ def test_edges_gen(in_memory_networkx_kg, _get_edges):
             },
         ),
     ]
-    assert list(networkx_kg.edges(data=True)) == expected_edges
+    assert {(s, t): d for s, t, d in networkx_kg.edges(data=True)} == {(s, t): d for s, t, d in expected_edges}
 
 
 @pytest.mark.parametrize("length", [4], scope="module")
@@ -355,4 +360,36 @@ def test_rel_as_nodes(in_memory_networkx_kg, _get_rel_as_nodes):
             {"relationship_id": None, "relationship_label": "IS_TARGET_OF"},
         ),
     ]
-    assert list(networkx_kg.edges(data=True)) == expected_edges
+    assert {(s, t): d for s, t, d in networkx_kg.edges(data=True)} == {(s, t): d for s, t, d in expected_edges}
+
+
+@pytest.mark.parametrize("length", [4], scope="module")
+def test_get_kg_after_adding_more(in_memory_networkx_kg, _get_nodes, _get_edges):
+    in_memory_networkx_kg.add_nodes(_get_nodes[:4])
+    first = in_memory_networkx_kg.get_kg()
+    assert set(first.nodes) == {"p1", "m1", "p2", "m2"}
+
+    in_memory_networkx_kg.add_nodes(_get_nodes[4:])
+    in_memory_networkx_kg.add_edges(_get_edges)
+    kg = in_memory_networkx_kg.get_kg()
+
+    # the cached graph is updated in place instead of going stale
+    assert kg is first
+    assert set(kg.nodes) >= {"p3", "m3", "p4", "m4"}
+    assert kg.has_edge("p1", "p2")
+    assert kg.nodes["p4"]["node_label"] == "protein"
+
+
+def test_multigraph_keeps_parallel_edges(deduplicator):
+    kg = NetworkxKG(deduplicator=deduplicator, multigraph=True)
+    kg.add_edges(
+        [
+            BioCypherEdge(relationship_id="r1", source_id="a", target_id="b", relationship_label="activates"),
+            BioCypherEdge(relationship_id="r2", source_id="a", target_id="b", relationship_label="inhibits"),
+        ]
+    )
+    graph = kg.get_kg()
+
+    assert isinstance(graph, nx.MultiDiGraph)
+    assert graph.number_of_edges("a", "b") == 2
+    assert graph.edges["a", "b", "r2"]["relationship_label"] == "inhibits"
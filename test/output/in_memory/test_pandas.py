@@ -1,5 +1,8 @@
 import pytest
 
+from biocypher._create import BioCypherNode
+from biocypher.output.in_memory._pandas import PandasKG
+
 
 def test_pandas(in_memory_pandas_kg):
     assert in_memory_pandas_kg.dfs == {}
@@ -74,3 +77,58 @@ def test_rel_as_nodes(in_memory_pandas_kg, _get_rel_as_nodes):
     assert "i3" in in_memory_pandas_kg.dfs["IS_SOURCE_OF"]["source_id"].values
     assert "target_id" in in_memory_pandas_kg.dfs["IS_TARGET_OF"].columns
     assert "p2" in in_memory_pandas_kg.dfs["IS_TARGET_OF"]["target_id"].values
+
+
+@pytest.mark.parametrize("length", [4], scope="module")
+def test_get_kg_after_adding_more(in_memory_pandas_kg, _get_nodes):
+    in_memory_pandas_kg.add_tables(_get_nodes[:4])
+    assert len(in_memory_pandas_kg.get_kg()["protein"]) == 2
+
+    in_memory_pandas_kg.add_tables(_get_nodes[4:6])
+    in_memory_pandas_kg.add_tables(_get_nodes[6:])
+    dfs = in_memory_pandas_kg.get_kg()
+    assert list(dfs["protein"]["node_id"]) == ["p1", "p2", "p3", "p4"]
+    assert list(dfs["protein"].index) == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("length", [4], scope="module")
+def test_schema_dtypes(deduplicator, _get_nodes):
+    schema = {"protein": {"properties": {"name": "str", "score": "float", "taxon": "int", "genes": "str[]"}}}
+    kg = PandasKG(deduplicator=deduplicator, extended_schema=schema)
+    kg.add_tables(_get_nodes)
+    protein = kg.get_kg()["protein"]
+
+    assert protein["node_label"].dtype == "category"
+    assert protein["score"].dtype == "Float64"
+    assert protein["taxon"].dtype == "Int64"
+    assert protein["genes"].iloc[0] == ["gene1", "gene2"]
+    # types without schema properties keep the inferred dtypes
+    assert kg.get_kg()["microRNA"]["taxon"].dtype == "int64"
+
+
+def test_missing_properties(deduplicator):
+    kg = PandasKG(deduplicator=deduplicator)
+    kg.add_tables(
+        [
+            BioCypherNode(node_id="p1", node_label="protein", properties={"name": "a"}),
+            BioCypherNode(node_id="p2", node_label="protein", properties={"score": 1.0}),
+        ]
+    )
+    protein = kg.get_kg()["protein"]
+
+    assert list(protein.columns) == ["node_id", "node_label", "name", "id", "preferred_id", "score"]
+    assert protein["name"].isna().tolist() == [False, True]
+    assert protein["score"].isna().tolist() == [True, False]
+
+
+@pytest.mark.parametrize("dbms", ["csv", "pandas", "tabular"])
+def test_pyarrow_strings_from_csv_config(dbms, monkeypatch):
+    from biocypher._deduplicate import Deduplicator
+    from biocypher.output.in_memory import _get_in_memory_kg, _pandas
+
+    monkeypatch.setattr(_pandas, "HAS_PYARROW", True)
+    monkeypatch.setattr(
+        _get_in_memory_kg, "_config", lambda section: {"pyarrow_strings": True} if section == "csv" else {}
+    )
+
+    assert _get_in_memory_kg.get_in_memory_kg(dbms, Deduplicator()).pyarrow_strings
@@ -61,3 +61,60 @@ def test_biopathnet_writer_edges(bw_biopathnet, _get_edges):
         assert file in expected_files
         f = open(os.path.join(tmp_path, file), "r")
         logger.debug(f"Contents of {file} is \n{f.read()}")
+
+
+@pytest.mark.parametrize("length", [4], scope="function")
+def test_biopathnet_writer_streams_nodes(translator, deduplicator, tmp_path, _get_nodes):
+    from unittest.mock import patch
+
+    import networkx as nx
+
+    from biocypher.output.write.graph._biopathnet import _BioPathNetWriter
+
+    writer = _BioPathNetWriter(
+        translator=translator,
+        deduplicator=deduplicator,
+        output_directory=str(tmp_path),
+    )
+
+    with patch("biocypher.output.write.graph._biopathnet.nx.ancestors", side_effect=nx.ancestors) as ancestors:
+        assert writer.write_nodes(_get_nodes, batch_size=3)
+    # one lookup per semantic type, not per node
+    assert ancestors.call_count == 2
+
+    with open(tmp_path / "entity_types.txt") as f:
+        types = f.read().splitlines()
+    for i in range(1, 5):
+        assert f"p{i}\tprotein" in types
+        assert f"m{i}\tmicroRNA" in types
+    assert "name_StringProperty1\tproperty_value" in types
+    assert "protein\tpolypeptide" in types
+    assert types[-1] == "entity\tTHING"
+
+    with open(tmp_path / "brg.txt") as f:
+        brg = f.read().splitlines()
+    assert "p1\tscore\tscore_4.0" in brg
+    assert "p1\tgenes\tgenes_['gene1','gene2']" in brg
+    assert any(line.startswith("protein\tis_a\t") for line in brg)
+
+    with open(tmp_path / "entity_names.txt") as f:
+        names = f.read().splitlines()
+    assert names.count("p1\tp1") == 1
+    assert names.count("protein\tprotein") == 2  # as entity type and in the hierarchy
+
+
+@pytest.mark.parametrize("length", [4], scope="function")
+def test_biopathnet_writer_streams_edges(translator, deduplicator, tmp_path, _get_edges):
+    from biocypher.output.write.graph._biopathnet import _BioPathNetWriter
+
+    writer = _BioPathNetWriter(
+        translator=translator,
+        deduplicator=deduplicator,
+        output_directory=str(tmp_path),
+    )
+    assert writer.write_edges(_get_edges, batch_size=3)
+
+    with open(tmp_path / "skg.txt") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == len(_get_edges)
+    assert lines[0] == "p0\tPERTURBED_IN_DISEASE\tp1"
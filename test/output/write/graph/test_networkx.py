@@ -85,3 +85,85 @@ def test_networkx_writer_edges(bw_networkx, _get_edges):
 
     import_script_path = os.path.join(bw_networkx.output_directory, bw_networkx._get_import_script_name())
     assert "import_networkx.py" in import_script_path
+
+
+@pytest.mark.parametrize("length", [4], scope="module")
+def test_networkx_writer_arrays(bw_networkx_arrays, _get_nodes, _get_edges):
+    import runpy
+
+    import numpy as np
+
+    nodes = _get_nodes
+    edges = _get_edges
+
+    assert bw_networkx_arrays.write_nodes(nodes[:3], batch_size=1e6)
+    assert bw_networkx_arrays.write_nodes(nodes[3:], batch_size=1e6)
+    # flushed after every 3 edges
+    assert bw_networkx_arrays.write_edges(edges, batch_size=3)
+    assert max(table.n_parts for _, table, _ in bw_networkx_arrays.graph_arrays.edges.values()) > 1
+    assert bw_networkx_arrays.write_import_call()
+
+    tmp_path = bw_networkx_arrays.output_directory
+    assert not os.path.exists(f"{tmp_path}/networkx_graph.pkl")
+
+    loader = runpy.run_path(f"{tmp_path}/import_networkx.py")
+    metadata, node_ids, node_index, edge_index = loader["load_arrays"](f"{tmp_path}/networkx_graph")
+
+    assert len(node_ids) == metadata["num_nodes"]
+    assert sum(len(index) for index in node_index.values()) == len(nodes)
+    for label, index in edge_index.items():
+        assert index.dtype == np.int32
+        assert index.shape == (2, metadata["edge_types"][label]["num_edges"])
+
+    G = loader["load_graph"](f"{tmp_path}/networkx_graph")
+
+    for node in nodes:
+        expected = node.get_properties()
+        expected["node_label"] = node.get_label()
+        assert G.nodes[node.get_id()] == expected
+
+    assert len(edges) == len(G.edges)
+    for edge in edges:
+        expected = edge.get_properties()
+        expected["relationship_label"] = edge.get_label()
+        expected["relationship_id"] = edge.get_id()
+        assert G.edges[edge.get_source_id(), edge.get_target_id()] == expected
+
+
+def test_networkx_writer_unknown_format(translator, deduplicator, tmp_path):
+    from biocypher.output.write.graph._networkx import _NetworkXWriter
+
+    with pytest.raises(ValueError):
+        _NetworkXWriter(
+            translator=translator,
+            deduplicator=deduplicator,
+            output_directory=tmp_path,
+            file_format="graphml",
+        )
+
+
+@pytest.mark.parametrize("parquet", [False, True])
+def test_networkx_writer_arrays_differing_properties(bw_networkx_arrays, parquet, monkeypatch):
+    import runpy
+
+    from biocypher._create import BioCypherNode
+    from biocypher.output.write.graph import _networkx
+
+    if parquet:
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(_networkx, "HAS_PYARROW", parquet)
+
+    properties = [{"name": "a"}, {"name": "b", "score": 1.5}, {}, {"score": 2.0}]
+    nodes = [BioCypherNode(node_id=f"n{i}", node_label="thing", properties=p) for i, p in enumerate(properties)]
+    assert bw_networkx_arrays.write_nodes(nodes, batch_size=1e6)
+    # a part of rows without any properties
+    table = bw_networkx_arrays.graph_arrays.nodes["thing"][1]
+    table.add({})
+    table.add({})
+    table.flush()
+    bw_networkx_arrays.write_import_call()
+
+    tmp_path = bw_networkx_arrays.output_directory
+    loader = runpy.run_path(f"{tmp_path}/import_networkx.py")
+    rows = loader["read_properties"](f"{tmp_path}/networkx_graph/nodes/thing")
+    assert rows == [node.get_properties() for node in nodes] + [{}, {}]
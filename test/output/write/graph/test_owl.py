@@ -9,7 +9,9 @@ from rdflib import (
     URIRef,
 )
 
-from rdflib import CSVW, RDF, Graph, Literal
+from rdflib import CSVW, RDF, BNode, Graph, Literal
+
+from biocypher._create import BioCypherEdge, BioCypherNode
 
 
 def fix_ontology(bw_owl):
@@ -233,3 +235,69 @@ def test_owl_ttl_format(bw_owl, length, _get_nodes, _get_edges):
 
     # Basic verification that the graph contains expected data
     assert len(set(graph.subjects(RDF.type))) > 0
+
+
+def _streaming_entities(nodes, edges):
+    """Copy the test entities with ids not yet in the shared ontology graph."""
+    nodes = [
+        BioCypherNode(
+            node_id=f"stream_{n.get_id()}",
+            node_label=n.get_label(),
+            properties={k: v for k, v in n.get_properties().items() if k not in ("id", "preferred_id")},
+        )
+        for n in nodes
+    ]
+    edges = [
+        BioCypherEdge(
+            relationship_id=f"stream_{e.get_id()}",
+            source_id=f"stream_{e.get_source_id()}",
+            target_id=f"stream_{e.get_target_id()}",
+            relationship_label=e.get_label(),
+            properties=e.get_properties(),
+        )
+        for e in edges
+    ]
+    return nodes, edges
+
+
+@pytest.mark.parametrize("length", [4], scope="function")
+def test_owl_streaming(bw_owl_streaming, translator, tmp_path_factory, length, _get_nodes, _get_edges):
+    from biocypher._deduplicate import Deduplicator
+    from biocypher.output.write.graph._owl import _OWLWriter
+
+    nodes, edges = _streaming_entities(_get_nodes, _get_edges)
+
+    fix_ontology(bw_owl_streaming)
+    n_vocabulary = len(bw_owl_streaming.graph)
+    assert bw_owl_streaming.write_nodes(nodes, batch_size=3)
+    assert bw_owl_streaming.write_edges(edges, batch_size=3)
+
+    owl_files = glob.glob(os.path.join(bw_owl_streaming.outdir, "*"))
+    assert [os.path.basename(f) for f in owl_files] == ["biocypher.nt"]
+    streamed = Graph().parse(owl_files[0], format="nt")
+
+    biocypher_namespace = bw_owl_streaming.namespaces["biocypher"]
+    assert (biocypher_namespace["stream_p1"], RDF.type, OWL.NamedIndividual) in streamed
+    assert (biocypher_namespace["stream_p1"], CSVW["name"], Literal("StringProperty1")) in streamed
+    # only vocabulary terms are kept in memory, not the instances
+    assert (biocypher_namespace["stream_p1"], RDF.type, OWL.NamedIndividual) not in bw_owl_streaming.graph
+    assert len(bw_owl_streaming.graph) - n_vocabulary < 20
+
+    # the same writer without streaming, for reference
+    reference_writer = _OWLWriter(
+        translator=translator,
+        deduplicator=Deduplicator(),
+        output_directory=str(tmp_path_factory.mktemp("owl_reference")),
+        delimiter=",",
+        file_format="nt",
+        file_stem="biocypher",
+    )
+    reference_writer.write_nodes(nodes, batch_size=3)
+    reference_writer.write_edges(edges, batch_size=3)
+    reference = Graph().parse(os.path.join(reference_writer.outdir, "biocypher.nt"), format="nt")
+
+    def without_bnodes(graph):
+        return {t for t in graph if not any(isinstance(term, BNode) for term in t)}
+
+    assert len(streamed) == len(reference)
+    assert without_bnodes(streamed) == without_bnodes(reference)
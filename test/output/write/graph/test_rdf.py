@@ -206,3 +206,131 @@ def test_rdf_ttl_format(bw_rdf, length, _get_nodes, _get_edges):
 
     # Basic verification that the graph contains expected data
     assert len(set(graph.subjects(RDF.type))) > 0
+
+
+@pytest.mark.parametrize("length", [4], scope="function")
+def test_rdf_streaming_write_data(bw_rdf_streaming, _get_nodes, _get_edges):
+    # small batches, so that each label is appended to several times
+    assert bw_rdf_streaming.write_nodes(_get_nodes, batch_size=3)
+    assert bw_rdf_streaming.write_edges(_get_edges, batch_size=3)
+
+    nt_files = glob.glob(os.path.join(bw_rdf_streaming.outdir, "*.nt"))
+    assert sorted(os.path.basename(f) for f in nt_files) == [
+        "Is_Mutated_In.nt",
+        "MicroRNA.nt",
+        "PERTURBED_IN_DISEASE.nt",
+        "Protein.nt",
+    ]
+
+    graph = Graph()
+    for file in nt_files:
+        graph.parse(file, format="nt")
+
+    biocypher_namespace = Namespace("https://biocypher.org/biocypher#")
+
+    # same content as written through an rdflib graph
+    assert len(set(graph.subjects(biocypher_namespace["id"]))) == 8
+    assert len(set(graph.subjects(RDF.type))) == 20
+    assert len(set(graph.subject_objects())) == 96
+    assert (biocypher_namespace["Protein"], RDF.type, RDFS.Class) in graph
+    assert (biocypher_namespace["p2"], biocypher_namespace["score"], Literal(2.0)) in graph
+    assert (biocypher_namespace["p1"], biocypher_namespace["genes"], Literal("gene2")) in graph
+
+    # classes are declared once
+    with open(os.path.join(bw_rdf_streaming.outdir, "Protein.nt")) as f:
+        lines = f.readlines()
+    assert sum("rdf-schema#Class" in line for line in lines) == 1
+
+
+def test_rdf_streaming_nquads_gzip(translator, deduplicator, tmp_path):
+    import gzip
+
+    from rdflib import Dataset
+
+    from biocypher._create import BioCypherNode
+    from biocypher.output.write.graph._rdf import _RDFWriter
+
+    writer = _RDFWriter(
+        translator=translator,
+        deduplicator=deduplicator,
+        output_directory=tmp_path,
+        file_format="nquads",
+        delimiter=",",
+        streaming=True,
+        compression="gzip",
+    )
+    nodes = [BioCypherNode(node_id=f"p{i}", node_label="protein", properties={"name": 'a "b"'}) for i in range(4)]
+    assert writer.write_nodes(nodes[:2])
+    assert writer.write_nodes(nodes[2:])
+
+    with gzip.open(os.path.join(writer.outdir, "Protein.nquads.gz"), "rt") as f:
+        data = f.read()
+    dataset = Dataset()
+    dataset.parse(data=data, format="nquads")
+
+    graph = dataset.graph(Namespace("https://biocypher.org/biocypher#")["Protein"])
+    assert len(set(graph.subjects(RDF.type))) == 5
+    assert (Namespace("https://biocypher.org/biocypher#")["p3"], None, Literal('a "b"')) in graph
+
+
+def test_rdf_streaming_unsupported_format(translator, deduplicator, tmp_path):
+    from biocypher.output.write.graph._rdf import _RDFWriter
+
+    writer = _RDFWriter(
+        translator=translator,
+        deduplicator=deduplicator,
+        output_directory=tmp_path,
+        file_format="xml",
+        delimiter=",",
+        streaming=True,
+    )
+    assert not writer.write_nodes([])
+
+    with pytest.raises(ValueError):
+        _RDFWriter(
+            translator=translator,
+            deduplicator=deduplicator,
+            output_directory=tmp_path,
+            file_format="nt",
+            delimiter=",",
+            streaming=True,
+            compression="zip",
+        )
+
+
+@pytest.mark.parametrize("length", [4], scope="function")
+def test_rdf_property_uri_cache(bw_rdf, _get_nodes):
+    assert bw_rdf.write_nodes(_get_nodes)
+
+    info = bw_rdf.property_uri_cache_info()
+    # one lookup per distinct property name, all others from the cache
+    assert info["misses"] == info["size"] == len({"score", "name", "taxon", "genes", "id", "preferred_id"})
+    assert info["hits"] > info["misses"]
+
+    assert bw_rdf.property_to_uri("name") == CSVW["name"]
+    assert bw_rdf.property_uri_cache_info()["hits"] == info["hits"] + 1
+
+
+def test_rdf_to_uri(bw_rdf):
+    from rdflib import Graph as _Graph
+
+    bw_rdf._init_namespaces(_Graph())
+    biocypher_namespace = Namespace("https://biocypher.org/biocypher#")
+    assert bw_rdf.to_uri("p1") == biocypher_namespace["p1"]
+    assert bw_rdf.to_uri("biocypher:p1") == biocypher_namespace["p1"]
+    assert bw_rdf.to_uri("unknown:p1") == biocypher_namespace["p1"]
+    assert bw_rdf.to_uri("a:b:c") == biocypher_namespace["a:b:c"]
+
+
+@pytest.mark.parametrize(
+    "value, lexical",
+    [(float("nan"), "NaN"), (float("inf"), "INF"), (float("-inf"), "-INF"), (1.5, "1.5")],
+)
+def test_nt_literal_double(value, lexical):
+    from biocypher.output.write.graph._rdf import nt_literal
+
+    literal = nt_literal(value)
+    assert literal == f'"{lexical}"^^<http://www.w3.org/2001/XMLSchema#double>'
+    # the lexical form is parsed back to the same value
+    parsed = next(Graph().parse(data=f"<urn:s> <urn:p> {literal} .", format="nt").objects()).toPython()
+    assert parsed == value or (parsed != parsed and value != value)
@@ -0,0 +1,103 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from biocypher._create import BioCypherEdge, BioCypherNode
+
+
+def _load(bw_tensor, *path):
+    return np.load(os.path.join(bw_tensor.output_directory, *path), mmap_mode="r")
+
+
+@pytest.mark.parametrize("length", [4], scope="module")
+def test_tensor_writer_nodes(bw_tensor, _get_nodes):
+    assert bw_tensor.write_nodes(_get_nodes[:4])
+    assert bw_tensor.write_nodes(_get_nodes[4:])
+
+    with open(os.path.join(bw_tensor.output_directory, "nodes", "protein", "node_ids.txt")) as f:
+        assert f.read().split() == ["p1", "p2", "p3", "p4"]
+
+    # numeric and string properties from the schema configuration
+    x = _load(bw_tensor, "nodes", "protein", "x.npy")
+    assert x.shape == (4, 2)
+    assert x.dtype == np.float32
+    np.testing.assert_allclose(x[:, 0], [4.0, 2.0, 4 / 3, 1.0], rtol=1e-6)
+    assert list(x[:, 1]) == [9606] * 4
+    codes = _load(bw_tensor, "nodes", "protein", "categorical.npy")
+    assert codes.shape == (4, 1)
+    assert list(codes[:, 0]) == [0, 0, 0, 0]
+
+    with open(os.path.join(bw_tensor.output_directory, "metadata.json")) as f:
+        metadata = json.load(f)
+    assert metadata["node_types"]["protein"]["num_nodes"] == 4
+    assert metadata["node_types"]["protein"]["numeric"] == ["score", "taxon"]
+    assert metadata["node_types"]["protein"]["categorical"] == {"name": ["StringProperty1"]}
+    assert metadata["node_types"]["microRNA"]["numeric"] == ["taxon"]
+
+
+@pytest.mark.parametrize("length", [4], scope="module")
+def test_tensor_writer_edges(bw_tensor, _get_nodes, _get_edges):
+    bw_tensor.write_nodes(_get_nodes)
+    assert bw_tensor.write_edges(_get_edges[:4])
+    assert bw_tensor.write_edges(_get_edges[4:])
+
+    edge_index = _load(bw_tensor, "edges", "protein__PERTURBED_IN_DISEASE__protein", "edge_index.npy")
+    assert edge_index.shape == (2, 3)
+    assert edge_index.dtype == np.int64
+    # p1 -> p2, p2 -> p3, p3 -> p4; the edge from p0 is skipped
+    assert edge_index.tolist() == [[0, 1, 2], [1, 2, 3]]
+    assert bw_tensor.n_skipped_edges == 2
+
+    x = _load(bw_tensor, "edges", "microRNA__Is_Mutated_In__protein", "x.npy")
+    assert x.tolist() == [[1.0]] * 3
+
+    with open(os.path.join(bw_tensor.output_directory, "metadata.json")) as f:
+        metadata = json.load(f)
+    edge_types = {(t["source_type"], t["label"], t["target_type"]): t for t in metadata["edge_types"]}
+    assert edge_types[("protein", "PERTURBED_IN_DISEASE", "protein")]["num_edges"] == 3
+    assert edge_types[("protein", "PERTURBED_IN_DISEASE", "protein")]["categorical"] == {"residue": ["T253"]}
+
+
+def test_tensor_writer_missing_properties(bw_tensor):
+    bw_tensor.write_nodes(
+        [
+            BioCypherNode(node_id="a", node_label="thing", properties={"weight": 1, "kind": "x"}),
+            BioCypherNode(node_id="b", node_label="thing", properties={}),
+        ]
+    )
+    x = _load(bw_tensor, "nodes", "thing", "x.npy")
+    codes = _load(bw_tensor, "nodes", "thing", "categorical.npy")
+    assert x[0, 0] == 1.0
+    assert np.isnan(x[1, 0])
+    assert codes.tolist() == [[0], [-1]]
+
+
+def test_tensor_writer_import_call(bw_tensor):
+    bw_tensor.write_nodes([BioCypherNode(node_id="a", node_label="thing", properties={"weight": 1})])
+    bw_tensor.write_edges([BioCypherEdge(source_id="a", target_id="a", relationship_label="self")])
+    path = bw_tensor.write_import_call()
+
+    namespace = {}
+    cwd = os.getcwd()
+    os.chdir(bw_tensor.output_directory)
+    try:
+        with open(path) as f:
+            exec(f.read(), namespace)
+    finally:
+        os.chdir(cwd)
+
+    assert namespace["x"]["thing"].tolist() == [[1.0]]
+    assert namespace["edge_index"][("thing", "self", "thing")].tolist() == [[0], [0]]
+
+
+@pytest.mark.parametrize("length", [4], scope="module")
+def test_tensor_writer_batch_size(bw_tensor, _get_nodes, _get_edges):
+    assert bw_tensor.write_nodes(_get_nodes, batch_size=3)
+    assert bw_tensor.write_edges(_get_edges, batch_size=2)
+
+    assert _load(bw_tensor, "nodes", "protein", "x.npy").shape == (4, 2)
+    edge_index = _load(bw_tensor, "edges", "protein__PERTURBED_IN_DISEASE__protein", "edge_index.npy")
+    assert edge_index.tolist() == [[0, 1, 2], [1, 2, 3]]
+    assert _load(bw_tensor, "edges", "microRNA__Is_Mutated_In__protein", "x.npy").tolist() == [[1.0]] * 3
@@ -92,3 +92,51 @@ def test_pandas_csv_writer_edges(bw_comma_csv, _get_edges):
     assert "p2," in is_mutated_in
     assert "Is_Mutated_In" in is_mutated_in
     assert "\n" in is_mutated_in
+
+
+@pytest.mark.parametrize("length", [4], scope="module")
+def test_pandas_csv_writer_appends_batches(translator, deduplicator, tmp_path, _get_nodes):
+    from biocypher.output.write.relational._csv import _PandasCSVWriter
+
+    writer = _PandasCSVWriter(
+        translator=translator,
+        deduplicator=deduplicator,
+        output_directory=tmp_path,
+        delimiter=",",
+    )
+    proteins = [node for node in _get_nodes if node.get_label() == "protein"]
+    for node in proteins:
+        assert writer.write_nodes([node])
+
+    with open(os.path.join(tmp_path, "protein.csv")) as f:
+        lines = f.read().splitlines()
+
+    assert len(lines) == len(proteins) + 1
+    assert sum(line.startswith(",node_id") for line in lines) == 1
+    assert [line.split(",")[0] for line in lines[1:]] == [str(i) for i in range(len(proteins))]
+    assert list(writer.stored_dfs["protein"]["node_id"]) == [node.get_id() for node in proteins]
+
+
+def test_pandas_csv_writer_widens_columns(translator, deduplicator, tmp_path):
+    import pandas as pd
+
+    from biocypher._create import BioCypherNode
+    from biocypher.output.write.relational._csv import _PandasCSVWriter
+
+    writer = _PandasCSVWriter(
+        translator=translator,
+        deduplicator=deduplicator,
+        output_directory=tmp_path,
+        delimiter=",",
+        keep_in_memory=False,
+    )
+    writer._write_node_data([BioCypherNode("w1", "protein", properties={"name": "a"})])
+    writer._write_node_data([BioCypherNode("w2", "protein", properties={"name": "b", "score": 2})])
+
+    df = pd.read_csv(os.path.join(tmp_path, "protein.csv"), header=0, index_col=0)
+
+    assert list(df.columns) == ["node_id", "node_label", "name", "id", "preferred_id", "score"]
+    assert list(df["node_id"]) == ["w1", "w2"]
+    assert pd.isna(df["score"][0])
+    assert df["score"][1] == 2
+    assert writer.stored_dfs == {}
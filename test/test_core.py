@@ -1,3 +1,4 @@
+import asyncio
 import os
 from unittest.mock import MagicMock, patch
 
@@ -5,6 +6,7 @@ import pytest
 import yaml
 
 from biocypher import BioCypher
+from biocypher._create import BioCypherEdge, BioCypherNode
 from biocypher.output.in_memory._get_in_memory_kg import IN_MEMORY_DBMS
 from biocypher.output.write._get_writer import DBMS_TO_CLASS
 
@@ -170,3 +172,184 @@ def test_pandas_and_tabular_work_in_offline_mode(tmp_path):
         )
         assert bc._dbms == dbms
         assert bc._offline
+
+
+def _proteins(start, stop):
+    return [
+        BioCypherNode(
+            node_id=f"p{i}",
+            node_label="protein",
+            preferred_id="uniprot",
+            properties={"score": 1.0, "name": "StringProperty1", "taxon": 9606, "genes": ["gene1"]},
+        )
+        for i in range(start, stop)
+    ]
+
+
+def _proteins_first_adapter():
+    return _proteins(0, 4)
+
+
+def _proteins_second_adapter():
+    return _proteins(2, 6)
+
+
+def _perturbations_adapter():
+    return [
+        BioCypherEdge(
+            relationship_id=f"prel{i}",
+            source_id=f"p{i}",
+            target_id=f"p{i + 1}",
+            relationship_label="PERTURBED_IN_DISEASE",
+            properties={"residue": "T253", "level": 4},
+        )
+        for i in range(5)
+    ]
+
+
+def test_write_parallel(core):
+    passed = core.write_parallel(
+        [_proteins_first_adapter, _proteins_second_adapter, _perturbations_adapter],
+        processes=2,
+    )
+    assert passed
+
+    outdir = core._output_directory
+    files = sorted(os.listdir(outdir))
+    assert "Protein-header.csv" in files
+    assert "PERTURBED_IN_DISEASE-header.csv" in files
+    assert "Protein-part-a000-000.csv" in files
+    assert "Protein-part-a001-000.csv" in files
+
+    protein_ids = []
+    for part in core._writer.parts["protein"]:
+        with open(os.path.join(outdir, part)) as f:
+            protein_ids.extend(line.split(";")[0] for line in f)
+    assert sorted(protein_ids) == [f"p{i}" for i in range(6)]
+    assert "p2" in core._deduplicator.duplicate_entity_ids
+
+    with open(os.path.join(outdir, "neo4j-admin-import-call.sh")) as f:
+        call = f.read()
+    assert "Protein-header.csv" in call
+    assert "PERTURBED_IN_DISEASE-header.csv" in call
+
+
+@pytest.mark.parametrize("length", [4], scope="function")
+def test_write_nodes_pipeline(core, _get_nodes):
+    assert core.get_pipeline_stats() is None
+
+    passed = core.write_nodes(_get_nodes, batch_size=3, pipeline=True)
+    assert passed
+
+    files = os.listdir(core._output_directory)
+    assert "Protein-header.csv" in files
+    assert "MicroRNA-header.csv" in files
+
+    stats = core.get_pipeline_stats()
+    assert set(stats) == {"produce", "translate", "write"}
+    assert stats["produce"]["entities"] == len(_get_nodes)
+    assert stats["write"]["entities"] == len(_get_nodes)
+    assert all(0 <= s["utilisation"] <= 1 for s in stats.values())
+
+
+def test_write_nodes_pipeline_propagates_errors(core):
+    def failing_adapter():
+        yield ("p1", "protein", {})
+        raise RuntimeError("adapter failed")
+
+    with pytest.raises(RuntimeError, match="adapter failed"):
+        core.write_nodes(failing_adapter(), pipeline=True)
+
+
+@pytest.mark.parametrize("length", [4], scope="function")
+def test_awrite_nodes_and_edges(core, _get_nodes, _get_edges):
+    async def aiter(entities):
+        for entity in entities:
+            await asyncio.sleep(0)
+            yield entity
+
+    async def write():
+        nodes_passed = await core.awrite_nodes(aiter(_get_nodes))
+        edges_passed = await core.awrite_edges(aiter(_get_edges))
+        return nodes_passed, edges_passed
+
+    assert asyncio.run(write()) == (True, True)
+
+    files = os.listdir(core._output_directory)
+    assert "Protein-header.csv" in files
+    assert "PERTURBED_IN_DISEASE-header.csv" in files
+    assert core.get_pipeline_stats()["write"]["entities"] == len(_get_edges)
+
+
+@pytest.mark.parametrize("length", [4], scope="function")
+def test_aadd_in_memory(core, _get_nodes):
+    core._offline = False
+    core._dbms = "pandas"
+
+    async def aiter(entities):
+        for entity in entities:
+            yield entity
+
+    asyncio.run(core.aadd(aiter(_get_nodes)))
+
+    assert len(core.get_kg()["protein"]) == 4
+
+
+@pytest.mark.parametrize("method", ["awrite_nodes", "aadd"])
+def test_async_dispatch_errors_are_raised(core, method, monkeypatch):
+    def failing_dispatch(*args):
+        raise RuntimeError("writer failed")
+
+    monkeypatch.setattr(core, "_dispatch_nodes", failing_dispatch)
+
+    async def aiter():
+        for i in range(100_000):
+            yield (f"p{i}", "protein", {})
+
+    async def write():
+        return await asyncio.wait_for(getattr(core, method)(aiter()), timeout=10)
+
+    with pytest.raises(RuntimeError, match="writer failed"):
+        asyncio.run(write())
+
+
+@pytest.mark.parametrize("length", [4], scope="function")
+def test_add_nodes_in_chunks(core, _get_nodes, _get_edges):
+    core._dbms = "pandas"
+    for node in _get_nodes:
+        core.add_nodes([node])
+    core.add_edges(e for e in _get_edges)
+
+    assert len(core._nodes) == len(_get_nodes)
+
+    dfs = core.to_df()
+    assert set(dfs["protein"]["node_id"]) == {"p1", "p2", "p3", "p4"}
+    assert len(dfs["PERTURBED_IN_DISEASE"]) == 4
+
+
+@pytest.mark.parametrize("length", [4], scope="function")
+def test_to_df_translates_only_new_chunks(core, _get_nodes):
+    core._dbms = "pandas"
+    core.add_nodes(_get_nodes[:4])
+    assert len(core.to_df()["protein"]) == 2
+
+    translate = core._translator.translate_entities
+    with patch.object(core._translator, "translate_entities", side_effect=translate) as mocked:
+        core.add_nodes(_get_nodes[4:])
+        dfs = core.to_df()
+
+    mocked.assert_called_once()
+    assert len(dfs["protein"]) == 4
+    assert not core._deduplicator.duplicate_entity_ids
+
+
+@pytest.mark.parametrize("length", [4], scope="function")
+def test_write_to_csr_kg(core, _get_nodes, _get_edges):
+    core._offline = False
+    core._dbms = "csr"
+    core.write_nodes(_get_nodes)
+    core.write_edges(_get_edges)
+
+    kg = core.get_kg()
+    assert kg.node_type("p1") == "protein"
+    assert kg.neighbors("p1", "PERTURBED_IN_DISEASE") == ["p2"]
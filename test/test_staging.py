@@ -0,0 +1,63 @@
+import os
+
+from biocypher._create import BioCypherNode
+from biocypher._staging import StagingBuffer
+
+
+def _chunk(start, stop):
+    return [(f"p{i}", "protein", {"name": f"protein {i}"}) for i in range(start, stop)]
+
+
+def test_staging_buffer_appends_chunks():
+    staged = StagingBuffer()
+    first = _chunk(0, 3)
+    staged.append(first)
+    staged.append(x for x in _chunk(3, 5))
+    staged.append(tuple(_chunk(5, 6)))
+
+    assert len(staged) == 3
+    # lists are staged without copying
+    assert next(staged.iter_chunks()) is first
+    assert staged.nbytes > 0
+    assert [e[0] for e in staged] == [f"p{i}" for i in range(6)]
+    assert [e[0] for e in staged.iter_entities(start=2)] == ["p5"]
+
+
+def test_staging_buffer_spills_to_disk(tmp_path):
+    staged = StagingBuffer(memory_limit=1, spill_directory=str(tmp_path))
+    staged.append(_chunk(0, 10))
+    staged.append([BioCypherNode(node_id="m1", node_label="microRNA")])
+
+    assert staged.nbytes == 0
+    assert staged.spilled_bytes > 0
+    assert len(os.listdir(tmp_path)) == 2
+
+    entities = list(staged)
+    assert entities[0] == ("p0", "protein", {"name": "protein 0"})
+    assert entities[-1].get_id() == "m1"
+
+    staged.clear()
+    assert len(staged) == 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_staging_buffer_removes_temporary_directory():
+    import gc
+
+    staged = StagingBuffer(memory_limit=1)
+    staged.append(_chunk(0, 10))
+    directory = staged._temporary_directory
+    assert len(os.listdir(directory)) == 1
+
+    staged.clear()
+    assert not os.path.exists(directory)
+
+    # spilling again uses a new directory
+    staged.append(_chunk(0, 10))
+    directory = staged._temporary_directory
+    assert os.path.exists(directory)
+
+    # an abandoned buffer removes its files
+    del staged
+    gc.collect()
+    assert not os.path.exists(directory)